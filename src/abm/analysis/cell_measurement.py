@@ -9,6 +9,11 @@ def safe_mean(lst):
     mean = float(np.mean(lst)) if lst else 0.0
     return round(mean, 3)
 
+def array_mean(values):
+    """Rounded mean of an array; 0.0 if empty (array form of safe_mean)."""
+    mean = float(values.mean()) if values.size else 0.0
+    return round(mean, 3)
+
 def log_ratio(val1, val2, eps=1e-10):
     log_r = np.log2((val1 + eps) / (val2 + eps))
     return round(log_r, 3)
@@ -64,41 +69,39 @@ def measure_cell(cell):
       - cortex mechanics (T, k, a — means + spatial splits)
       - stress fibre mechanics (T, k, a, squeeze)
     """
+    state = cell.state
+
     # ---- partition ----
     # Node partition
-    mask = polar_mask(cell.positions, cell.centroid, cell.flow_axis, cell._polar_angle)
-    polar_n = [n for n, m in zip(cell.nodes, mask) if m]
-    lateral_n = [n for n, m in zip(cell.nodes, mask) if not m]
+    polar_n = polar_mask(cell.positions, cell.centroid, cell.flow_axis, cell._polar_angle)
+    lateral_n = ~polar_n
 
-    # Spring partition
-    polar_set = set(id(n) for n in polar_n)
-    polar_s = [s for s in cell.springs
-               if id(s.node_1) in polar_set and id(s.node_2) in polar_set]
-    lateral_s = [s for s in cell.springs
-                 if id(s.node_1) not in polar_set and id(s.node_2) not in polar_set]
+    # Spring partition (spring i joins node i to node i+1)
+    polar_s = polar_n & np.roll(polar_n, -1)
+    lateral_s = lateral_n & np.roll(lateral_n, -1)
 
     # ---- shape ----
     shape = measure_shape(cell)
 
     # ---- signalling: Rho ----
-    rhoa_mean = safe_mean([n.rhoa for n in cell.nodes])
-    rhoc_mean = safe_mean([n.rhoc for n in cell.nodes])
+    rhoa_mean = array_mean(state.rhoa)
+    rhoc_mean = array_mean(state.rhoc)
 
     # ---- signalling: Junction proteins ----
-    dsp_mean = safe_mean([n.DSP  for n in cell.nodes])
-    tjp1_mean = safe_mean([n.TJP1 for n in cell.nodes])
+    dsp_mean = array_mean(state.DSP)
+    tjp1_mean = array_mean(state.TJP1)
 
-    dsp_polar = safe_mean([n.DSP  for n in polar_n])
-    dsp_lateral = safe_mean([n.DSP  for n in lateral_n])
-    tjp1_polar = safe_mean([n.TJP1  for n in polar_n])
-    tjp1_lateral = safe_mean([n.TJP1  for n in lateral_n])
+    dsp_polar = array_mean(state.DSP[polar_n])
+    dsp_lateral = array_mean(state.DSP[lateral_n])
+    tjp1_polar = array_mean(state.TJP1[polar_n])
+    tjp1_lateral = array_mean(state.TJP1[lateral_n])
 
     # --- mechanics ---
-    t_polar = safe_mean([s.T for s in polar_s])
-    t_lateral = safe_mean([s.T for s in lateral_s])
+    t_polar = array_mean(state.T[polar_s])
+    t_lateral = array_mean(state.T[lateral_s])
 
-    cortex_a_mean = safe_mean([s.a for s in cell.springs])
-    cortex_T_mean = safe_mean([s.T for s in cell.springs])
+    cortex_a_mean = array_mean(state.a)
+    cortex_T_mean = array_mean(state.T)
 
     sf_a = round(cell.sf.a, 3)
     sf_T = round(cell.sf.T, 3)
@@ -122,15 +125,15 @@ def measure_cell(cell):
         # --- signalling: recruitment ---
         'dsp_mean':          dsp_mean,
         'tjp1_mean':         tjp1_mean,
-        'jcad_mean':         safe_mean([n.JCAD for n in cell.nodes]),
+        'jcad_mean':         array_mean(state.JCAD),
 
         'tjp1_dsp_balance':  round(dsp_mean - tjp1_mean, 3),
         'dsp_spread':        log_ratio(dsp_polar, dsp_lateral),
         'tjp1_spread':       log_ratio(tjp1_polar, tjp1_lateral),
 
         # --- loading ---
-        't_load_polar':      safe_mean([n.tensile_load for n in polar_n]),
-        't_load_lat':        safe_mean([n.tensile_load for n in lateral_n]),
+        't_load_polar':      array_mean(state.tensile_load[polar_n]),
+        't_load_lat':        array_mean(state.tensile_load[lateral_n]),
 
         # --- cortex mechanics ---
         'cortex_T_polar':        t_polar,
@@ -149,6 +152,53 @@ def measure_cell(cell):
         'tension_balance':    log_ratio(cortex_T_mean, sf_T),
     }
 
+# ------------------------------------------------------------------
+# Spring / Node Columns
+# ------------------------------------------------------------------
+def _classification(mask):
+    return np.where(mask, 'polar', 'lateral')
+
+def spring_columns(cell):
+    """
+    Per-spring state for one timestep as columns.
+    Returns a dict of (N,) arrays keyed like the spring records.
+    """
+    state = cell.state
+    mask = cell.polar_mask
+    return {
+        'id':             np.arange(state.n_nodes),
+        'extension':      np.round(state.L - state.L0, 4),
+        'stiffness':      np.round(state.k, 4),
+        'tension':        np.round(state.T, 4),
+        'activation':     np.round(state.a, 3),
+        'classification': _classification(mask & np.roll(mask, -1)),
+    }
+
+def node_columns(cell):
+    """
+    Per-node state for one timestep as columns.
+    Returns a dict of (N,) arrays keyed like the node records.
+    """
+    state = cell.state
+    pos = state.pos.round(2)
+    return {
+        'id':             np.arange(state.n_nodes),
+        'x':              pos[:, 0],
+        'y':              pos[:, 1],
+        'tensile_load':   state.tensile_load,
+        'shear_load':     state.shear_load,
+        'DSP':            state.DSP,
+        'TJP1':           state.TJP1,
+        'JCAD':           state.JCAD,
+        'rhoa':           state.rhoa,
+        'rhoc':           state.rhoc,
+        'classification': _classification(cell.polar_mask),
+    }
+
+def _columns_to_rows(columns):
+    return [dict(zip(columns, vals))
+            for vals in zip(*(col.tolist() for col in columns.values()))]
+
 # ------------------------------------------------------------------
 # Spring Snapshot
 # ------------------------------------------------------------------
@@ -157,28 +207,14 @@ def measure_springs(cell):
     Per-spring state for one timestep.
     Returns a list of dicts (one per spring).
     """
-    polar_set = set(id(n) for n in cell.polar_nodes)
-    rows = []
-    for s in cell.springs:
-        is_polar = (id(s.node_1) in polar_set and
-                    id(s.node_2) in polar_set)
-        row = s.get_state()
-        row['classification'] = 'polar' if is_polar else 'lateral'
-        rows.append(row)
-    return rows
+    return _columns_to_rows(spring_columns(cell))
 
 # ------------------------------------------------------------------
-# Spring Snapshot
+# Node Snapshot
 # ------------------------------------------------------------------
 def measure_nodes(cell):
     """
     Per-node state for one timestep.
     Returns a list of dicts (one per node).
     """
-    polar_set = set(id(n) for n in cell.polar_nodes)
-    rows = []
-    for n in cell.nodes:
-        row = n.get_state()
-        row['classification'] = 'polar' if id(n) in polar_set else 'lateral'
-        rows.append(row)
-    return rows
\ No newline at end of file
+    return _columns_to_rows(node_columns(cell))
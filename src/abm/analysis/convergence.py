@@ -0,0 +1,101 @@
+# abm/analysis/convergence.py
+#
+# Steady-state detection for a running simulation.
+#
+# A ConvergenceMonitor tracks a few scalar observables over a sliding
+# window of steps. The run is stationary once every observable's spread
+# over the window (max − min; for node displacement, the window maximum)
+# is within its configured tolerance.
+
+import numpy as np
+from src.abm.helpers.geometry import axial_coord, lateral_coord
+from src.utils.config_utils import require
+
+# Observables a monitor can track (keys of the `tolerances` config block).
+OBSERVABLES = ('ar', 'rho_balance', 'sf_a', 'cortex_a_mean', 'max_displacement')
+
+def cell_observables(cell, prev_positions):
+    """
+    Unrounded convergence observables for one cell.
+
+    prev_positions: (N, 2) node positions before the last step, used for
+        the maximum node displacement.
+    Returns: dict keyed by OBSERVABLES.
+    """
+    pos = cell.positions
+    centroid = pos.mean(axis=0)
+    axial = axial_coord(pos, centroid, cell.flow_axis)
+    lateral = lateral_coord(pos, centroid, cell.flow_axis)
+
+    major = axial.max() - axial.min()
+    minor = lateral.max() - lateral.min()
+    state = cell.state
+
+    return {
+        'ar': major / (minor + 1e-10),
+        'rho_balance': float(state.rhoa.mean() - state.rhoc.mean()),
+        'sf_a': float(cell.sf.a),
+        'cortex_a_mean': float(state.a.mean()),
+        'max_displacement': float(np.linalg.norm(pos - prev_positions, axis=1).max()),
+    }
+
+
+class ConvergenceMonitor:
+    """
+    Sliding-window stationarity test over chosen observables.
+    conv_cfg: dict – simulation.convergence config block:
+        window: number of recent steps compared
+        min_steps: earliest step count at which the run may stop
+        tolerances: {observable: tolerance}, observables from OBSERVABLES
+    """
+
+    def __init__(self, conv_cfg):
+        self.window = int(require(conv_cfg, 'window'))
+        self.min_steps = int(conv_cfg.get('min_steps', self.window))
+
+        tolerances = require(conv_cfg, 'tolerances')
+        unknown = set(tolerances) - set(OBSERVABLES)
+        if unknown:
+            raise KeyError(f"Unknown convergence observables: {sorted(unknown)}")
+
+        self.names = list(tolerances)
+        self.tol = np.array([float(tolerances[n]) for n in self.names])
+        self._is_disp = np.array([n == 'max_displacement' for n in self.names])
+
+        # Ring buffer of the last `window` observations.
+        self._buffer = np.full((self.window, len(self.names)), np.nan)
+        self._count = 0
+
+        self.converged_step = None
+        self.residuals = {}
+
+    def update(self, step, observables):
+        """
+        Record one step's observables.
+        Returns: True once the window is stationary (sticky after that).
+        """
+        if self.converged_step is not None:
+            return True
+
+        self._buffer[self._count % self.window] = [observables[n] for n in self.names]
+        self._count += 1
+
+        if self._count < self.window:
+            return False
+
+        spread = self._buffer.max(axis=0) - self._buffer.min(axis=0)
+        residual = np.where(self._is_disp, self._buffer.max(axis=0), spread)
+        self.residuals = {n: float(r) for n, r in zip(self.names, residual)}
+
+        if self._count >= self.min_steps and np.all(residual <= self.tol):
+            self.converged_step = step
+            return True
+        return False
+
+    def summary(self):
+        """Convergence record for a simulation result."""
+        return {
+            'converged': self.converged_step is not None,
+            'step': self.converged_step,
+            'residuals': dict(self.residuals),
+        }
@@ -0,0 +1,181 @@
+# abm/analysis/recorder.py
+#
+# Columnar time-series recorder for one simulation run.
+#
+# Measurements are written in place into NumPy column buffers that are
+# preallocated for the whole run, one buffer per output column. The cell,
+# spring and node DataFrames are assembled from these buffers once, at the
+# end of the run, without copying the numeric columns.
+#
+# Streaming mode: tables given a dataset writer are flushed to it in fixed
+# size chunks as they fill, so memory stays bounded for long runs.
+#
+# Logging cadence:
+#   - cell level: every cell_interval steps + last step
+#   - spring/node level: every detail_interval steps + last step
+# A run that stops early (convergence) logs its final step at both levels.
+
+import numpy as np
+import pandas as pd
+
+from src.abm.analysis.cell_measurement import measure_cell, spring_columns, node_columns
+
+# Column schemas (in output order, after step / time / perturbation).
+CELL_COLUMNS = (
+    'cell_id', 'ar', 'area_ratio', 'major', 'minor',
+    'rhoa_mean', 'rhoc_mean', 'rho_balance',
+    'dsp_mean', 'tjp1_mean', 'jcad_mean',
+    'tjp1_dsp_balance', 'dsp_spread', 'tjp1_spread',
+    't_load_polar', 't_load_lat',
+    'cortex_T_polar', 'cortex_T_lateral', 'cortex_T_mean', 'cortex_a_mean',
+    'cortex_force_spread',
+    'sf_T', 'sf_a', 'sf_squeeze',
+    'activation_balance', 'tension_balance',
+)
+SPRING_COLUMNS = ('id', 'extension', 'stiffness', 'tension', 'activation', 'classification')
+NODE_COLUMNS = ('id', 'x', 'y', 'tensile_load', 'shear_load',
+                'DSP', 'TJP1', 'JCAD', 'rhoa', 'rhoc', 'classification')
+
+# Non-float column dtypes; everything else is float64.
+_DTYPES = {'step': np.int64, 'cell_id': np.int64, 'id': np.int64, 'classification': '<U7'}
+
+
+def _n_logged(n_steps, interval):
+    """Upper bound on logged steps: the interval grid plus one off-grid final step."""
+    return -(-n_steps // interval) + 1
+
+
+class _ColumnBuffer:
+    """
+    Typed column buffers for one output table.
+
+    Without a writer the buffers hold the whole run. With a writer they
+    hold one chunk and are flushed to it whenever they fill up.
+    """
+
+    def __init__(self, columns, capacity, perturbation, writer=None):
+        self.columns = ('step', 'time') + columns
+        self.perturbation = perturbation
+        self.writer = writer
+        self.data = {c: np.empty(capacity, dtype=_DTYPES.get(c, np.float64))
+                     for c in self.columns}
+        self.capacity = capacity
+        self.n_rows = 0
+
+    def reserve(self, n_rows):
+        """Return the slice for the next n_rows rows, flushing if full."""
+        if self.n_rows + n_rows > self.capacity:
+            if self.writer is None:
+                raise RuntimeError("Recorder buffer overflow: more rows than the run allows.")
+            self.flush()
+        rows = slice(self.n_rows, self.n_rows + n_rows)
+        self.n_rows += n_rows
+        return rows
+
+    def frame(self):
+        n = self.n_rows
+        data = {
+            'step': self.data['step'][:n],
+            'time': self.data['time'][:n],
+            'perturbation': np.full(n, self.perturbation, dtype=object),
+        }
+        for name in self.columns[2:]:
+            values = self.data[name][:n]
+            data[name] = values.astype(object) if name == 'classification' else values
+        return pd.DataFrame(data, copy=False)
+
+    def flush(self):
+        if self.n_rows:
+            self.writer.write(self.frame())
+        self.n_rows = 0
+
+
+class TimeSeriesRecorder:
+    """
+    Preallocated column buffers for the cell, spring and node time series.
+    n_steps: int – run length (sets buffer capacity)
+    n_nodes: int – nodes (and springs) per cell
+    dt: float – timestep, for the time column
+    perturbation: str – label written on every row
+    cell_interval: int – steps between cell-level rows
+    detail_interval: int – steps between spring/node snapshots
+    writers: optional dict {'cell' | 'spring' | 'node': ParquetDatasetWriter}.
+        Tables with a writer are streamed to it in chunks of about
+        chunk_rows rows instead of being kept in memory.
+    chunk_rows: int – streamed rows per chunk (one Parquet row group)
+    """
+
+    def __init__(self, n_steps, n_nodes, dt, perturbation,
+                 cell_interval=1, detail_interval=100, writers=None, chunk_rows=65536):
+        if cell_interval < 1 or detail_interval < 1:
+            raise ValueError("Logging intervals must be positive integers.")
+
+        self.n_steps = n_steps
+        self.n_nodes = n_nodes
+        self.dt = dt
+        self.perturbation = perturbation
+        self.cell_interval = cell_interval
+        self.detail_interval = detail_interval
+
+        writers = writers or {}
+
+        def buffer(level, columns, rows_per_step, n_logged):
+            writer = writers.get(level)
+            capacity = n_logged * rows_per_step
+            if writer is not None:
+                capacity = min(capacity, max(chunk_rows, rows_per_step))
+            return _ColumnBuffer(columns, capacity, perturbation, writer)
+
+        n_detail = _n_logged(n_steps, detail_interval)
+        self._cell = buffer('cell', CELL_COLUMNS, 1, _n_logged(n_steps, cell_interval))
+        self._spring = buffer('spring', SPRING_COLUMNS, n_nodes, n_detail)
+        self._node = buffer('node', NODE_COLUMNS, n_nodes, n_detail)
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+    def _is_logged(self, step, interval, final):
+        return (step % interval == 0) or (step == self.n_steps - 1) or final
+
+    def record(self, cell, step, final=False):
+        """
+        Record one timestep of cell, at whichever levels are due.
+        final: bool – this is the last step (early stop on convergence)
+        """
+        t = round(step * self.dt, 2)
+
+        if self._is_logged(step, self.cell_interval, final):
+            i = self._cell.reserve(1).start
+            row = measure_cell(cell)
+            data = self._cell.data
+            data['step'][i] = step
+            data['time'][i] = t
+            for name in CELL_COLUMNS:
+                data[name][i] = row[name]
+
+        if self._is_logged(step, self.detail_interval, final):
+            for buffer, columns in ((self._spring, spring_columns(cell)),
+                                    (self._node, node_columns(cell))):
+                rows = buffer.reserve(self.n_nodes)
+                buffer.data['step'][rows] = step
+                buffer.data['time'][rows] = t
+                for name, values in columns.items():
+                    buffer.data[name][rows] = values
+
+    # ------------------------------------------------------------------
+    # Output
+    # ------------------------------------------------------------------
+    def frames(self):
+        """
+        Build the recorded DataFrames, flushing any streamed tables.
+        Returns: (cell_df, spring_df, node_df); numeric columns are views of
+        the recorder's buffers. Streamed tables are returned as None.
+        """
+        out = []
+        for buffer in (self._cell, self._spring, self._node):
+            if buffer.writer is None:
+                out.append(buffer.frame())
+            else:
+                buffer.flush()
+                out.append(None)
+        return tuple(out)
@@ -13,24 +13,34 @@
 
 import numpy as np
 
+from src.abm.cell_state import CellState
 from src.abm.membrane_node import MembraneNode
 from src.abm.cortex_spring import CortexSpring
 from src.abm.sf_cable import StressFibreCable
 
 from src.abm.helpers.geometry import (
     axial_coord, polar_mask, 
-    polygon_area, polygon_outward_normals, polygon_arc_lengths
+    polygon_area, polygon_area_gradient, polygon_outward_normals, polygon_arc_lengths
 )
+from src.abm.helpers.mechanics import (
+    bilinear_tangent, bilinear_tension, relax_toward, overdamped_step,
+    implicit_ring_step, spring_stiffness_blocks,
+)
+from src.abm.helpers.signalling import get_protein_recruitment
 
 from src.utils.config_utils import require
 
+# Node integration schemes selectable by simulation.integrator.
+INTEGRATORS = ('explicit', 'semi_implicit')
+
 class Cell:
     """
     Closed-ring polygonal cell with cortex springs and one stress fibre.
 
     State:
-      nodes — list of MembraneNode (positions, loads, signalling)
-      springs — list of CortexSpring connecting adjacent nodes
+      state — CellState, contiguous arrays for all node and spring state
+      nodes — list of MembraneNode views (positions, loads, signalling)
+      springs — list of CortexSpring views connecting adjacent nodes
       sf — StressFibre spanning the flow axis
       flow_axis — unit direction vector (structural, fixed at init)
       target_area, current_area — for area conservation pressure
@@ -39,6 +49,7 @@ class Cell:
     def __init__(self, cell_id, flow_axis, lut, cfg):
         self.id = cell_id
         self.lut = lut
+        self.cfg = cfg
 
         # Normalise flow axis
         self.flow_axis = np.asarray(flow_axis, dtype=float)
@@ -53,9 +64,32 @@ class Cell:
         centroid = np.asarray(require(cell_cfg, 'centroid'), dtype=float)
         radius = require(cell_cfg, 'radius')
 
+        # Node integration
+        sim_cfg = require(cfg, 'simulation')
+        self._visc = require(sim_cfg, 'viscousity')
+        self._max_disp = require(sim_cfg, 'max_displacement')
+        self._integrator = sim_cfg.get('integrator', 'explicit')
+        if self._integrator not in INTEGRATORS:
+            raise ValueError(f"Unknown integrator '{self._integrator}'. Options: {INTEGRATORS}")
+
+        # Multirate: mechanics sub-cycled within each (signalling) timestep
+        multirate_cfg = sim_cfg.get('multirate') or {}
+        self._mech_substeps = int(multirate_cfg.get('mechanics_substeps', 1))
+        if self._mech_substeps < 1:
+            raise ValueError("simulation.multirate.mechanics_substeps must be >= 1.")
+
+        # Cortex remodelling (uniform around the ring)
+        cortex_cfg = require(cfg, 'cortex')
+        mech_cfg = require(cfg, 'mechanics')
+        self._cortex_a_base = require(cortex_cfg, 'a_base')
+        self._cortex_a_drop = require(cortex_cfg, 'a_drop')
+        self._kc_ratio = require(mech_cfg, 'kc_ratio')
+        self._tau_remodel = require(mech_cfg, 'tau_remodel')
+
         # --- Build geometry ---
-        self.nodes = self._init_node_ring(centroid, radius, cfg)
-        self.springs = self._init_springs(cfg)
+        self.state = self._init_state(centroid, radius, require(mech_cfg, 'k_base'))
+        self.nodes = self._init_node_ring()
+        self.springs = self._init_springs()
         self.sf = self._init_sf(cfg)
         
         # -- Area conservation state ---
@@ -65,31 +99,29 @@ class Cell:
     # ------------------------------------------------------------------
     # Initialisation Helpers
     # ------------------------------------------------------------------
-    def _init_node_ring(self, centroid, radius, cfg):
+    def _init_state(self, centroid, radius, k_base):
         """
         Place n_nodes evenly on a circle of given radius around centroid.
         Node 0 sits at the top (+π/2 offset) so the indexing has a
         consistent geometric reference.
         """
         angles = np.linspace(0, 2*np.pi, self.n_nodes, endpoint=False) + np.pi/2
-        nodes  = []
-        for i, angle in enumerate(angles):
-            pos = centroid + radius * np.array([np.cos(angle), np.sin(angle)])
-            nodes.append(MembraneNode(i, pos, self.lut, cfg))
-        return nodes
-
-    def _init_springs(self, cfg):
-        """Connect adjacent nodes with cortex springs in a closed ring."""
-        springs = []
-        for i in range(self.n_nodes):
-            n1 = self.nodes[i]
-            n2 = self.nodes[(i + 1) % self.n_nodes]
-            L_rest = np.linalg.norm(n2.pos - n1.pos)
-            springs.append(CortexSpring(
-                id=i, node_1=n1, node_2=n2, 
-                rest_length=L_rest, cfg=cfg
-            ))
-        return springs
+        positions = centroid + radius * np.column_stack([np.cos(angles), np.sin(angles)])
+        return CellState(positions, a=self._cortex_a_base, k=k_base)
+
+    def _init_node_ring(self):
+        """One MembraneNode view per row of the state arrays."""
+        return [MembraneNode(i, self.state) for i in range(self.n_nodes)]
+
+    def _init_springs(self):
+        """Connect adjacent nodes with cortex spring views in a closed ring."""
+        return [
+            CortexSpring(
+                id=i, node_1=self.nodes[i],
+                node_2=self.nodes[(i + 1) % self.n_nodes], state=self.state,
+            )
+            for i in range(self.n_nodes)
+        ]
     
     def _init_sf(self, cfg):
         """Create a single stress fibre spanning the two most-polar nodes."""
@@ -110,8 +142,8 @@ class Cell:
     # ------------------------------------------------------------------
     @property
     def positions(self):
-        """(N, 2) array of current node positions."""
-        return np.array([n.pos for n in self.nodes])
+        """(N, 2) array of current node positions (live state array)."""
+        return self.state.pos
 
     @property
     def centroid(self):
@@ -121,19 +153,21 @@ class Cell:
     # ------------------------------------------------------------------
     # Classification properties 
     # ------------------------------------------------------------------
+    @property
+    def polar_mask(self):
+        """(N,) boolean mask of nodes currently within the polar cone."""
+        return polar_mask(self.positions, self.centroid, 
+                          self.flow_axis, self._polar_angle)
+
     @property
     def polar_nodes(self):
         """Nodes currently within the polar cone"""
-        mask = polar_mask(self.positions, self.centroid, 
-                          self.flow_axis, self._polar_angle)
-        return [n for n, m in zip(self.nodes, mask) if m]
+        return [n for n, m in zip(self.nodes, self.polar_mask) if m]
     
     @property
     def lateral_nodes(self):
         """Nodes outside the polar cone. Complement of polar_nodes."""
-        mask = polar_mask(self.positions, self.centroid, 
-                          self.flow_axis, self._polar_angle)
-        return [n for n, m in zip(self.nodes, mask) if not m]
+        return [n for n, m in zip(self.nodes, self.polar_mask) if not m]
     
     @property
     def polar_springs(self):
@@ -154,11 +188,11 @@ class Cell:
     # ------------------------------------------------------------------
     @property 
     def rhoc_mean(self):
-        return float(np.mean([n.rhoc for n in self.nodes]))
+        return float(np.mean(self.state.rhoc))
     
     @property 
     def rhoa_mean(self):
-        return float(np.mean([n.rhoa for n in self.nodes]))
+        return float(np.mean(self.state.rhoa))
 
     # ------------------------------------------------------------------
     # Force application (private)
@@ -205,12 +239,163 @@ class Cell:
         normals = polygon_outward_normals(positions)
         arc_lengths = polygon_arc_lengths(positions)
 
-        for node, normal, dL in zip(self.nodes, normals, arc_lengths):
-            node.apply_force(pressure * dL * normal)
+        self.state.force += (pressure * arc_lengths)[:, None] * normals
+
+    # ------------------------------------------------------------------
+    # Cortex ring (whole-array spring phases)
+    # ------------------------------------------------------------------
+    def _update_cortex_geometry_tension(self):
+        """
+        Recompute L, unit_vec, and T for every spring from node positions.
+        Tension uses the bilinear law with effective rest length L0 × a.
+        Degenerate (zero-length) springs keep their previous state.
+        """
+        st = self.state
+        diff = st.spring_vectors()
+        length = np.linalg.norm(diff, axis=1)
+        ok = length >= 1e-10
+
+        st.L[ok] = length[ok]
+        st.unit_vec[ok] = diff[ok] / length[ok, None]
+        st.T[ok] = bilinear_tension(
+            l=st.L[ok], l0=st.L0[ok] * st.a[ok],
+            k=st.k[ok], kc_ratio=self._kc_ratio,
+        )
+
+    def _accumulate_cortex_loads(self):
+        """Contribute tensile stimulus (no load in compression) to endpoints."""
+        st = self.state
+        st.tensile_load += st.gather_spring_to_nodes(np.maximum(st.T, 0.0))
+
+    def _apply_cortex_forces(self):
+        """
+        Apply ±T × unit_vec to spring endpoints.
+
+        Positive T pulls the endpoints together (tensile regime);
+        negative T pushes them apart (compressive regime).
+        """
+        st = self.state
+        force_vec = st.T[:, None] * st.unit_vec
+        st.force += force_vec - np.roll(force_vec, 1, axis=0)
+
+    def _update_cortex_activation(self, dt):
+        """
+        First-order relaxation of each spring's activation towards its
+        RhoA-dependent target, using the mean RhoA of its two endpoints.
+        """
+        st = self.state
+        mean_rhoa = st.spring_endpoint_mean(st.rhoa)
+        a_target = self._cortex_a_base - (mean_rhoa * self._cortex_a_drop)
+        st.a[:] = relax_toward(
+            current=st.a, target=a_target,
+            dt=dt, tau=self._tau_remodel,
+        )
+
+    # ------------------------------------------------------------------
+    # Node integration and signalling (whole-array)
+    # ------------------------------------------------------------------
+    def _integrate_nodes(self, dt):
+        """
+        Advance every node from its net force.
+
+        explicit: overdamped Euler, displacement clamped to max_displacement
+        semi_implicit: see _semi_implicit_displacement; no clamp
+        """
+        st = self.state
+        if self._integrator == 'semi_implicit':
+            st.pos += self._semi_implicit_displacement(dt)
+        else:
+            st.pos += overdamped_step(st.force, self._visc, dt, self._max_disp)
+
+    def _semi_implicit_displacement(self, dt):
+        """
+        Linearly implicit overdamped step: cortex springs and area pressure
+        are linearised about the current state and solved implicitly (O(N)
+        cyclic banded solve); SF squeeze and flow drag stay explicit.
+        Stable at dt far beyond the explicit limit.
+        """
+        st = self.state
+        tangent = bilinear_tangent(st.L, st.L0 * st.a, st.k, self._kc_ratio)
+        K = spring_stiffness_blocks(st.unit_vec, st.L, st.T, tangent)
+
+        # Pressure p × deficit × arc × normal stiffens as the area drops.
+        rank_one = None
+        if self.target_area > self.current_area:
+            pressure_dir = (self._p_area * polygon_arc_lengths(st.pos))[:, None] \
+                * polygon_outward_normals(st.pos)
+            rank_one = (pressure_dir, polygon_area_gradient(st.pos))
+
+        return implicit_ring_step(st.force, K, self._visc, dt, rank_one)
+
+    def _update_signalling(self):
+        """
+        Update protein recruitment and Rho activation from current loads.
+        Pipeline: mechanical loads → Hill → junction proteins → LUT → Rho activation
+
+        DSP: tensile loading 
+        TJP1: tensile loading
+        JCAD: total shear magnitude 
+        """
+        st = self.state
+
+        # Clamp mechanical loads to non-negative
+        S_tensile = np.maximum(st.tensile_load, 0.0)
+        S_shear = np.maximum(st.shear_load, 0.0)
+
+        # Hill → junction protein recruitment
+        st.DSP[:] = get_protein_recruitment(self.cfg, S_tensile, 'DSP')
+        st.TJP1[:] = get_protein_recruitment(self.cfg, S_tensile, 'TJP1')
+        st.JCAD[:] = get_protein_recruitment(self.cfg, S_shear, 'JCAD')
+
+        # LUT → Rho activation, one batched query for the whole ring
+        recruitment = np.column_stack([st.DSP, st.TJP1, st.JCAD])
+        rhoa, rhoc, outside = self.lut.query_many(recruitment)
+
+        if outside.any():
+            raise ValueError(
+                f"RhoLookupTable query fell outside the interpolation domain "
+                f"at nodes {np.flatnonzero(outside).tolist()}."
+            )
+
+        st.rhoa[:] = rhoa
+        st.rhoc[:] = rhoc
 
     # ------------------------------------------------------------------
     # Timestep
     # ------------------------------------------------------------------
+    def _step_mechanics(self, flow_field, dt):
+        """
+        Phases 1-7a of a timestep: assemble loads and forces at the current
+        positions, then integrate the nodes over dt.
+        """
+        st = self.state
+
+        # 1. Reset Tensile Loads
+        st.tensile_load[:] = 0.0
+        st.force[:] = 0.0
+
+        # 2. External stimuli from flow
+        st.shear_load[:] = flow_field.magnitude
+
+        # 3. Geometry + tension 
+        self._update_cortex_geometry_tension()
+        self.sf.update_geometry_tension()
+
+        # 4. Tensile stimuli to load channels
+        self._accumulate_cortex_loads()
+        self.sf.accumulate_loads(st.pos, self.polar_mask, st.tensile_load)
+
+        # 5. Mechanical forces applied to nodes
+        self._apply_cortex_forces()
+        self.sf.apply_forces(st.pos, st.force)
+
+        # 6. Area pressure
+        self.current_area = polygon_area(st.pos)
+        self._apply_pressure()
+
+        # 7a. Integration — all nodes advance by their net force
+        self._integrate_nodes(dt)
+
     def step(self, flow_field, dt):
         """
         Advance one timestep.
@@ -223,51 +408,33 @@ class Cell:
         5. Apply mechanical forces (cortex, SF)
         6. Area pressure
         7. Integration and signalling for nodes 
-        9. Remodelling (cortex stiffness/activation, SF activation)
-        10. Sync current_area for next step's pressure
+        8. Remodelling (cortex stiffness/activation, SF activation)
+        9. Sync current_area for next step's pressure
 
+        Every phase operates on the CellState arrays for the whole ring.
         Forces accumulate before integration. Signalling reads
         post-integration geometry. Remodelling sets state for next step.
-        """
-        # 1. Reset Tensile Loads
-        for n in self.nodes:
-            n.reset_tensile_load()
-            n.reset_force()
-
-        # 2. External stimuli from flow
-        for node in self.nodes:
-            node.shear_load = flow_field.magnitude
 
-        # 3. Geometry + tension 
-        for s in self.springs:
-            s.update_geometry_tension()
-        self.sf.update_geometry_tension()
-
-        # 4. Tensile stimuli to load channels
-        for s in self.springs:
-            s.accumulate_loads()
-        self.sf.accumulate_loads(self.polar_nodes)
-
-        # 5. Mechanical forces applied to nodes
-        for s in self.springs:
-            s.apply_forces()
-        self.sf.apply_forces(self.nodes)
+        Multirate (simulation.multirate): phases 1-7a are sub-cycled
+        mechanics_substeps times at dt / mechanics_substeps. Signalling
+        reads the loads of the last substep; signalling and remodelling
+        then advance once over the full dt.
+        """
+        st = self.state
 
-        # 6. Area pressure
-        self.current_area = polygon_area(self.positions)
-        self._apply_pressure()
+        # 1-7a. Mechanics, sub-cycled within the timestep
+        for _ in range(self._mech_substeps):
+            self._step_mechanics(flow_field, dt / self._mech_substeps)
 
-         # 7. Integration — each node advances by its net force
-        for node in self.nodes:
-            node.step(dt)
+        # 7b. Signalling from the final loads
+        self._update_signalling()
 
         # 8. Remodelling — cortex reads local RhoA, SF reads cell-wide RhoC mean
-        for s in self.springs:
-            s.update_stiffness_and_activation(dt)
+        self._update_cortex_activation(dt)
         self.sf.update_activation(mean_rhoc=self.rhoc_mean, dt=dt)
 
         # 9. Sync area for next step's pressure calculation
-        self.current_area = polygon_area(self.positions)
+        self.current_area = polygon_area(st.pos)
  
     # ------------------------------------------------------------------
     # Diganostics
@@ -0,0 +1,324 @@
+# abm/cell_ensemble.py
+#
+# Batched ensemble of independent cells advanced in one set of array ops.
+#
+# All cells share topology (n_nodes) and differ only in scalar parameters
+# (Hill knockouts, k_base, a_drop, nu, p_area, flow, ...). Node and spring
+# state is held as (B, N, ...) arrays and per-cell parameters as (B,)
+# vectors. Each member Cell keeps working as usual: its CellState arrays
+# are rebound to row b of the batched arrays, so nodes, springs and
+# measurement functions read the ensemble state directly.
+#
+# The step mirrors Cell.step phase for phase.
+
+import numpy as np
+
+from src.abm.cell_state import CellState
+from src.abm.helpers.geometry import (
+    polygon_area, polygon_outward_normals, polygon_arc_lengths
+)
+from src.abm.helpers.mechanics import bilinear_tension, relax_toward, overdamped_step
+from src.abm.helpers.signalling import hill
+from src.utils.config_utils import require
+
+PROTEINS = ('DSP', 'TJP1', 'JCAD')
+
+
+class CellEnsemble:
+    """
+    B cells with shared topology, stepped together.
+
+    cells: list of Cell – members; each must have the same n_nodes
+    flows: list of FlowField – one per cell
+    lut: RhoLookupTable – shared by all cells
+    """
+
+    def __init__(self, cells, flows, lut):
+        if len({c.n_nodes for c in cells}) != 1:
+            raise ValueError("CellEnsemble members must share n_nodes.")
+        if len({c._mech_substeps for c in cells}) != 1:
+            raise ValueError("CellEnsemble members must share simulation.multirate.mechanics_substeps.")
+
+        self.cells = cells
+        self.lut = lut
+        self.n_cells = len(cells)
+        self.n_nodes = cells[0].n_nodes
+
+        self._bind_state()
+        self._init_params(flows)
+        self._init_sf_state()
+
+        self.target_area = np.array([c.target_area for c in cells])
+        self.current_area = self.target_area.copy()
+
+    # ------------------------------------------------------------------
+    # Initialisation Helpers
+    # ------------------------------------------------------------------
+    def _bind_state(self):
+        """Stack member CellState arrays and rebind each member to its row."""
+        for name in CellState.NODE_FIELDS + CellState.SPRING_FIELDS:
+            batched = np.stack([getattr(c.state, name) for c in self.cells])
+            setattr(self, name, batched)
+            for b, cell in enumerate(self.cells):
+                setattr(cell.state, name, batched[b])
+
+    def _init_params(self, flows):
+        """Collect per-cell scalar parameters into (B,) vectors."""
+        cells = self.cells
+        col = lambda values: np.array(values, dtype=float)
+
+        # Flow
+        self.flow_axis = np.stack([c.flow_axis for c in cells])
+        self.flow_magnitude = col([f.magnitude for f in flows])
+
+        # Cell / integration
+        self.visc = col([c._visc for c in cells])
+        self.max_disp = col([c._max_disp for c in cells])
+        self.semi_implicit = np.array([c._integrator == 'semi_implicit' for c in cells])
+        self.p_area = col([c._p_area for c in cells])
+        self.polar_cos = np.cos(np.deg2rad(col([c._polar_angle for c in cells])))
+
+        # Cortex
+        self.cortex_a_base = col([c._cortex_a_base for c in cells])
+        self.cortex_a_drop = col([c._cortex_a_drop for c in cells])
+        self.kc_ratio = col([c._kc_ratio for c in cells])
+        self.tau_remodel = col([c._tau_remodel for c in cells])
+
+        # Stress fibre
+        self.sf_k = col([c.sf.k for c in cells])
+        self.sf_a_base = col([c.sf.a_base for c in cells])
+        self.sf_a_drop = col([c.sf.a_drop for c in cells])
+        self.sf_nu = col([c.sf.nu for c in cells])
+        self.sf_kc_ratio = col([c.sf.kc_ratio for c in cells])
+        self.sf_tau_remodel = col([c.sf.tau_remodel for c in cells])
+
+        # Hill recruitment, one (B,) vector per protein and parameter
+        self.hill = {}
+        for protein in PROTEINS:
+            params = [require(c.cfg, 'hill_params', protein) for c in cells]
+            self.hill[protein] = {
+                'K': col([require(p, 'K') for p in params]),
+                'n': col([require(p, 'n') for p in params]),
+                'max': col([require(p, 'max') for p in params]),
+                'knocked_out': np.array([p.get('knocked_out', False) for p in params]),
+            }
+
+    def _init_sf_state(self):
+        """Batched stress fibre state, seeded from each member's cable."""
+        cells = self.cells
+        self.sf_up = np.array([c.sf.node_up.id for c in cells])
+        self.sf_down = np.array([c.sf.node_down.id for c in cells])
+
+        self.sf_L0 = np.array([c.sf.L0 for c in cells], dtype=float)
+        self.sf_L = np.array([c.sf.L for c in cells], dtype=float)
+        self.sf_a = np.array([c.sf.a for c in cells], dtype=float)
+        self.sf_T = np.array([c.sf.T for c in cells], dtype=float)
+        self.sf_axis_unit = np.stack([c.sf.axis_unit for c in cells]).astype(float)
+        self.sf_cable_mid = np.stack([c.sf.cable_mid for c in cells]).astype(float)
+
+    # ------------------------------------------------------------------
+    # Batched geometry
+    # ------------------------------------------------------------------
+    def _local_coords(self, origin, axis):
+        """Axial and lateral node coordinates in a per-cell frame (B, N)."""
+        axis = axis / np.linalg.norm(axis, axis=-1, keepdims=True)
+        perp = np.stack([-axis[:, 1], axis[:, 0]], axis=-1)
+        offsets = self.pos - origin[:, None, :]
+        return (np.einsum('bnk,bk->bn', offsets, axis),
+                np.einsum('bnk,bk->bn', offsets, perp))
+
+    def _polar_mask(self):
+        """(B, N) mask of nodes within each cell's polar cone."""
+        axis = self.flow_axis / np.linalg.norm(self.flow_axis, axis=-1, keepdims=True)
+        offsets = self.pos - self.pos.mean(axis=1)[:, None, :]
+        norms = np.linalg.norm(offsets, axis=-1)
+        cos_angles = np.abs(np.einsum('bnk,bk->bn', offsets, axis)) / (norms + 1e-10)
+        return cos_angles >= self.polar_cos[:, None]
+
+    # ------------------------------------------------------------------
+    # Phases
+    # ------------------------------------------------------------------
+    def _update_geometry_tension(self):
+        """Cortex and SF lengths, directions and bilinear tensions."""
+        # Cortex ring
+        diff = np.roll(self.pos, -1, axis=1) - self.pos
+        length = np.linalg.norm(diff, axis=-1)
+        ok = length >= 1e-10
+        safe = np.where(ok, length, 1.0)
+
+        self.L[:] = np.where(ok, length, self.L)
+        self.unit_vec[:] = np.where(ok[..., None], diff / safe[..., None], self.unit_vec)
+        T = bilinear_tension(
+            l=self.L, l0=self.L0 * self.a,
+            k=self.k, kc_ratio=self.kc_ratio[:, None],
+        )
+        self.T[:] = np.where(ok, T, self.T)
+
+        # Stress fibre
+        rows = np.arange(self.n_cells)
+        p_up, p_down = self.pos[rows, self.sf_up], self.pos[rows, self.sf_down]
+        diff = p_down - p_up
+        length = np.linalg.norm(diff, axis=-1)
+        ok = length >= 1e-10
+        safe = np.where(ok, length, 1.0)
+
+        self.sf_L = np.where(ok, length, self.sf_L)
+        self.sf_axis_unit = np.where(ok[:, None], diff / safe[:, None], self.sf_axis_unit)
+        self.sf_cable_mid = np.where(ok[:, None], 0.5 * (p_up + p_down), self.sf_cable_mid)
+        T = bilinear_tension(
+            l=self.sf_L, l0=self.sf_L0 * self.sf_a,
+            k=self.sf_k, kc_ratio=self.sf_kc_ratio,
+        )
+        self.sf_T = np.where(ok, T, self.sf_T)
+
+    def _accumulate_loads(self):
+        """Cortex endpoint loads and parabolic SF loads at polar nodes."""
+        load = np.maximum(self.T, 0.0)
+        self.tensile_load += load + np.roll(load, 1, axis=1)
+
+        half_L = self.sf_L / 2
+        ok = half_L >= 1e-10
+        p_axial, _ = self._local_coords(self.sf_cable_mid, self.sf_axis_unit)
+        p_axial = p_axial / np.where(ok, half_L, 1.0)[:, None]
+
+        sf_load = np.maximum(p_axial * p_axial * self.sf_T[:, None], 0.0)
+        apply = self._polar_mask() & ok[:, None]
+        self.tensile_load += np.where(apply, sf_load, 0.0)
+
+    def _apply_forces(self):
+        """Cortex ±T × unit_vec and SF Poisson waist squeeze."""
+        force_vec = self.T[..., None] * self.unit_vec
+        self.force += force_vec - np.roll(force_vec, 1, axis=1)
+
+        half_L = self.sf_L / 2
+        active = (self.sf_T >= 1e-6) & (half_L >= 1e-10)
+
+        p_axial, lateral = self._local_coords(self.sf_cable_mid, self.sf_axis_unit)
+        p_axial = p_axial / np.where(active, half_L, 1.0)[:, None]
+
+        axial_profile = np.maximum(1.0 - p_axial * p_axial, 0.0)
+        total = axial_profile.sum(axis=1)
+        active &= total >= 1e-12
+        weights = axial_profile / np.where(active, total, 1.0)[:, None]
+
+        F_total = self.sf_T * self.sf_nu
+        perp = np.stack([-self.sf_axis_unit[:, 1], self.sf_axis_unit[:, 0]], axis=-1)
+        side = np.where(np.abs(lateral) < 1e-10, 0.0, -np.sign(lateral))
+
+        squeeze = (weights * F_total[:, None] * side)[..., None] * perp[:, None, :]
+        self.force += np.where(active[:, None, None], squeeze, 0.0)
+
+    def _apply_pressure(self):
+        """Outward area-conservation pressure where a cell has an area deficit."""
+        area_deficit = self.target_area - self.current_area
+        pressure = np.where(area_deficit > 0, self.p_area * area_deficit, 0.0)
+
+        normals = polygon_outward_normals(self.pos)
+        arc_lengths = polygon_arc_lengths(self.pos)
+        self.force += (pressure[:, None] * arc_lengths)[..., None] * normals
+
+    def _integrate(self, dt):
+        """
+        Overdamped Euler step for every node of every cell. Cells using the
+        semi-implicit integrator solve their own ring (the member Cell's
+        state rows are views into the batched arrays).
+        """
+        displacement = overdamped_step(
+            self.force, self.visc[:, None, None], dt, self.max_disp[:, None, None]
+        )
+        for b in np.flatnonzero(self.semi_implicit):
+            cell = self.cells[b]
+            cell.current_area = float(self.current_area[b])
+            displacement[b] = cell._semi_implicit_displacement(dt)
+        self.pos += displacement
+
+    def _update_signalling(self):
+        """Hill recruitment per cell, then one LUT query for all nodes."""
+        stimuli = {
+            'DSP': np.maximum(self.tensile_load, 0.0),
+            'TJP1': np.maximum(self.tensile_load, 0.0),
+            'JCAD': np.maximum(self.shear_load, 0.0),
+        }
+        for protein in PROTEINS:
+            p = self.hill[protein]
+            level = hill(stimuli[protein], p['K'][:, None], p['n'][:, None]) * p['max'][:, None]
+            getattr(self, protein)[:] = np.where(p['knocked_out'][:, None], 0.0, level)
+
+        recruitment = np.stack([self.DSP, self.TJP1, self.JCAD], axis=-1).reshape(-1, 3)
+        rhoa, rhoc, outside = self.lut.query_many(recruitment)
+
+        if outside.any():
+            bad = np.flatnonzero(outside.reshape(self.n_cells, self.n_nodes).any(axis=1))
+            raise ValueError(
+                f"RhoLookupTable query fell outside the interpolation domain "
+                f"for cells {bad.tolist()}."
+            )
+
+        self.rhoa[:] = rhoa.reshape(self.n_cells, self.n_nodes)
+        self.rhoc[:] = rhoc.reshape(self.n_cells, self.n_nodes)
+
+    def _remodel(self, dt):
+        """Cortex activation from endpoint RhoA, SF activation from mean RhoC."""
+        mean_rhoa = 0.5 * (self.rhoa + np.roll(self.rhoa, -1, axis=1))
+        a_target = self.cortex_a_base[:, None] - mean_rhoa * self.cortex_a_drop[:, None]
+        self.a[:] = relax_toward(self.a, a_target, dt, self.tau_remodel[:, None])
+
+        sf_target = self.sf_a_base - self.rhoc.mean(axis=1) * self.sf_a_drop
+        self.sf_a = relax_toward(self.sf_a, sf_target, dt, self.sf_tau_remodel)
+
+    def _sync_cells(self):
+        """Copy batched scalar state (SF, area) back onto the member cells."""
+        for b, cell in enumerate(self.cells):
+            sf = cell.sf
+            sf.L, sf.T, sf.a = float(self.sf_L[b]), float(self.sf_T[b]), float(self.sf_a[b])
+            sf.axis_unit = self.sf_axis_unit[b]
+            sf.cable_mid = self.sf_cable_mid[b]
+            cell.current_area = float(self.current_area[b])
+
+    # ------------------------------------------------------------------
+    # Timestep
+    # ------------------------------------------------------------------
+    def _step_mechanics(self, dt):
+        """Phases 1-7a, as Cell._step_mechanics."""
+        # 1. Reset accumulators
+        self.tensile_load[:] = 0.0
+        self.force[:] = 0.0
+
+        # 2. External stimuli from flow
+        self.shear_load[:] = self.flow_magnitude[:, None]
+
+        # 3. Geometry + tension
+        self._update_geometry_tension()
+
+        # 4. Tensile stimuli to load channels
+        self._accumulate_loads()
+
+        # 5. Mechanical forces applied to nodes
+        self._apply_forces()
+
+        # 6. Area pressure
+        self.current_area = polygon_area(self.pos)
+        self._apply_pressure()
+
+        # 7a. Integration
+        self._integrate(dt)
+
+    def step(self, dt):
+        """
+        Advance every cell one timestep (same phase order as Cell.step,
+        including multirate sub-cycling of the mechanics).
+        """
+        # 1-7a. Mechanics, sub-cycled within the timestep
+        n_sub = self.cells[0]._mech_substeps
+        for _ in range(n_sub):
+            self._step_mechanics(dt / n_sub)
+
+        # 7b. Signalling
+        self._update_signalling()
+
+        # 8. Remodelling
+        self._remodel(dt)
+
+        # 9. Sync area for next step's pressure calculation
+        self.current_area = polygon_area(self.pos)
+        self._sync_cells()
@@ -0,0 +1,79 @@
+# abm/cell_state.py
+#
+# Contiguous array storage for one cell.
+#
+# All per-node and per-spring state lives here as NumPy arrays so the cell
+# timestep can run as whole-array operations. MembraneNode and CortexSpring
+# objects are thin views that index into these arrays.
+#
+# Ring convention: spring i joins node i (node_1) to node i+1 (node_2),
+# wrapping around so spring N-1 joins node N-1 to node 0.
+
+import numpy as np
+
+
+class CellState:
+    """
+    Array-backed state for a closed ring of N nodes and N cortex springs.
+
+    Node arrays (one row per node):
+      pos, force — (N, 2) positions and force accumulators
+      tensile_load, shear_load — (N,) load channels
+      DSP, TJP1, JCAD — (N,) junction protein recruitment
+      rhoa, rhoc — (N,) Rho activation
+
+    Spring arrays (one row per spring):
+      L0, L — (N,) rest and current length
+      a, k, T — (N,) activation, stiffness, tension
+      unit_vec — (N, 2) unit direction from node_1 to node_2
+    """
+
+    # Array attributes, in the order node fields then spring fields.
+    NODE_FIELDS = ('pos', 'force', 'tensile_load', 'shear_load',
+                   'DSP', 'TJP1', 'JCAD', 'rhoa', 'rhoc')
+    SPRING_FIELDS = ('L0', 'L', 'a', 'k', 'T', 'unit_vec')
+
+    def __init__(self, positions, a, k):
+        pos = np.array(positions, dtype=float)
+        n = len(pos)
+        self.n_nodes = n
+
+        # --- Node state ---
+        self.pos = pos
+        self.force = np.zeros((n, 2))
+        self.tensile_load = np.zeros(n)
+        self.shear_load = np.zeros(n)
+
+        self.DSP = np.zeros(n)
+        self.TJP1 = np.zeros(n)
+        self.JCAD = np.zeros(n)
+        self.rhoa = np.zeros(n)
+        self.rhoc = np.zeros(n)
+
+        # --- Spring state: rest length from the initial ring ---
+        rest = np.linalg.norm(np.roll(pos, -1, axis=0) - pos, axis=1)
+        self.L0 = rest
+        self.L = rest.copy()
+        self.a = np.full(n, float(a))
+        self.k = np.full(n, float(k))
+        self.T = np.zeros(n)
+        self.unit_vec = np.zeros((n, 2))
+
+    # ------------------------------------------------------------------
+    # Ring topology
+    # ------------------------------------------------------------------
+    def spring_vectors(self):
+        """(N, 2) edge vectors from node_1 to node_2 for every spring."""
+        return np.roll(self.pos, -1, axis=0) - self.pos
+
+    def gather_spring_to_nodes(self, values):
+        """
+        Sum a per-spring quantity onto both endpoint nodes.
+
+        Node i is node_1 of spring i and node_2 of spring i-1.
+        """
+        return values + np.roll(values, 1, axis=0)
+
+    def spring_endpoint_mean(self, values):
+        """Mean of a per-node quantity over each spring's two endpoints."""
+        return 0.5 * (values + np.roll(values, -1, axis=0))
@@ -0,0 +1,189 @@
+# abm/ensemble_simulation.py
+#
+# Runtime orchestrator for a batch of independent simulations.
+#
+# Batched counterpart of Simulation:
+# [cfg] + lut + [perturbation label] -> one shared time loop -> per-cell outputs
+#
+# Responsibilities:
+#   - Owns B runtime cells (one per cfg) advanced together by a CellEnsemble
+#   - Records measurements for every cell in Simulation's tabular format
+#   - With convergence detection on, snapshots each cell when it becomes
+#     stationary and stops once every cell has
+#   - Returns one result dict per cell, identical in shape to Simulation.run()
+
+import copy
+import time
+
+from src.abm.flow_field import FlowField
+from src.abm.cell import Cell
+from src.abm.cell_ensemble import CellEnsemble
+from src.abm.analysis.cell_measurement import measure_cell, measure_springs, measure_nodes
+from src.abm.analysis.convergence import ConvergenceMonitor, cell_observables
+from src.abm.analysis.recorder import TimeSeriesRecorder
+from src.utils.config_utils import require
+
+class EnsembleSimulation:
+    """
+    Execute B simulation runs as one batch.
+    cfgs: list of dict – fully resolved configurations, one per cell.
+        Must agree on dt, n_steps, detail_log_interval and n_nodes.
+    lut: RhoLookupTable – shared by all cells
+    perturbations: list of str – label per cell
+    writers: optional dict of dataset writers shared by all cells, see
+        Simulation.
+    """
+
+    def __init__(self, cfgs, lut, perturbations, writers=None):
+        if len(cfgs) != len(perturbations):
+            raise ValueError("EnsembleSimulation needs one perturbation label per cfg.")
+
+        self.cfgs = cfgs
+        self.lut = lut
+        self.perturbations = list(perturbations)
+
+        # --- Simulation controls (shared across the batch) ---
+        sim_cfgs = [require(cfg, "simulation") for cfg in cfgs]
+        for key in ("dt", "n_steps", "detail_log_interval"):
+            if len({require(s, key) for s in sim_cfgs}) != 1:
+                raise ValueError(f"EnsembleSimulation cfgs must share simulation.{key}.")
+
+        self.dt = require(sim_cfgs[0], "dt")
+        self.n_steps = require(sim_cfgs[0], "n_steps")
+        self.detail_interval = require(sim_cfgs[0], "detail_log_interval")
+
+        # --- Optional steady-state detection, one monitor per cell ---
+        conv_cfgs = [s.get("convergence") or {} for s in sim_cfgs]
+        if len({c.get("enabled", False) for c in conv_cfgs}) != 1:
+            raise ValueError("EnsembleSimulation cfgs must agree on convergence.enabled.")
+        self.monitors = (
+            [ConvergenceMonitor(c) for c in conv_cfgs]
+            if conv_cfgs[0].get("enabled", False) else None
+        )
+        if any((s.get("quasi_static") or {}).get("enabled", False) for s in sim_cfgs):
+            raise ValueError("EnsembleSimulation does not support quasi_static mode; run serially.")
+
+        # --- Runtime objects ---
+        flows = [FlowField(cfg) for cfg in cfgs]
+        cells = [
+            Cell(cell_id=0, flow_axis=flow.direction, lut=lut, cfg=cfg)
+            for flow, cfg in zip(flows, cfgs)
+        ]
+        self.ensemble = CellEnsemble(cells, flows, lut)
+
+        # --- Output buffers (one recorder per cell) ---
+        self.recorders = [
+            TimeSeriesRecorder(
+                self.n_steps, cell.n_nodes, self.dt, label,
+                cell_interval=sim_cfg.get("cell_log_interval", 1),
+                detail_interval=self.detail_interval,
+                writers=writers,
+            )
+            for cell, label, sim_cfg in zip(cells, self.perturbations, sim_cfgs)
+        ]
+
+    # ------------------------------------------------------------------
+    # Per-step Recording
+    # ------------------------------------------------------------------
+    def _record_cell(self, b, step, final=False):
+        """
+        Record one timestep of cell b. Same logging cadence as
+        Simulation._record_step.
+        """
+        self.recorders[b].record(self.ensemble.cells[b], step, final=final)
+
+    def _finish_cell(self, b, last_step, copy_cell):
+        """
+        Steady-state snapshot and result dict for cell b at last_step.
+
+        copy_cell: bool – deep-copy the final cell (it keeps stepping with
+            the rest of the batch after converging early).
+        """
+        cell = self.ensemble.cells[b]
+        perturbation = self.perturbations[b]
+
+        ss_exp_dict = {
+            "step": last_step,
+            "time": round(last_step * self.dt, 2),
+            "perturbation": perturbation,
+        }
+
+        cell_ss = {**ss_exp_dict, **measure_cell(cell)}
+        spring_ss = [{**ss_exp_dict, **r} for r in measure_springs(cell)]
+        node_ss = [{**ss_exp_dict, **r} for r in measure_nodes(cell)]
+
+        convergence = self.monitors[b].summary() if self.monitors else None
+        if convergence is not None:
+            cell_ss["converged"] = convergence["converged"]
+
+        cell_df, spring_df, node_df = self.recorders[b].frames()
+
+        print(
+            f" {perturbation} ar={cell_ss['ar']:.3f} | "
+            f"rho_balance={cell_ss['rho_balance']:.3f} | "
+            f"rhoa={cell_ss['rhoa_mean']:.3f} | rhoc={cell_ss['rhoc_mean']:.3f}"
+        )
+
+        return {
+            "perturbation": perturbation,
+            "cell_df": cell_df,
+            "spring_df": spring_df,
+            "node_df": node_df,
+            "cell_ss": cell_ss,
+            "spring_ss": spring_ss,
+            "node_ss": node_ss,
+            "cell_initial": None,
+            "cell_final": copy.deepcopy(cell, {id(self.lut): self.lut}) if copy_cell else cell,
+            "convergence": convergence,
+            "quasi_static": None,
+        }
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+    def run(self):
+        """
+        Run all cells for n_steps timesteps (or until every cell has
+        converged, when convergence detection is on).
+
+        Returns: list of result dicts, one per cell, in cfg order. Each has
+        the same keys as Simulation.run().
+        """
+        cells = self.ensemble.cells
+        n_cells = len(cells)
+        print(f">>> INFO: Running {n_cells} perturbations as one batch "
+              f"for {self.n_steps} steps: {', '.join(self.perturbations)}")
+        t_start = time.perf_counter()
+
+        # Snapshot initial cells; the shared LUT is not copied.
+        cell_initial = [copy.deepcopy(c, {id(self.lut): self.lut}) for c in cells]
+
+        results = [None] * n_cells
+        for step in range(self.n_steps):
+            prev_positions = self.ensemble.pos.copy() if self.monitors else None
+            self.ensemble.step(self.dt)
+
+            for b in range(n_cells):
+                if results[b] is not None:
+                    continue   # converged earlier; outputs already frozen
+
+                converged = self.monitors is not None and self.monitors[b].update(
+                    step, cell_observables(cells[b], prev_positions[b])
+                )
+                self._record_cell(b, step, final=converged)
+
+                if converged:
+                    print(f">>> INFO: {self.perturbations[b]} converged at step {step}.")
+                    results[b] = self._finish_cell(b, step, copy_cell=True)
+
+            if all(r is not None for r in results):
+                break
+
+        for b in range(n_cells):
+            if results[b] is None:
+                results[b] = self._finish_cell(b, self.n_steps - 1, copy_cell=False)
+            results[b]["cell_initial"] = cell_initial[b]
+
+        runtime = time.perf_counter() - t_start
+        print(f" batch t={runtime:.1f}s")
+        return results
@@ -4,7 +4,7 @@
 #
 # Responsibilities:
 #   1. Own the base configuration for a family of runs
-#   2. Build the Rho lookup table once per experiment session
+#   2. Build the Rho lookup table (or on-demand backend) once per session
 #   3. Apply perturbation and user-specified config overrides
 #   4. Run either a one or all perturbations
 #   5. Aggregate and optionally save outputs
@@ -12,10 +12,11 @@
 import copy
 import pandas as pd
 
-from src.abm.rho_lookup_table import RhoLookupTable
+from src.abm.rho_on_demand import build_rho_table
 from src.abm.simulation import Simulation
+from src.abm.ensemble_simulation import EnsembleSimulation
 from src.utils.config_utils import require
-from src.utils.file_utils import save_df_to_csv
+from src.utils.file_utils import save_df_to_csv, save_df_to_parquet, ParquetDatasetWriter
 
 
 class ExperimentRunner:
@@ -23,15 +24,34 @@ class ExperimentRunner:
     Build configs and execute ABM experiments
     cfg: dict – base experiment configuration.
     lut_dir: pathlib.Path – directory with recruitment CSV for lookup table.
+    lut: RhoLookupTable / OnDemandRhoTable – optional prebuilt table to share
+        instead of building one.
     """
 
-    def __init__(self, cfg, lut_dir):
+    # Config sections read when building the lookup table.
+    LUT_CONFIG_KEYS = ("files", "rho_backend")
+
+    def __init__(self, cfg, lut_dir, lut=None):
         # Experiment baseline.
         self.base_cfg = copy.deepcopy(cfg)
 
-        # Build lookup table
+        # Build lookup table (or share the one provided)
         self.lut_dir = lut_dir
-        self.lut = RhoLookupTable(self.base_cfg, lut_dir)
+        self.lut = lut if lut is not None else build_rho_table(self.base_cfg, lut_dir)
+
+    def lut_inputs_match(self, cfg):
+        """True if cfg builds the same lookup table as this runner's base config."""
+        return all(cfg.get(key) == self.base_cfg.get(key) for key in self.LUT_CONFIG_KEYS)
+
+    def derive(self, cfg):
+        """
+        Return a runner for a new base config.
+
+        Shares this runner's lookup table unless cfg changes LUT inputs,
+        in which case the derived runner builds its own.
+        """
+        lut = self.lut if self.lut_inputs_match(cfg) else None
+        return self.__class__(cfg, self.lut_dir, lut=lut)
 
     # ------------------------------------------------------------------
     # Builders
@@ -65,7 +85,7 @@ class ExperimentRunner:
     def _apply_user_overrides(self, cfg,
         cell_radius=None, n_nodes=None, cell_centroid=None,
         flow_direction=None, flow_magnitude=None,
-        n_steps=None, dt=None, detail_log_interval=None,
+        n_steps=None, dt=None, detail_log_interval=None, cell_log_interval=None,
     ):
         """Apply notebook/script-friendly overrides."""
         updates = {}
@@ -91,6 +111,8 @@ class ExperimentRunner:
             updates.setdefault("simulation", {})["dt"] = dt
         if detail_log_interval is not None:
             updates.setdefault("simulation", {})["detail_log_interval"] = detail_log_interval
+        if cell_log_interval is not None:
+            updates.setdefault("simulation", {})["cell_log_interval"] = cell_log_interval
 
         return self._apply_nested(cfg, updates) if updates else cfg
 
@@ -109,57 +131,116 @@ class ExperimentRunner:
     # ------------------------------------------------------------------
     # Single Perturbation Experiment Runner
     # ------------------------------------------------------------------
-    def run_single(self, perturbation="WT", **user_kwargs):
+    def run_single(self, perturbation="WT", writers=None, **user_kwargs):
         """
         Run one perturbation and return its result.
 
         Main entry point for notebook use.
+        writers: optional dataset writers to stream time series to (see Simulation).
         """
         cfg = self.build_cfg(perturbation=perturbation, **user_kwargs)
 
-        sim = Simulation(cfg=cfg, lut=self.lut,perturbation=perturbation)
+        sim = Simulation(cfg=cfg, lut=self.lut,perturbation=perturbation, writers=writers)
+
+        return sim.run()
+
+    # ------------------------------------------------------------------
+    # Batched (Ensemble) Experiment Runner
+    # ------------------------------------------------------------------
+    def run_batch(self, perturbations, writers=None, **user_kwargs):
+        """
+        Run several perturbations as one vectorised ensemble.
+
+        Returns: list of per-perturbation results, same format as run_single().
+        """
+        cfgs = [self.build_cfg(perturbation=p, **user_kwargs) for p in perturbations]
+        sim = EnsembleSimulation(
+            cfgs=cfgs, lut=self.lut, perturbations=perturbations, writers=writers
+        )
 
         return sim.run()
 
     # ------------------------------------------------------------------
     # Full Perturbation Experiment Runner
     # ------------------------------------------------------------------
-    def run_all(self, result_dir=None, suffix=None, save_detail=False, **user_kwargs):
+    def run_all(self, result_dir=None, suffix=None, save_detail=False, batched=False,
+                output_format="csv", **user_kwargs):
         """
         Run all perturbations defined in the base config.
 
+        batched: bool – if True, advance all perturbations together as one
+            ensemble instead of one after another.
+        output_format: "csv" | "parquet" – with "parquet", time series are
+            streamed to zstd-compressed Parquet datasets in result_dir
+            (partitioned by perturbation) while the runs progress, and are
+            not kept in memory. Read them back with load_parquet_to_df.
+
         Returns: Aggregated results containing per-perturbation ones and
             concatenated DataFrames across the full experiment set.
         """
-        perturbations = require(self.base_cfg, "perturbations")
+        if output_format not in ("csv", "parquet"):
+            raise ValueError(f"Unknown output_format: {output_format!r}")
+        stream = output_format == "parquet"
+        if stream and result_dir is None:
+            raise ValueError("Parquet output streams to disk and needs a result_dir.")
+
+        perturbations = list(require(self.base_cfg, "perturbations"))
 
         cell_dfs, spring_dfs, node_dfs = [], [], []
         cell_ss_rows, spring_ss_rows, node_ss_rows = [], [], []
         results = {}
 
-        for perturbation in perturbations:
-            result = self.run_single(perturbation=perturbation, **user_kwargs)
-            results[perturbation] = result
-
-            cell_dfs.append(result["cell_df"])
-            cell_ss_rows.append(result["cell_ss"])
-
-            if save_detail:
-                spring_dfs.append(result["spring_df"])
-                node_dfs.append(result["node_df"])
-                spring_ss_rows.extend(result["spring_ss"])
-                node_ss_rows.extend(result["node_ss"])
+        levels = ("cell", "spring", "node") if save_detail else ("cell",)
+        writers = {
+            level: ParquetDatasetWriter(result_dir, f"abm_{level}_timeseries", suffix=suffix)
+            for level in levels
+        } if stream else None
 
-        cell_ts_df = pd.concat(cell_dfs, ignore_index=True)
+        try:
+            if batched:
+                run_results = self.run_batch(perturbations, writers=writers, **user_kwargs)
+            else:
+                run_results = (
+                    self.run_single(perturbation=p, writers=writers, **user_kwargs)
+                    for p in perturbations
+                )
+
+            for perturbation, result in zip(perturbations, run_results):
+                results[perturbation] = result
+
+                cell_dfs.append(result["cell_df"])
+                cell_ss_rows.append(result["cell_ss"])
+
+                if save_detail:
+                    spring_dfs.append(result["spring_df"])
+                    node_dfs.append(result["node_df"])
+                    spring_ss_rows.extend(result["spring_ss"])
+                    node_ss_rows.extend(result["node_ss"])
+        finally:
+            timeseries_paths = {
+                level: writer.close() for level, writer in (writers or {}).items()
+            }
+
+        # Streamed time series live on disk only.
+        cell_ts_df = None if stream else pd.concat(cell_dfs, ignore_index=True)
         cell_ss_df = pd.DataFrame(cell_ss_rows)
 
         if save_detail:
-            node_ts_df = pd.concat(node_dfs, ignore_index=True)
-            spring_ts_df = pd.concat(spring_dfs, ignore_index=True)
+            node_ts_df = None if stream else pd.concat(node_dfs, ignore_index=True)
+            spring_ts_df = None if stream else pd.concat(spring_dfs, ignore_index=True)
             spring_ss_df = pd.DataFrame(spring_ss_rows)
             node_ss_df = pd.DataFrame(node_ss_rows)
 
-        if result_dir is not None:
+        if stream:
+            save_df_to_parquet(cell_ss_df, result_dir, "abm_cell_steady_state", suffix=suffix)
+
+            if save_detail:
+                save_df_to_parquet(spring_ss_df, result_dir, "abm_spring_steady_state", suffix=suffix)
+                save_df_to_parquet(node_ss_df, result_dir, "abm_node_steady_state", suffix=suffix)
+
+            print(f">>> INFO: Results saved to {result_dir}")
+
+        elif result_dir is not None:
             save_df_to_csv(cell_ts_df, result_dir, "abm_cell_timeseries", suffix=suffix, ts=False)
             save_df_to_csv(cell_ss_df, result_dir, "abm_cell_steady_state", suffix=suffix, ts=False)
 
@@ -175,6 +256,7 @@ class ExperimentRunner:
             "results_by_perturbation": results,
             "cell_ts_df": cell_ts_df,
             "cell_ss_df": cell_ss_df,
+            "timeseries_paths": timeseries_paths,
             **(
                 {
                     "spring_ts_df": spring_ts_df,
@@ -184,4 +266,4 @@ class ExperimentRunner:
                 }
                 if save_detail else {}
             ),
-        }
\ No newline at end of file
+        }
@@ -6,8 +6,12 @@
 # Output format:
 #   one row per perturbation per parameter combination
 
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
 import pandas as pd
 
+from src.abm.lut_shared import release
+from src.abm.rho_lookup_table import RhoLookupTable
 from src.utils.file_utils import save_df_to_csv
 from src.utils.sweep_utils import (
     apply_param_combo,
@@ -20,35 +24,128 @@ from src.utils.sweep_utils import (
 # ------------------------------------------------------------------
 # Helpers
 # ------------------------------------------------------------------
-def _run_combo(runner, cfg_base, sweep, combo):
+def _attach_metadata(df, sweep, combo):
+    """Attach sweep name/type and flattened combo values to result rows."""
+    df["sweep_name"] = sweep["name"]
+    df["type"] = sweep["type"]
+
+    for k, v in combo_to_row(combo).items():
+        df[k] = v
+
+    return df
+
+def _run_combo(runner, cfg_base, sweep, combo, batched=False):
     """
     Run all perturbations for one parameter combination.
     Returns long-format DataFrame: one row per perturbation for this combination.
     """
     cfg = apply_param_combo(cfg_base, combo)
 
-    # Rebuild runner for this combo
-    temp_runner = runner.__class__(cfg, runner.lut_dir)
+    # Derive runner for this combo; the LUT is only rebuilt if the combo
+    # touches its inputs (e.g. the files section).
+    temp_runner = runner.derive(cfg)
 
-    result = temp_runner.run_all()
+    result = temp_runner.run_all(batched=batched)
     df = result["cell_ss_df"].copy()
 
-    # Attach metadata
-    df["sweep_name"] = sweep["name"]
-    df["type"] = sweep["type"]
+    return _attach_metadata(df, sweep, combo)
 
-    for k, v in combo_to_row(combo).items():
-        df[k] = v
+# ------------------------------------------------------------------
+# Process-pool workers
+# ------------------------------------------------------------------
+# One runner per worker process, built once by the pool initializer. When
+# the parent has published its LUT, workers attach to the shared read-only
+# table instead of each loading a private copy.
+_WORKER_RUNNER = None
+
+def _init_worker(runner_cls, cfg_base, lut_dir, lut_handle=None):
+    """Pool initializer: build this worker's runner (and LUT)."""
+    global _WORKER_RUNNER
+    lut = RhoLookupTable.attach(lut_handle, cfg_base) if lut_handle else None
+    _WORKER_RUNNER = runner_cls(cfg_base, lut_dir, lut=lut)
+
+def _run_task(combo, perturbation):
+    """Run one (combo, perturbation) task; returns its steady-state row."""
+    cfg = apply_param_combo(_WORKER_RUNNER.base_cfg, combo)
+    result = _WORKER_RUNNER.derive(cfg).run_single(perturbation=perturbation)
+    return result["cell_ss"]
+
+def _run_sweep_parallel(runner, cfg_base, sweep, combos, n_workers):
+    """
+    Distribute (combo, perturbation) tasks across a process pool.
+
+    Rows are reassembled in (combo, perturbation) order, matching the
+    serial runner. Failed tasks are reported individually and listed in
+    the returned DataFrame's attrs["failed_tasks"].
+    """
+    perturbations = list(cfg_base["perturbations"])
+    tasks = [(c, p) for c in range(len(combos)) for p in perturbations]
+    rows = [None] * len(tasks)
+    failures = []
+
+    print(f">>> INFO: {len(tasks)} tasks across {n_workers} workers")
+
+    # Share the parent's table when the workers would build the same one.
+    lut_handle = None
+    if isinstance(runner.lut, RhoLookupTable) and runner.lut_inputs_match(cfg_base):
+        lut_handle = runner.lut.publish()
+
+    try:
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            initializer=_init_worker,
+            initargs=(runner.__class__, cfg_base, runner.lut_dir, lut_handle),
+        ) as pool:
+            futures = {
+                pool.submit(_run_task, combos[c], perb): i
+                for i, (c, perb) in enumerate(tasks)
+            }
+
+            for done, future in enumerate(as_completed(futures), 1):
+                i = futures[future]
+                c, perb = tasks[i]
+                try:
+                    rows[i] = future.result()
+                except Exception as e:
+                    failures.append({**combo_to_row(combos[c]), "perturbation": perb, "error": repr(e)})
+                    print(f">>> ERROR: Sweep task failed: {combo_to_row(combos[c])} | {perb} | {e}")
+
+                if done == 1 or done % 50 == 0 or done == len(tasks):
+                    print(f"    [{done}/{len(tasks)}] tasks finished")
+    finally:
+        if lut_handle:
+            release(lut_handle)
+
+    # Reassemble per combo in deterministic order (tasks are combo-major).
+    n_perbs = len(perturbations)
+    results = []
+    for c, combo in enumerate(combos):
+        combo_rows = [r for r in rows[c * n_perbs:(c + 1) * n_perbs] if r is not None]
+        if combo_rows:
+            results.append(_attach_metadata(pd.DataFrame(combo_rows), sweep, combo))
+
+    df = pd.concat(results, ignore_index=True) if results else pd.DataFrame()
+    df.attrs["failed_tasks"] = failures
+
+    if failures:
+        print(f">>> ERROR: {len(failures)}/{len(tasks)} tasks failed in sweep {sweep['name']}")
 
     return df
 
 # ------------------------------------------------------------------
 # Generic sweep runner (1D / 2D)
 # ------------------------------------------------------------------
-def run_sweep_single(runner, cfg_base, sweep):
+def run_sweep_single(runner, cfg_base, sweep, n_workers=None, batched=False):
     """
     Run one sweep specification (1D or 2D).
     Runs sweep and return results. Does not save to csv.
+    Runs that failed are listed in the returned DataFrame's
+    attrs["failed_tasks"] (one record per combo and perturbation).
+
+    n_workers: int – optional process count. If > 1, (combo, perturbation)
+        tasks run in parallel; otherwise combinations run serially.
+    batched: bool – serial mode only; run each combination's perturbations
+        as one vectorised ensemble.
     """
     combos = build_param_combinations(sweep["parameters"])
     results = []
@@ -58,27 +155,44 @@ def run_sweep_single(runner, cfg_base, sweep):
     print(f">>> INFO: Starting {sweep['type']} sweep: {sweep['name']}")
     print(f">>> INFO: {total} parameter combinations")
 
+    if combos and any(path[0] in runner.LUT_CONFIG_KEYS for path in combos[0]):
+        print(">>> INFO: Sweep changes LUT inputs; lookup table rebuilt per combination.")
+
+    if n_workers is not None and n_workers > 1:
+        df = _run_sweep_parallel(runner, cfg_base, sweep, combos, n_workers)
+        if df.empty:
+            print(f">>> ERROR: No successful runs for sweep {sweep['name']}")
+        return df
+
+    failures = []
     for i, combo in enumerate(combos, 1):
         if i == 1 or i % 10 == 0 or i == total:
             print(f"    [{i}/{total}] {combo_to_row(combo)}")
 
         try:
-            df = _run_combo(runner, cfg_base, sweep, combo)
+            df = _run_combo(runner, cfg_base, sweep, combo, batched=batched)
             results.append(df)
         except Exception as e:
+            # A failed combo yields no rows for any of its perturbations.
+            failures += [
+                {**combo_to_row(combo), "perturbation": perb, "error": repr(e)}
+                for perb in cfg_base["perturbations"]
+            ]
             print(f">>> ERROR: Sweep combo failed: {combo_to_row(combo)} | {e}")
 
     if not results:
         print(f">>> ERROR: No successful runs for sweep {sweep['name']}")
-        return pd.DataFrame()
 
-    return pd.concat(results, ignore_index=True)
+    df = pd.concat(results, ignore_index=True) if results else pd.DataFrame()
+    df.attrs["failed_tasks"] = failures
+    return df
 
 
 # ------------------------------------------------------------------
 # Full combined sweep runner
 # ------------------------------------------------------------------
-def run_sweeps(runner, sweep_cfg, result_dir=None, target_sweeps=None, target_type=None):
+def run_sweeps(runner, sweep_cfg, result_dir=None, target_sweeps=None, target_type=None,
+               n_workers=None, batched=False):
     """
     Run selected ABM sweeps.
 
@@ -87,11 +201,13 @@ def run_sweeps(runner, sweep_cfg, result_dir=None, target_sweeps=None, target_ty
     target_sweeps : list[str] – optional list of sweep experiment to run.
     target_type : str – optional filter by sweep type ("1D", "2D").
     result_dir : Path – optional directory to save output CSV.
+    n_workers : int – optional process count for parallel sweep execution.
+    batched : bool – run each combination's perturbations as one ensemble.
 
-    Returns: DataFrame – long-format combined sweep result.
-    """
-    """
-    Run selected ABM sweeps.
+    Returns: DataFrame – long-format combined sweep result. Failed runs
+    (and sweeps that failed outright) are listed in attrs["failed_tasks"]
+    with their sweep_name, and saved next to the results CSV as
+    <filename>_failed_tasks.csv.
     """
     all_sweeps = sweep_cfg["sweeps"]
 
@@ -107,28 +223,41 @@ def run_sweeps(runner, sweep_cfg, result_dir=None, target_sweeps=None, target_ty
         return pd.DataFrame()
 
     sweep_results = []
+    failed_tasks = []
 
     for sweep in selected:
         print(f"\n>>> INFO: Initialising sweep: {sweep['name']} ({sweep['type']})")
 
         try:
-            df = run_sweep_single(runner, runner.base_cfg, sweep)
+            df = run_sweep_single(
+                runner, runner.base_cfg, sweep, n_workers=n_workers, batched=batched
+            )
 
+            # Collected here: pd.concat drops attrs that differ between sweeps.
+            failed_tasks += [
+                {"sweep_name": sweep["name"], **task} for task in df.attrs.get("failed_tasks", [])
+            ]
             if not df.empty:
                 sweep_results.append(df)
 
         except Exception as e:
+            failed_tasks.append({"sweep_name": sweep["name"], "error": repr(e)})
             print(f">>> ERROR: Failed sweep {sweep['name']}: {e}")
 
-    if not sweep_results:
+    if sweep_results:
+        full_df = pd.concat(sweep_results, ignore_index=True)
+    else:
         print(">>> ERROR: No sweeps completed successfully.")
-        return pd.DataFrame()
-
-    full_df = pd.concat(sweep_results, ignore_index=True)
+        full_df = pd.DataFrame()
+    full_df.attrs["failed_tasks"] = failed_tasks
 
     if result_dir is not None:
         filename = get_filename(selected, target_type, prefix="abm_sweep")
-        save_df_to_csv(full_df, result_dir, filename, ts=False)
-        print(f">>> INFO: Sweep results saved to {result_dir}")
+        if sweep_results:
+            save_df_to_csv(full_df, result_dir, filename, ts=False)
+            print(f">>> INFO: Sweep results saved to {result_dir}")
+        if failed_tasks:
+            save_df_to_csv(pd.DataFrame(failed_tasks), result_dir, filename, suffix="failed_tasks")
+            print(f">>> WARNING: {len(failed_tasks)} failed runs listed in {filename}_failed_tasks.csv")
 
     return full_df
\ No newline at end of file
@@ -80,13 +80,27 @@ def polygon_area(points):
     """
     Signed polygon area via the shoelace formula, returned as absolute value.
 
-    points: (N, 2) — ordered vertices of a closed polygon
-    Returns: float — polygon area
+    points: (N, 2) — ordered vertices of a closed polygon, or (..., N, 2)
+            for a batch of polygons
+    Returns: float — polygon area, or (...,) array for a batch
     """
-    x, y = points[:, 0], points[:, 1]
-    return 0.5 * abs(
-        np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1))
-    )
+    x, y = points[..., 0], points[..., 1]
+    return 0.5 * np.abs(np.sum(
+        x * np.roll(y, -1, axis=-1) - y * np.roll(x, -1, axis=-1), axis=-1
+    ))
+
+def polygon_area_gradient(points):
+    """
+    Gradient of the polygon area with respect to each vertex position.
+
+    dA/dx_i is half the chord x_(i+1) − x_(i−1) rotated 90° clockwise,
+    pointing outward under counter-clockwise vertex ordering.
+
+    points: (N, 2) — ordered vertices, or (..., N, 2) for a batch
+    Returns: (N, 2) — area gradient per vertex
+    """
+    chord = np.roll(points, -1, axis=-2) - np.roll(points, +1, axis=-2)
+    return 0.5 * np.stack([chord[..., 1], -chord[..., 0]], axis=-1)
 
 def polygon_outward_normals(points):
     """
@@ -96,11 +110,11 @@ def polygon_outward_normals(points):
     normals (each edge rotated 90° clockwise to point outward, assuming
     counter-clockwise vertex ordering).
 
-    points: (N, 2) — ordered vertices
+    points: (N, 2) — ordered vertices, or (..., N, 2) for a batch
     Returns: (N, 2) — unit outward normals, one per vertex. 
     """
-    prev_pts = np.roll(points, +1, axis=0)
-    next_pts = np.roll(points, -1, axis=0)
+    prev_pts = np.roll(points, +1, axis=-2)
+    next_pts = np.roll(points, -1, axis=-2)
 
     # Edge vectors incoming and outgoing at each vertex.
     e_in  = points - prev_pts
@@ -108,16 +122,16 @@ def polygon_outward_normals(points):
 
     # Rotate each edge 90° clockwise: (dx, dy) → (dy, -dx). 
     # Gives outward normals under counter-clockwise vertex ordering.
-    n_in  = np.column_stack([e_in[:, 1],  -e_in[:, 0]])
-    n_out = np.column_stack([e_out[:, 1], -e_out[:, 0]])
+    n_in  = np.stack([e_in[..., 1],  -e_in[..., 0]], axis=-1)
+    n_out = np.stack([e_out[..., 1], -e_out[..., 0]], axis=-1)
 
     normals = n_in + n_out
 
     # Normalise each row; leave degenerate rows as zero.
-    norms = np.linalg.norm(normals, axis=1, keepdims=True)
+    norms = np.linalg.norm(normals, axis=-1, keepdims=True)
     safe_norms = np.where(norms > 1e-10, norms, 1.0)
     normals = normals / safe_norms
-    normals[norms.flatten() <= 1e-10] = 0.0
+    normals[norms[..., 0] <= 1e-10] = 0.0
 
     return normals
 
@@ -128,17 +142,13 @@ def polygon_arc_lengths(points):
 
     A vertex arc length is half the sum of its two adjacent edge lengths. 
 
-    points: (N, 2) — ordered vertices
+    points: (N, 2) — ordered vertices, or (..., N, 2) for a batch
     Returns: (N,) — arc length per vertex
     """
-    prev_pts = np.roll(points, +1, axis=0)
-    next_pts = np.roll(points, -1, axis=0)
+    prev_pts = np.roll(points, +1, axis=-2)
+    next_pts = np.roll(points, -1, axis=-2)
 
-    len_in  = np.linalg.norm(points - prev_pts, axis=1)
-    len_out = np.linalg.norm(next_pts - points, axis=1)
+    len_in  = np.linalg.norm(points - prev_pts, axis=-1)
+    len_out = np.linalg.norm(next_pts - points, axis=-1)
 
     return 0.5 * (len_in + len_out)
-
-
-
-
@@ -2,6 +2,7 @@
 #
 # Pure mathematical functions used by mechanical classes.
 import numpy as np
+from scipy.linalg import solveh_banded
 
 def bilinear_tension(l, l0, k, kc_ratio):
     """
@@ -9,13 +10,18 @@ def bilinear_tension(l, l0, k, kc_ratio):
     Stretched (L > L0):  T = k × (L - L0), pulls nodes together
     Compressed (L < L0): T = k × kc × (L0 - L), pushes nodes apart (weak)
     
+    Accepts scalars or equally-shaped arrays (one entry per spring).
     Returns: signed axial force.
     """
     extension = l - l0 
-    if extension > 0:
-        return k * extension 
-    else:
-        return k * kc_ratio * extension 
+    return np.where(extension > 0, k * extension, k * kc_ratio * extension)
+
+def bilinear_tangent(l, l0, k, kc_ratio):
+    """
+    Tangent stiffness dT/dL of the bilinear spring: k in tension,
+    k × kc in compression. Accepts scalars or arrays like bilinear_tension.
+    """
+    return np.where(l - l0 > 0, k, k * kc_ratio)
 
 def relax_toward(current, target, dt, tau): 
     """  
@@ -33,12 +39,84 @@ def overdamped_step(force, gamma, dt, max_displacement):
     
     Returns the displacement vector. Magnitude is clamped to
     max_displacement to bound transient force spikes.
+
+    force: (2,) for one node or (N, 2) for a whole ring; each row is
+        clamped independently.
     """
     displacement = (force / gamma) * dt
     
-    d_norm = np.linalg.norm(displacement)
-    if d_norm > max_displacement:
-        displacement = displacement / d_norm * max_displacement
+    d_norm = np.linalg.norm(displacement, axis=-1, keepdims=True)
+    scale = np.minimum(1.0, max_displacement / np.maximum(d_norm, 1e-300))
+    
+    return displacement * scale
     
-    return displacement
-    
\ No newline at end of file
+def spring_stiffness_blocks(unit_vec, length, tension, tangent):
+    """
+    (N, 2, 2) stiffness of each spring with respect to its edge vector.
+
+    Axial tangent stiffness along unit_vec plus geometric stiffness T / L
+    across it. The geometric part is dropped for compressed springs so
+    every block stays positive semi-definite.
+
+    unit_vec: (N, 2); length, tension, tangent: (N,)
+    """
+    transverse = np.maximum(tension, 0.0) / np.maximum(length, 1e-10)
+    uu = unit_vec[:, :, None] * unit_vec[:, None, :]
+    return (tangent - transverse)[:, None, None] * uu + transverse[:, None, None] * np.eye(2)
+
+def implicit_ring_step(force, K, gamma, dt, rank_one=None):
+    """
+    Linearly implicit Euler step for a closed ring of springs.
+
+    Spring i joins node i to node i+1 (cyclically) with stiffness block
+    K[i]. Solves (gamma/dt × I + K_ring + u v^T) dx = force, where K_ring
+    is the cyclic block-tridiagonal ring stiffness and force the net force
+    at the current positions. The ring without its closing spring is
+    banded (bandwidth 3 with x/y interleaved) and solved by banded
+    Cholesky; the closing spring's off-diagonal coupling and the optional
+    rank-one term are added back with a Woodbury correction, so the solve
+    is O(N).
+
+    force: (N, 2) net force; K: (N, 2, 2) PSD spring blocks
+    rank_one: optional (u, v) pair of (N, 2) arrays, an extra stiffness
+        u v^T coupling all nodes (e.g. linearised area pressure)
+    Returns: (N, 2) displacement.
+    """
+    n = len(force)
+    K = np.asarray(K, dtype=float)
+
+    # Diagonal blocks: drag plus every spring touching the node.
+    diag = gamma / dt * np.eye(2) + K + np.roll(K, 1, axis=0)
+
+    # Upper-form banded storage: ab[3 + i - j, j] = M[i, j] for i <= j.
+    ab = np.zeros((4, 2 * n))
+    ab[3, 0::2] = diag[:, 0, 0]
+    ab[3, 1::2] = diag[:, 1, 1]
+    ab[2, 1::2] = diag[:, 0, 1]
+    off = -K[:-1]   # couples node i to node i+1
+    ab[1, 2::2] = off[:, 0, 0]
+    ab[0, 3::2] = off[:, 0, 1]
+    ab[2, 2::2] = off[:, 1, 0]
+    ab[1, 3::2] = off[:, 1, 1]
+
+    # Closing spring couples node N-1 back to node 0: M = M0 + U S V^T.
+    corner = [0, 1, 2 * n - 2, 2 * n - 1]
+    U = np.zeros((2 * n, 4))
+    U[corner, range(4)] = 1.0
+    V = U.copy()
+    S = np.zeros((4, 4))
+    S[:2, 2:] = -K[-1]
+    S[2:, :2] = -K[-1].T
+
+    if rank_one is not None:
+        u, v = rank_one
+        U = np.column_stack([U, np.reshape(u, -1)])
+        V = np.column_stack([V, np.reshape(v, -1)])
+        S = np.pad(S, (0, 1))
+        S[-1, -1] = 1.0
+
+    solved = solveh_banded(ab, np.column_stack([force.reshape(-1), U]))
+    y, Z = solved[:, 0], solved[:, 1:]
+    ZS = Z @ S
+    dx = y - ZS @ np.linalg.solve(np.eye(len(S)) + V.T @ ZS, V.T @ y)
+    return dx.reshape(n, 2)
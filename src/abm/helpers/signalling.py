@@ -1,6 +1,7 @@
 # abm/helpers/signalling.py
 #
 # Signalling functions: map mechanical inputs to protein recruitment.
+import numpy as np
 from src.utils.config_utils import require
 
 def hill(S, K, n):
@@ -11,18 +12,21 @@ def hill(S, K, n):
     S: stimulus magnitude
     K: half-activation threshold
     n: Hill coefficient (switch sharpness)
+
+    S may be a scalar or an array of per-node stimuli.
     """
     # No recruitment under compression. 
-    if S <= 0: 
-        return 0.0 
+    S = np.maximum(S, 0.0)
+    S_n = S**n
     
-    return S**n / (K**n + S**n)
+    return S_n / (K**n + S_n)
 
 def get_protein_recruitment(cfg, tau, protein):
     """
     Compute Hill-function recruitment for a junction protein.
     
-    tau: mechanical stimulus magnitude (tensile for DSP, shear for TJP1/JCAD)
+    tau: mechanical stimulus magnitude (tensile for DSP, shear for TJP1/JCAD),
+        scalar or (N,) array
     protein: 'DSP', 'TJP1', or 'JCAD'
     Returns: recruitment level in [0, p_max], or 0.0 if the protein is knocked out
     """
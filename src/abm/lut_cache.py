@@ -0,0 +1,99 @@
+# abm/lut_cache.py
+#
+# Persistent cache for compiled Rho lookup tables.
+#
+# A compiled table is stored next to its recruitment CSV as two files:
+#   <csv stem>.lut.npy  — table array, loaded memory-mapped
+#   <csv stem>.lut.json — cache key, backend and axis coordinates
+#
+# The key is a content hash of the CSV plus the build options, so the cache
+# is invalidated automatically whenever the CSV (or build logic) changes.
+#
+# Array layout by backend:
+#   regular — (nDSP, nTJP1, nJCAD, 2) RhoA / RhoC grid, axes in the JSON
+#   adaptive — (L, 22) octree leaves (see OctreeInterpolator); axes hold
+#              the domain corners [lo, hi]
+#   scattered — (M, 5) rows of [DSP, TJP1, JCAD, RhoA, RhoC]
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+CACHE_FORMAT_VERSION = 1
+
+
+def cache_paths(csv_path):
+    """Return (array_path, meta_path) for the cache of a recruitment CSV."""
+    stem = csv_path.with_suffix('')
+    return stem.with_name(stem.name + '.lut.npy'), stem.with_name(stem.name + '.lut.json')
+
+
+def cache_key(csv_path, build_options):
+    """Content hash of the CSV bytes plus the build options."""
+    h = hashlib.sha256()
+    h.update(csv_path.read_bytes())
+    h.update(json.dumps(
+        {'version': CACHE_FORMAT_VERSION, **build_options}, sort_keys=True
+    ).encode())
+    return h.hexdigest()
+
+
+def load_compiled(csv_path, key):
+    """
+    Load a cached compiled table if it matches key.
+
+    Returns: (backend, array, axes) with array memory-mapped read-only,
+        or None on a miss (absent, stale or unreadable cache).
+    """
+    array_path, meta_path = cache_paths(csv_path)
+    if not (array_path.exists() and meta_path.exists()):
+        return None
+
+    try:
+        meta = json.loads(meta_path.read_text())
+        if meta.get('key') != key:
+            return None
+        array = np.load(array_path, mmap_mode='r')
+    except (OSError, ValueError):
+        return None
+
+    axes = [np.asarray(ax, dtype=float) for ax in meta.get('axes') or []]
+    return meta['backend'], array, axes
+
+
+def save_compiled(csv_path, key, backend, array, axes=None):
+    """
+    Write a compiled table to the cache next to csv_path.
+
+    Files are written to temporaries and renamed into place so concurrent
+    readers never see a partial cache. The array is written before the
+    metadata, so a key match always refers to a complete array.
+    Returns True on success, False if the cache could not be written.
+    """
+    array_path, meta_path = cache_paths(csv_path)
+    meta = {
+        'key': key,
+        'backend': backend,
+        'axes': [np.asarray(ax).tolist() for ax in axes] if axes is not None else None,
+    }
+
+    pid = os.getpid()
+    tmp_array = array_path.with_name(f"{array_path.name}.{pid}.tmp")
+    tmp_meta = meta_path.with_name(f"{meta_path.name}.{pid}.tmp")
+
+    try:
+        with open(tmp_array, 'wb') as f:
+            np.save(f, np.ascontiguousarray(array, dtype=float))
+        os.replace(tmp_array, array_path)
+
+        tmp_meta.write_text(json.dumps(meta))
+        os.replace(tmp_meta, meta_path)
+    except OSError as e:
+        print(f">>> WARNING: Could not write LUT cache to {array_path.parent}: {e}")
+        for tmp in (tmp_array, tmp_meta):
+            tmp.unlink(missing_ok=True)
+        return False
+
+    return True
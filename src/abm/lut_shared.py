@@ -0,0 +1,57 @@
+# abm/lut_shared.py
+#
+# Publish a compiled Rho lookup table for zero-copy use by worker processes.
+#
+# The parent writes each array of the compiled table to its own .npy file
+# in a fresh directory (RAM-backed /dev/shm when available) together with
+# a small JSON manifest. Workers memory-map the arrays read-only, so every
+# process shares the same physical pages and the footprint stays flat as
+# workers are added. The directory path is the handle passed to workers.
+
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+MANIFEST = 'manifest.json'
+
+
+def _default_root():
+    shm = Path('/dev/shm')
+    return str(shm) if shm.is_dir() else None
+
+
+def publish_arrays(arrays, meta, directory=None):
+    """
+    Write arrays for memory-mapped sharing.
+
+    arrays: dict {name: ndarray}
+    meta: dict – JSON-serialisable description stored in the manifest
+    directory: optional parent directory (default /dev/shm, else the
+        system temp dir)
+    Returns: str handle (path of the published directory).
+    """
+    path = Path(tempfile.mkdtemp(prefix='rho_lut_', dir=directory or _default_root()))
+    for name, array in arrays.items():
+        np.save(path / f'{name}.npy', np.ascontiguousarray(array))
+    (path / MANIFEST).write_text(json.dumps({'arrays': list(arrays), **meta}))
+    return str(path)
+
+
+def attach_arrays(handle):
+    """
+    Memory-map a published table.
+    Returns: (arrays, meta) with arrays read-only and shared between
+    processes.
+    """
+    path = Path(handle)
+    meta = json.loads((path / MANIFEST).read_text())
+    arrays = {name: np.load(path / f'{name}.npy', mmap_mode='r') for name in meta.pop('arrays')}
+    return arrays, meta
+
+
+def release(handle):
+    """Remove a published table. Processes already attached keep their maps."""
+    shutil.rmtree(handle, ignore_errors=True)
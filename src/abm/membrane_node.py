@@ -1,127 +1,107 @@
 # abm/membrane_agent.py
 #
-# A discrete point on the cell membrane carrying mechanical and signalling state. 
+# A discrete point on the cell membrane carrying mechanical and signalling state.
 # Nodes are the fundamental agents of the ABM.
 #
-# Responsibilities:
-#   1. Mechanics — accumulate forces, integrate position
-#   2. Load channels — accumulate mechanical stimuli for signalling
-#   3. Signalling — map accumulated stimuli → junction proteins → Rho
-
-import numpy as np
-from src.abm.helpers.signalling import get_protein_recruitment
-from src.abm.helpers.mechanics import overdamped_step
-from src.utils.config_utils import require
+# State lives in the owning cell's CellState arrays; a MembraneNode is a
+# thin view onto row `id` of those arrays. The cell advances all nodes
+# together with whole-array operations (see Cell.step).
+#
+# Per-node state exposed:
+#   1. Mechanics — position and accumulated force
+#   2. Load channels — accumulated mechanical stimuli for signalling
+#   3. Signalling — junction proteins and Rho activation
 
 class MembraneNode:
     """
     A single membrane node: position, accumulated force, signalling state.
+    View onto row `node_id` of a CellState.
     """
-    def __init__(self, node_id, position, lut, cfg):
+    def __init__(self, node_id, state):
         self.id = node_id
-        self.pos = np.array(position, dtype=float)
-
-        # --- Mechanics ---
-        sim = require(cfg, 'simulation')
-        self.force = np.zeros(2) # Force accumulator
-        self.visc = require(sim, 'viscousity')
-        self.max_disp = require(sim, 'max_displacement')
-
-        # --- Load channels (signalling stimuli) --
-        self.tensile_load = 0.0 # tensile stimulus (cortex + SF + flow baseline)
-        self.shear_load = 0.0 # shear stimulus (flow magnitude)
+        self._state = state
 
-        # --- Signalling ---
-        self.lut = lut
-        self.cfg = cfg
-
-        self.DSP, self.TJP1, self.JCAD = 0.0, 0.0, 0.0
-        self.rhoa, self.rhoc = 0.0,  0.0
+    # ------------------------------------------------------------------
+    # Mechanics
+    # ------------------------------------------------------------------
+    @property
+    def pos(self):
+        """(2,) position — writable view into the cell's position array."""
+        return self._state.pos[self.id]
 
-    def reset_tensile_load(self):
-        """Converts net force to displacement."""
-        self.tensile_load = 0.0
+    @pos.setter
+    def pos(self, value):
+        self._state.pos[self.id] = value
 
-    def reset_force(self):
-        """Converts net force to displacement."""
-        self.force[:] = 0.0
+    @property
+    def force(self):
+        """(2,) force accumulator — writable view into the cell's force array."""
+        return self._state.force[self.id]
 
     # ------------------------------------------------------------------
-    # Integration — called once per step after all forces are accumulated
+    # Load channels
     # ------------------------------------------------------------------
-    def _update_position(self, dt):
-        """Converts net force to displacement."""
-        self.pos += overdamped_step(self.force, self.visc, dt, self.max_disp)
+    @property
+    def tensile_load(self):
+        return float(self._state.tensile_load[self.id])
+
+    @property
+    def shear_load(self):
+        return float(self._state.shear_load[self.id])
 
     # ------------------------------------------------------------------
-    # Signalling — called once per step after integration
+    # Signalling
     # ------------------------------------------------------------------
-    def _update_signalling(self):
-        """
-        Update protein recruitment and Rho activation from current loads.
-        Pipeline: mechanical loads → Hill → junction proteins → LUT → Rho activation
+    @property
+    def DSP(self):
+        return float(self._state.DSP[self.id])
 
-        DSP: tensile loading 
-        TJP1: total shear magnitude 
-        JCAD: total shear magnitude 
-        """
-        # Clamp mechanical loads to non-negatice
-        S_dsp  = max(self.tensile_load, 0.0)
-        S_tjp1 = max(self.tensile_load, 0.0) 
-        S_jcad = max(self.shear_load, 0.0) 
+    @property
+    def TJP1(self):
+        return float(self._state.TJP1[self.id])
 
-        # Hill → junction protein recruitment
-        self.DSP  = get_protein_recruitment(self.cfg, S_dsp, 'DSP')
-        self.TJP1 = get_protein_recruitment(self.cfg, S_tjp1, 'TJP1')
-        self.JCAD = get_protein_recruitment(self.cfg, S_jcad, 'JCAD')
+    @property
+    def JCAD(self):
+        return float(self._state.JCAD[self.id])
 
-        # LUT → Rho activation
-        self.rhoa, self.rhoc = self.lut.query(self.DSP, self.TJP1, self.JCAD)
-    
-    # ------------------------------------------------------------------
-    # Step
-    # ------------------------------------------------------------------
-    def step(self, dt): 
-        """
-        Membrane Agents Step, called by cell during its own step() function.
-        1. Update its own position (mechanical)
-        2. Updates its own signalling
-        3. Resets load channels and forces. 
-        """
-        self._update_position(dt)
-        self._update_signalling()
+    @property
+    def rhoa(self):
+        return float(self._state.rhoa[self.id])
+
+    @property
+    def rhoc(self):
+        return float(self._state.rhoc[self.id])
 
     # ------------------------------------------------------------------
-    # Accumulators — called by springs, stress fibre, flow
+    # Accumulators — for external agents acting on a single node
     # ------------------------------------------------------------------
     def add_tensile_load(self, load):
         """Add a tensile stimulus contribution from a mechanical agent."""
-        self.tensile_load += load
+        self._state.tensile_load[self.id] += load
 
     def apply_force(self, force):
         """Add a force vector contribution from a mechanical agent."""
-        force = np.asarray(force)
-        self.force += force
+        self._state.force[self.id] += force
 
     # ------------------------------------------------------------------
     # Diagnostics
-    # ------------------------------------------------------------------  
+    # ------------------------------------------------------------------
     def get_state(self):
         return {
-            'id': self.id, 
-            'position': (float(self.pos[0].round(2)), float(self.pos[1].round(2))), 
-            'tensile_load': self.tensile_load, 
-            'shear_load': self.shear_load, 
-            'DSP': self.DSP, 
-            'TJP1': self.TJP1, 
-            'JCAD': self.JCAD, 
-            'rhoa': self.rhoa, 
+            'id': self.id,
+            'position': (float(self.pos[0].round(2)), float(self.pos[1].round(2))),
+            'tensile_load': self.tensile_load,
+            'shear_load': self.shear_load,
+            'DSP': self.DSP,
+            'TJP1': self.TJP1,
+            'JCAD': self.JCAD,
+            'rhoa': self.rhoa,
             'rhoc': self.rhoc
-        }    
-    
+        }
+
     def __repr__(self):
         return (
             f"MembraneNode(id={self.id} | pos={self.pos.round(2)} | "
             f"DSP={self.DSP:.3f} | TJP1={self.TJP1:.3f} | JCAD={self.JCAD:.3f} | "
             f"rhoa={self.rhoa:.3f} | rhoc={self.rhoc:.3f})"
-        )
\ No newline at end of file
+        )
@@ -0,0 +1,127 @@
+# abm/quasi_static.py
+#
+# Quasi-static steady-state solver for one cell.
+#
+# A run's outputs are its steady-state snapshots, so instead of integrating
+# thousands of overdamped steps the coupled fixed point is solved directly.
+#
+# Unknowns: node positions, cortex spring activations and SF activation
+# (Rho levels follow from the loads at those values). The fixed-point map
+# G is one Cell.step with the semi-implicit integrator at a large pseudo
+# timestep: the Cell's own force assembly, signalling and remodelling,
+# with the stiff spring and pressure terms solved implicitly. G(z) = z
+# exactly when the net force vanishes and every activation sits at its
+# Rho-dependent target, i.e. at the state time stepping converges to.
+#
+# The iteration is Anderson-accelerated (type II, Walker & Ni) with a
+# safeguard: a step that blows up the residual clears the history and
+# falls back to a plain G step.
+
+import numpy as np
+
+from src.utils.config_utils import require
+
+
+class QuasiStaticSolver:
+    """
+    Anderson-accelerated fixed-point solve of a cell's steady state.
+    qs_cfg: dict – simulation.quasi_static config block:
+        pseudo_dt: pseudo timestep of the fixed-point map (min)
+        memory: Anderson history length (0 = plain fixed-point iteration)
+        tol: converged once max |G(z) − z| is below this
+        max_iter: residual evaluations before giving up
+    """
+
+    # A step whose residual grows by more than this factor resets the history.
+    SAFEGUARD = 10.0
+
+    def __init__(self, qs_cfg):
+        self.pseudo_dt = float(require(qs_cfg, 'pseudo_dt'))
+        self.memory = int(qs_cfg.get('memory', 5))
+        self.tol = float(require(qs_cfg, 'tol'))
+        self.max_iter = int(require(qs_cfg, 'max_iter'))
+
+    # ------------------------------------------------------------------
+    # State packing
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _pack(cell):
+        st = cell.state
+        return np.concatenate([st.pos.ravel(), st.a, [cell.sf.a]])
+
+    @staticmethod
+    def _unpack(cell, z):
+        st = cell.state
+        n = cell.n_nodes
+        st.pos[:] = z[:2 * n].reshape(n, 2)
+        st.a[:] = z[2 * n:3 * n]
+        cell.sf.a = float(z[-1])
+
+    def _map(self, cell, flow, z):
+        """G(z): one semi-implicit pseudo-step of the cell from state z."""
+        self.evaluations += 1
+        self._unpack(cell, z)
+        cell.step(flow, dt=self.pseudo_dt)
+        return self._pack(cell)
+
+    # ------------------------------------------------------------------
+    # Solve
+    # ------------------------------------------------------------------
+    def solve(self, cell, flow):
+        """
+        Drive cell to its steady state in place.
+
+        The cell is left at the last evaluated G(z), so its loads, Rho
+        levels and tensions are consistent with its positions.
+        Returns: dict of converged, evaluations (calls of G), residual
+        (final max-norm) and residuals (one per iteration).
+        """
+        # Pseudo-steps use the semi-implicit integrator in lockstep.
+        saved = (cell._integrator, cell._mech_substeps)
+        cell._integrator, cell._mech_substeps = 'semi_implicit', 1
+
+        self.evaluations = 0
+        residuals = []
+        try:
+            z = self._pack(cell)
+            g = self._map(cell, flow, z)
+            f = g - z
+            dG, dF = [], []
+
+            while True:
+                res = float(np.abs(f).max()) if np.all(np.isfinite(f)) else np.inf
+                residuals.append(res)
+                if res < self.tol or self.evaluations >= self.max_iter:
+                    break
+
+                # Anderson mixing over the last `memory` differences.
+                z_next = g
+                if dF:
+                    gamma = np.linalg.lstsq(np.column_stack(dF), f, rcond=None)[0]
+                    z_next = g - np.column_stack(dG) @ gamma
+
+                g_next = self._map(cell, flow, z_next)
+                f_next = g_next - z_next
+
+                grew = not np.all(np.isfinite(f_next)) or \
+                    np.abs(f_next).max() > self.SAFEGUARD * res
+                if grew and dF:
+                    # Safeguard: restart from the plain fixed-point step.
+                    dG, dF = [], []
+                    g_next = self._map(cell, flow, g)
+                    f_next = g_next - g
+                elif self.memory > 0:
+                    dG.append(g_next - g)
+                    dF.append(f_next - f)
+                    del dG[:-self.memory], dF[:-self.memory]
+
+                g, f = g_next, f_next
+        finally:
+            cell._integrator, cell._mech_substeps = saved
+
+        return {
+            'converged': residuals[-1] < self.tol,
+            'evaluations': self.evaluations,
+            'residual': residuals[-1],
+            'residuals': residuals,
+        }
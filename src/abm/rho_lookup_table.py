@@ -5,30 +5,425 @@
 #
 # The table is built from the MaBoSS recruitment sweep and queried
 # by membrane agents during the signalling phase,
+#
+# Backends:
+#   - regular: the sweep is a full Cartesian grid, so values are held in a
+#     dense (nDSP, nTJP1, nJCAD, 2) array and queried by trilinear
+#     interpolation with index arithmetic (no simplex search)
+#   - adaptive: the sweep came from the adaptive LUT builder (has a `level`
+#     column); its octree is rebuilt and each query does trilinear
+#     interpolation inside the leaf cell containing it, found by indexing
+#     a dense grid of finest-level cells
+#   - scattered: Delaunay-based LinearNDInterpolator, used only when the
+#     grid is incomplete
+#
+# Sources, in order of preference:
+#   1. the dense artifact run_lut_sweep writes next to the CSV
+#      (<csv stem>.npz), used when it matches the CSV's hash
+#   2. the compiled-table cache next to the CSV (see lut_cache), which
+#      memory-maps a table built by an earlier construction
+#   3. the CSV itself (parsed with pandas, then cached)
+#
+# A built table can be published for worker processes (see lut_shared):
+# workers attach to the read-only memory-mapped arrays instead of loading
+# their own copy.
+
+import itertools
 
 import pandas as pd
 import numpy as np
 from scipy.interpolate import LinearNDInterpolator
 
+from src.abm import lut_cache, lut_shared
+from src.utils.file_utils import file_sha256, load_lut_artifact
+
+RECRUITMENT_PARAMS = ['$DSP_recruitment', '$TJP1_recruitment', '$JCAD_recruitment']
+
+
+class TrilinearGridInterpolator:
+    """
+    Trilinear interpolation on a complete tensor-product grid.
+
+    axes: three sorted 1D coordinate arrays (DSP, TJP1, JCAD)
+    values: (nx, ny, nz, n_out) array of grid values
+    Called with (N, 3) points; returns (N, n_out), NaN outside the grid.
+    """
+
+    def __init__(self, axes, values):
+        self.axes = [np.asarray(ax, dtype=float) for ax in axes]
+        self.values = np.ascontiguousarray(values, dtype=float)
+
+        self.lo = np.array([ax[0] for ax in self.axes])
+        self.hi = np.array([ax[-1] for ax in self.axes])
+        self.spacing = np.array([(ax[-1] - ax[0]) / (len(ax) - 1) for ax in self.axes])
+
+        # Uniform axes are indexed arithmetically; others by binary search.
+        self.uniform = [
+            np.allclose(np.diff(ax), sp, rtol=1e-6, atol=1e-9)
+            for ax, sp in zip(self.axes, self.spacing)
+        ]
+
+    def _locate(self, dim, x):
+        """Lower cell index and fractional offset along one axis."""
+        ax = self.axes[dim]
+        if self.uniform[dim]:
+            idx = np.floor((x - self.lo[dim]) / self.spacing[dim]).astype(np.intp)
+        else:
+            idx = np.searchsorted(ax, x, side='right') - 1
+        idx = np.clip(idx, 0, len(ax) - 2)
+
+        frac = (x - ax[idx]) / (ax[idx + 1] - ax[idx])
+        return idx, frac
+
+    def __call__(self, pts):
+        pts = np.atleast_2d(np.asarray(pts, dtype=float))
+        outside = ((pts < self.lo - 1e-9) | (pts > self.hi + 1e-9)).any(axis=1)
+        x = np.clip(pts, self.lo, self.hi)
+
+        (i, fi), (j, fj), (k, fk) = (self._locate(d, x[:, d]) for d in range(3))
+
+        # Weighted sum over the 8 corners of each enclosing cell.
+        out = np.zeros((len(pts), self.values.shape[-1]))
+        for ci, cj, ck in itertools.product((0, 1), repeat=3):
+            w = ((fi if ci else 1.0 - fi) *
+                 (fj if cj else 1.0 - fj) *
+                 (fk if ck else 1.0 - fk))
+            out += w[:, None] * self.values[i + ci, j + cj, k + ck]
+
+        out[outside] = np.nan
+        return out
+
+
+class OctreeInterpolator:
+    """
+    Trilinear interpolation on the leaf cells of an adaptively refined grid.
+
+    leaves: (L, 6 + 8 * n_out) array – per leaf [x0, y0, z0, sx, sy, sz]
+        (lower corner and edge lengths) followed by its 8 corner values,
+        corners in itertools.product((0, 1), repeat=3) order
+    lo, hi: (3,) domain corners
+    leaf_index: optional precomputed finest-cell -> leaf grid (as held by
+        an earlier instance); built from the leaves when omitted
+    Called with (N, 3) points; returns (N, n_out), NaN outside the domain.
+    Adjacent leaves of different sizes are interpolated independently, so
+    values may jump slightly across a refinement boundary.
+    """
+
+    def __init__(self, leaves, lo, hi, leaf_index=None):
+        self.leaves = np.ascontiguousarray(leaves, dtype=float)
+        self.lo = np.asarray(lo, dtype=float)
+        self.hi = np.asarray(hi, dtype=float)
+
+        n_leaves = len(self.leaves)
+        self.origin = self.leaves[:, :3]
+        self.size = self.leaves[:, 3:6]
+        self.corners = self.leaves[:, 6:].reshape(n_leaves, 8, -1)
+
+        # Dense grid of finest-level cells -> index of the leaf covering it.
+        self.unit = self.size.min(axis=0)
+        if leaf_index is not None:
+            self.leaf_index = leaf_index
+            return
+
+        shape = np.rint((self.hi - self.lo) / self.unit).astype(int)
+        start = np.rint((self.origin - self.lo) / self.unit).astype(int)
+        width = np.rint(self.size / self.unit).astype(int)
+
+        self.leaf_index = np.full(shape, -1, dtype=np.int32)
+        for n, ((i, j, k), (wi, wj, wk)) in enumerate(zip(start, width)):
+            self.leaf_index[i:i + wi, j:j + wj, k:k + wk] = n
+        if (self.leaf_index < 0).any():
+            raise ValueError("Octree leaves do not cover the LUT domain.")
+
+    def __call__(self, pts):
+        pts = np.atleast_2d(np.asarray(pts, dtype=float))
+        outside = ((pts < self.lo - 1e-9) | (pts > self.hi + 1e-9)).any(axis=1)
+        x = np.clip(pts, self.lo, self.hi)
+
+        cell = np.floor((x - self.lo) / self.unit).astype(np.intp)
+        cell = np.clip(cell, 0, np.array(self.leaf_index.shape) - 1)
+        leaf = self.leaf_index[cell[:, 0], cell[:, 1], cell[:, 2]]
+
+        f = np.clip((x - self.origin[leaf]) / self.size[leaf], 0.0, 1.0)
+        corners = self.corners[leaf]
+
+        out = np.zeros((len(pts), corners.shape[-1]))
+        for c, (ci, cj, ck) in enumerate(itertools.product((0, 1), repeat=3)):
+            w = ((f[:, 0] if ci else 1.0 - f[:, 0]) *
+                 (f[:, 1] if cj else 1.0 - f[:, 1]) *
+                 (f[:, 2] if ck else 1.0 - f[:, 2]))
+            out += w[:, None] * corners[:, c]
+
+        out[outside] = np.nan
+        return out
+
+
 class RhoLookupTable: 
+    # Options that change the compiled table; part of the cache key.
+    BUILD_OPTIONS = {'round_decimals': 3}
+
     def __init__(self, cfg, recruitment_dir):
         self.cfg = cfg
+        files_cfg = cfg['files']
 
-        # --- Load recruitment sweep data ---
-        path = recruitment_dir / cfg['files']['recruitment_csv']
-        df = pd.read_csv(path).dropna(axis=1).round(3)
-        print(f">>> DEBUG: Successfully loaded recruitment parameter sweep data.")
-        
-        # --- Build interpolators ---
-        self.rhoA_interp, self.rhoC_interp = self._build(df)
+        # --- Load the sweep artifact or compiled cache, or build from the CSV ---
+        path = recruitment_dir / files_cfg['recruitment_csv']
+        use_cache = files_cfg.get('lut_cache', True)
+
+        artifact = self._load_artifact(path) if files_cfg.get('lut_artifact', True) else None
+
+        compiled = None
+        if artifact is None and use_cache:
+            self.cache_key = lut_cache.cache_key(path, self.BUILD_OPTIONS)
+            compiled = lut_cache.load_compiled(path, self.cache_key)
+
+        if artifact is not None:
+            self.backend = 'regular'
+            self.rho_interp = artifact
+            print(f">>> DEBUG: Loaded LUT artifact {path.with_suffix('.npz').name}.")
+        elif compiled is not None:
+            self.backend, array, axes = compiled
+            self.rho_interp = self._from_compiled(array, axes)
+            print(f">>> DEBUG: Loaded compiled {self.backend} LUT from cache.")
+        else:
+            df = pd.read_csv(path).dropna(axis=1).round(self.BUILD_OPTIONS['round_decimals'])
+            print(f">>> DEBUG: Successfully loaded recruitment parameter sweep data.")
+
+            # --- Build interpolator ---
+            self.rho_interp = self._build(df)
+
+            if use_cache:
+                lut_cache.save_compiled(path, self.cache_key, self.backend, *self._to_compiled())
 
         # --- Rest-state query ---
-        rhoa_rest = float(self.rhoA_interp([0.0, 0.0, 0.0]))
-        rhoc_rest = float(self.rhoC_interp([0.0, 0.0, 0.0]))
+        rhoa_rest, rhoc_rest = self.query(0.0, 0.0, 0.0)
         print(f"LUT ready | rest: RhoA={rhoa_rest:.3f} RhoC={rhoc_rest:.3f}")
 
+    # ------------------------------------------------------------------
+    # Dense artifact from run_lut_sweep
+    # ------------------------------------------------------------------
+    def _load_artifact(self, csv_path):
+        """
+        Regular-grid interpolator from <csv stem>.npz, or None if there is
+        no usable artifact (absent, other layout, or stale vs. the CSV).
+        """
+        loaded = load_lut_artifact(csv_path.with_suffix('.npz'))
+        if loaded is None:
+            return None
+
+        axes, values, meta = loaded
+        if meta.get('parameters') != RECRUITMENT_PARAMS or meta.get('outputs') != ['RhoA', 'RhoC']:
+            return None
+        if min(len(ax) for ax in axes) < 2 or np.isnan(values).any():
+            return None
+        if csv_path.exists() and meta.get('csv_sha256') != file_sha256(csv_path):
+            print(f">>> WARNING: {csv_path.with_suffix('.npz').name} does not match "
+                  f"{csv_path.name}; rebuilding the LUT from the CSV.")
+            return None
+
+        # Same rounding as a table built from the CSV.
+        decimals = self.BUILD_OPTIONS['round_decimals']
+        return TrilinearGridInterpolator(
+            [np.round(ax, decimals) for ax in axes], np.round(values, decimals)
+        )
+
+    # ------------------------------------------------------------------
+    # Compiled form (cache round-trip)
+    # ------------------------------------------------------------------
+    def _to_compiled(self):
+        """Return (array, axes) holding the compiled table for this backend."""
+        if self.backend == 'regular':
+            return self.rho_interp.values, self.rho_interp.axes
+        if self.backend == 'adaptive':
+            return self.rho_interp.leaves, [self.rho_interp.lo, self.rho_interp.hi]
+
+        points = self.rho_interp.points
+        values = self.rho_interp.values.reshape(len(points), 2)
+        return np.hstack([points, values]), None
+
+    def _from_compiled(self, array, axes):
+        """Rebuild the interpolator from a compiled (array, axes) pair."""
+        if self.backend == 'regular':
+            return TrilinearGridInterpolator(axes, array)
+        if self.backend == 'adaptive':
+            return OctreeInterpolator(array, *axes)
+
+        return LinearNDInterpolator(array[:, :3], array[:, 3:5])
+
+    # ------------------------------------------------------------------
+    # Sharing between processes
+    # ------------------------------------------------------------------
+    def publish(self, directory=None):
+        """
+        Publish the compiled table for zero-copy use by other processes.
+        directory: optional parent directory (default /dev/shm when present)
+        Returns: str handle for RhoLookupTable.attach; remove it with
+            lut_shared.release once no new workers will attach.
+        """
+        array, axes = self._to_compiled()
+        arrays = {'table': array}
+        if self.backend == 'regular':
+            arrays.update({f'axis_{i}': ax for i, ax in enumerate(axes)})
+        elif self.backend == 'adaptive':
+            arrays.update(lo=axes[0], hi=axes[1], leaf_index=self.rho_interp.leaf_index)
+
+        return lut_shared.publish_arrays(arrays, {'backend': self.backend}, directory)
+
+    @classmethod
+    def attach(cls, handle, cfg=None):
+        """
+        Table backed by the read-only arrays behind a publish() handle.
+
+        Regular and adaptive tables share all their arrays with the
+        publisher. Scattered tables share their sample points but rebuild
+        the Delaunay triangulation in each process.
+        """
+        arrays, meta = lut_shared.attach_arrays(handle)
+
+        lut = cls.__new__(cls)
+        lut.cfg = cfg
+        lut.backend = meta['backend']
+        if lut.backend == 'regular':
+            lut.rho_interp = TrilinearGridInterpolator(
+                [arrays[f'axis_{i}'] for i in range(3)], arrays['table']
+            )
+        elif lut.backend == 'adaptive':
+            lut.rho_interp = OctreeInterpolator(
+                arrays['table'], arrays['lo'], arrays['hi'], leaf_index=arrays['leaf_index']
+            )
+        else:
+            lut.rho_interp = lut._from_compiled(arrays['table'], None)
+        return lut
+
+    # ------------------------------------------------------------------
+    # Builders
+    # ------------------------------------------------------------------
     def _build(self, df):
-        """Build linear interpolators from the recruitment sweep table."""
+        """
+        Build the interpolator from the recruitment sweep table.
+
+        Uses the adaptive backend for refined sweeps (with a `level`
+        column), the regular-grid backend when the sweep is a complete
+        Cartesian grid, otherwise falls back to scattered interpolation.
+        """
+        if 'level' in df.columns and df['level'].max() > 0:
+            interp = self._build_adaptive(df)
+            if interp is not None:
+                self.backend = 'adaptive'
+                print(f">>> DEBUG: Successfully built adaptive octree interpolator")
+                return interp
+
+        interp = self._build_regular(df)
+        if interp is not None:
+            self.backend = 'regular'
+            print(f">>> DEBUG: Successfully built regular-grid interpolator")
+            return interp
+
+        self.backend = 'scattered'
+        return self._build_scattered(df)
+
+    @staticmethod
+    def _recruitment_coords(df):
+        """
+        (N, 3) DSP / TJP1 / JCAD coordinates of each sweep row, or None if
+        the pN_name columns do not name exactly the recruitment parameters.
+        """
+        # Map each recruitment parameter to the pN_value column holding it.
+        value_cols = {}
+        for i in (1, 2, 3):
+            names = df.get(f'p{i}_name')
+            if names is None or names.nunique() != 1:
+                return None
+            value_cols[names.iloc[0]] = f'p{i}_value'
+
+        if set(value_cols) != set(RECRUITMENT_PARAMS):
+            return None
+
+        return df[[value_cols[p] for p in RECRUITMENT_PARAMS]].to_numpy(dtype=float)
+
+    def _build_regular(self, df):
+        """
+        Build a dense (nDSP, nTJP1, nJCAD, 2) table from a full Cartesian sweep.
+
+        Returns None if the sweep is not a complete tensor-product grid.
+        """
+        coords = self._recruitment_coords(df)
+        if coords is None:
+            return None
+
+        axes = [np.unique(coords[:, d]) for d in range(3)]
+        shape = tuple(len(ax) for ax in axes)
+
+        if min(shape) < 2:
+            return None
+
+        # Every grid node must appear exactly once.
+        idx = [np.searchsorted(axes[d], coords[:, d]) for d in range(3)]
+        flat = np.ravel_multi_index(idx, shape)
+        if len(np.unique(flat)) != len(flat) or len(flat) != np.prod(shape):
+            return None
+
+        values = np.empty(shape + (2,))
+        values[tuple(idx)] = df[['RhoA', 'RhoC']].to_numpy(dtype=float)
+
+        return TrilinearGridInterpolator(axes, values)
+
+    def _build_adaptive(self, df):
+        """
+        Rebuild the octree of an adaptive LUT sweep.
+
+        Level-0 rows form the base grid; a cell was split exactly when its
+        centre is a table point. Returns None if the table is not a
+        consistent octree (the caller then falls back to other backends).
+        """
+        coords = self._recruitment_coords(df)
+        if coords is None:
+            return None
+
+        levels = df['level'].to_numpy(dtype=int)
+        base = coords[levels == 0]
+        axes = [np.unique(base[:, d]) for d in range(3)]
+        if min(len(ax) for ax in axes) < 2 or len(base) != np.prod([len(ax) for ax in axes]):
+            return None
+
+        # Integer lattice at the finest spacing (coordinates are rounded).
+        scale = 2 ** int(levels.max())
+        lo = np.array([ax[0] for ax in axes])
+        hi = np.array([ax[-1] for ax in axes])
+        unit = (hi - lo) / np.array([len(ax) - 1 for ax in axes]) / scale
+        lattice = np.rint((coords - lo) / unit).astype(int)
+        point_of = {tuple(p): n for n, p in enumerate(lattice)}
+        rho = df[['RhoA', 'RhoC']].to_numpy(dtype=float)
+
+        corner_offsets = list(itertools.product((0, 1), repeat=3))
+        stack = [(tuple(scale * np.array(idx)), scale)
+                 for idx in itertools.product(*(range(len(ax) - 1) for ax in axes))]
+        leaves = []
+        while stack:
+            corner, size = stack.pop()
+            half = size // 2
+            if size > 1 and tuple(c + half for c in corner) in point_of:
+                stack.extend((tuple(c + o * half for c, o in zip(corner, off)), half)
+                             for off in corner_offsets)
+                continue
+
+            try:
+                values = [rho[point_of[tuple(c + o * size for c, o in zip(corner, off))]]
+                          for off in corner_offsets]
+            except KeyError:
+                return None
+            leaves.append(np.concatenate([lo + np.array(corner) * unit, size * unit,
+                                          np.ravel(values)]))
+
+        return OctreeInterpolator(np.array(leaves), lo, hi)
+
+    def _build_scattered(self, df):
+        """
+        Build one linear interpolator from the recruitment sweep table.
+
+        RhoA and RhoC are stored as two value columns on a single
+        triangulation, so each query does one simplex search for both.
+        """
         df_filtered = df[['RhoA', 'RhoC',
                           'p1_name','p1_value', # DSP
                           'p2_name','p2_value', # TJP1
@@ -48,16 +443,31 @@ class RhoLookupTable:
                             values='value',
                             aggfunc='first').reset_index()
 
-        points = recr_df[['$DSP_recruitment','$TJP1_recruitment','$JCAD_recruitment']].values
+        points = recr_df[RECRUITMENT_PARAMS].values
 
         # 3D recruitment coordinates used as interpolation points.
-        rhoA_interp = LinearNDInterpolator(points, recr_df['RhoA'].values)
-        rhoC_interp = LinearNDInterpolator(points, recr_df['RhoC'].values)
+        rho_interp = LinearNDInterpolator(points, recr_df[['RhoA', 'RhoC']].values)
+
+        print(f">>> DEBUG: Successfully built scattered interpolator")
 
-        print(f">>> DEBUG: Successfully built interpolators")
+        return rho_interp
 
-        return rhoA_interp, rhoC_interp
 
+    def query_many(self, recruitment):
+        """
+        Batched query for many recruitment triples at once.
+
+        recruitment: (N, 3) array of (DSP, TJP1, JCAD) recruitment levels,
+            clipped to [0, 1] before lookup.
+        Returns: rhoa (N,), rhoc (N,), outside (N,) boolean mask marking
+            points that fell outside the interpolation domain (their Rho
+            values are NaN).
+        """
+        pts = np.clip(np.asarray(recruitment, dtype=float).reshape(-1, 3), 0.0, 1.0)
+        rho = self.rho_interp(pts)
+        outside = np.isnan(rho).any(axis=1)
+
+        return rho[:, 0], rho[:, 1], outside
 
     def query(self, p_dsp, p_tjp1, p_jcad):
         """
@@ -66,16 +476,10 @@ class RhoLookupTable:
         Query using junction protein recruitment probabilities.
         Returns activation/concentration of RhoA and RhoC. 
         """
-        pt = [[
-            float(np.clip(p_dsp,  0.0, 1.0)),
-            float(np.clip(p_tjp1, 0.0, 1.0)),
-            float(np.clip(p_jcad, 0.0, 1.0)),
-        ]]
-        rhoa = float(self.rhoA_interp(pt))
-        rhoc = float(self.rhoC_interp(pt))
-        
+        rhoa, rhoc, outside = self.query_many([[p_dsp, p_tjp1, p_jcad]])
+
         # Fallback if outside convex hull
-        if np.isnan(rhoa) or np.isnan(rhoc):
+        if outside[0]:
             raise ValueError("RhoLookupTable query fell outside the interpolation domain.")
         
-        return rhoa, rhoc
\ No newline at end of file
+        return float(rhoa[0]), float(rhoc[0])
@@ -66,15 +66,15 @@ class StressFibreCable:
         self.cable_mid = 0.5 * (self.node_up.pos + self.node_down.pos)
 
         # --- Tension ---
-        self.T = bilinear_tension(
+        self.T = float(bilinear_tension(
             l=self.L, l0=self.L0 * self.a, 
             k=self.k, kc_ratio=self.kc_ratio
-        ) 
+        ))
         
     # ------------------------------------------------------------------
     # 2. Polar load contribution (axial-peak parabolic)
     # ------------------------------------------------------------------
-    def accumulate_loads(self, polar_nodes):
+    def accumulate_loads(self, positions, polar, tensile_load):
         """
         Contribute axial SF tension as tensile stimulus at polar nodes.
 
@@ -82,36 +82,41 @@ class StressFibreCable:
         SF exerting no net axial force
 
         Weight peaks at the poles (|p|=1) and is zero at the waist (p=0)
+
+        positions: (N, 2) node positions
+        polar: (N,) boolean polar mask
+        tensile_load: (N,) load accumulator, updated in place
         """
         half_L = self.L / 2
         if half_L < 1e-10:
             return
 
-        for node in polar_nodes: 
-            # Normalised axial coordinate: 0 at waist, ±1 at poles.
-            p_axial = axial_coord(node.pos, self.cable_mid, self.axis_unit) / half_L 
-            weight = p_axial * p_axial # parabolic, peaks at poles
+        # Normalised axial coordinate: 0 at waist, ±1 at poles.
+        p_axial = np.atleast_1d(
+            axial_coord(positions[polar], self.cable_mid, self.axis_unit)
+        ) / half_L
+        weight = p_axial * p_axial # parabolic, peaks at poles
 
-            load = max(weight * self.T, 0.0)
-            node.add_tensile_load(load)
+        tensile_load[polar] += np.maximum(weight * self.T, 0.0)
 
     # ------------------------------------------------------------------
     # 3. Waist squeeze force (inverse parabolic, Poisson-coupled)
     # ------------------------------------------------------------------
-    def apply_forces(self, nodes):
+    def apply_forces(self, positions, force):
         """
         Apply inward lateral squeeze at the cell waist.
 
         Poisson coupling: converts fraction of axial tension into inward force. 
         Distribution: parabolic profile peaking at waist (p=0), zero at poles (|p|=1). 
-        Normalisation: total magnitude is T × nu_sf, independent of node count.
+        Normalisation: total magnitude is T × nu_sf, independent of node count.
         Direction: along ±perp_unit (perpendicular to the fibre axis, toward the axis)
+
+        positions: (N, 2) node positions
+        force: (N, 2) force accumulator, updated in place
         """
         if self.T < 1e-6:
             return
         
-        positions = np.array([n.pos for n in nodes])
-        
         # --- Node coordinates in local frame ---
         # Axial: normalised to [-1, 1]. Lateral: raw signed distance from axis.
         half_L = self.L / 2
@@ -132,16 +137,11 @@ class StressFibreCable:
         # --- Total squeeze force from Poisson coupling ---
         F_total = self.T * self.nu
 
-        # --- Per-node force assembly ---
+        # --- Per-node force assembly: push toward the axis, skip on-axis nodes ---
         perp_unit = perpendicular(self.axis_unit)
+        side = np.where(np.abs(lateral) < 1e-10, 0.0, -np.sign(lateral))
 
-        for node, w, lat in zip(nodes, weights, lateral):
-            if abs(lat) < 1e-10:
-                continue   #
-            direction = -np.sign(lat) * perp_unit
-            node.apply_force(w * F_total * direction)
-
-            perp_unit = perpendicular(self.axis_unit)
+        force += (weights * F_total * side)[:, None] * perp_unit
    
     # ------------------------------------------------------------------
     # 4. Remodelling (called each step after signalling)
@@ -8,16 +8,21 @@
 # Responsibilities:
 #   - Owns the runtime objects for one run (FlowField, CellAgent)
 #   - Advances the model through discrete timesteps
+#   - Optionally stops early once the cell state is stationary
+#   - Optionally solves for the steady state directly (quasi-static mode),
+#     falling back to time stepping if the solve does not converge
 #   - Records measurements into tabular outputs
 #   - Optionally plots the final cell state
 
 import time
-import pandas as pd
 import copy
 
 from src.abm.flow_field import FlowField
 from src.abm.cell import Cell
+from src.abm.quasi_static import QuasiStaticSolver
 from src.abm.analysis.cell_measurement import measure_cell, measure_springs, measure_nodes
+from src.abm.analysis.convergence import ConvergenceMonitor, cell_observables
+from src.abm.analysis.recorder import TimeSeriesRecorder
 from src.utils.config_utils import require
 
 class Simulation:
@@ -25,9 +30,11 @@ class Simulation:
     Execute one simulation run. 
     cfg: dict – fully resolved configuration
     lut: RhoLookupTable
+    writers: optional dict of dataset writers to stream time series to,
+        see TimeSeriesRecorder. Streamed DataFrames are None in the result.
     """
 
-    def __init__(self, cfg, lut, perturbation="WT", plot=False):
+    def __init__(self, cfg, lut, perturbation="WT", plot=False, writers=None):
         self.cfg = cfg
         self.lut = lut
         self.perturbation = perturbation
@@ -38,6 +45,15 @@ class Simulation:
         self.dt = require(sim_cfg, "dt")
         self.n_steps = require(sim_cfg, "n_steps")
         self.detail_interval = require(sim_cfg, "detail_log_interval")
+        self.cell_interval = sim_cfg.get("cell_log_interval", 1)
+
+        # --- Optional steady-state detection ---
+        conv_cfg = sim_cfg.get("convergence") or {}
+        self.monitor = ConvergenceMonitor(conv_cfg) if conv_cfg.get("enabled", False) else None
+
+        # --- Optional quasi-static steady-state solve ---
+        qs_cfg = sim_cfg.get("quasi_static") or {}
+        self.qs_solver = QuasiStaticSolver(qs_cfg) if qs_cfg.get("enabled", False) else None
 
         # --- Runtime objects ---
         self.flow = FlowField(cfg)
@@ -49,30 +65,51 @@ class Simulation:
         )
 
         # --- Output buffers ---
-        self.cell_rows = []
-        self.spring_rows = []
-        self.node_rows = []
+        self.recorder = TimeSeriesRecorder(
+            self.n_steps, self.cell.n_nodes, self.dt, perturbation,
+            cell_interval=self.cell_interval,
+            detail_interval=self.detail_interval,
+            writers=writers,
+        )
 
     # ------------------------------------------------------------------
     # Per-step Recording
     # ------------------------------------------------------------------
-    def _record_step(self, step):
+    def _record_step(self, step, final=False):
         """
-        Build the three measurement records for one logged timestep.
+        Write the measurement records for one timestep into the recorder.
 
-        - cell-level logging: every step
+        - cell-level logging: every cell_interval steps + final step
         - spring/node logging: every detail_interval steps + final step 
+        final: bool – this is the last step (early stop on convergence)
         """
-        t = round(step * self.dt, 2)
-        exp_dict = {"step": step, "time": t, "perturbation": self.perturbation,}
-
-        log_detail = (step % self.detail_interval == 0) or (step == self.n_steps - 1)
+        self.recorder.record(self.cell, step, final=final)
 
-        self.cell_rows.append({**exp_dict, **measure_cell(self.cell)})
+    # ------------------------------------------------------------------
+    # Quasi-static solve
+    # ------------------------------------------------------------------
+    def _solve_quasi_static(self):
+        """
+        Solve for the steady state directly on a copy of the cell.
 
-        if log_detail:
-            self.spring_rows.extend([{**exp_dict, **r} for r in measure_springs(self.cell)])
-            self.node_rows.extend([{**exp_dict, **r} for r in measure_nodes(self.cell)])
+        On success the solved cell replaces self.cell and is recorded as
+        the only time-series row (step 0). Otherwise self.cell is left
+        untouched for time stepping.
+        Returns: solver summary dict (see QuasiStaticSolver.solve).
+        """
+        cell = copy.deepcopy(self.cell, {id(self.lut): self.lut})
+        summary = self.qs_solver.solve(cell, self.flow)
+
+        if summary["converged"]:
+            print(f">>> INFO: {self.perturbation} quasi-static solve converged in "
+                  f"{summary['evaluations']} evaluations (residual {summary['residual']:.2e}).")
+            self.cell = cell
+            self._record_step(0, final=True)
+        else:
+            print(f">>> WARNING: {self.perturbation} quasi-static solve did not converge in "
+                  f"{summary['evaluations']} evaluations (residual {summary['residual']:.2e}); "
+                  f"falling back to time stepping.")
+        return summary
 
     # ------------------------------------------------------------------
     # Execution
@@ -83,26 +120,47 @@ class Simulation:
 
         Execution order:
           1. advance cell one step in the flow field
-          2. record outputs for this timestep
-          3. after the loop, compute final steady-state snapshots
+          2. optionally test for convergence (stop early once stationary)
+          3. record outputs for this timestep
+          4. after the loop, compute final steady-state snapshots
+
+        In quasi-static mode the steady state is solved for first; the time
+        loop only runs if that solve fails. Snapshots of a solved state
+        have step and time 0.
 
         Returns: dict of: perturbation, cell/spring/node DataFrames, 
-        steady-state summaries, final CellAgent object
+        steady-state summaries, final CellAgent object, convergence
+        record (None when convergence detection is off) and quasi-static
+        summary (None when quasi-static mode is off)
         """
         print(f">>> INFO: Running perturbation: {self.perturbation} for {self.n_steps} steps.")
         t_start = time.perf_counter()
 
         # Deep copy of cell for results and plotting
-        cell_initial = copy.deepcopy(self.cell)
+        cell_initial = copy.deepcopy(self.cell, {id(self.lut): self.lut})
+
+        quasi_static = self._solve_quasi_static() if self.qs_solver else None
+        solved = quasi_static is not None and quasi_static["converged"]
 
-        for step in range(self.n_steps):
+        last_step = 0 if solved else self.n_steps - 1
+        for step in range(0 if solved else self.n_steps):
+            prev_positions = self.cell.positions.copy() if self.monitor else None
             self.cell.step(self.flow, dt=self.dt)
-            self._record_step(step)
+
+            converged = self.monitor is not None and self.monitor.update(
+                step, cell_observables(self.cell, prev_positions)
+            )
+            self._record_step(step, final=converged)
+
+            if converged:
+                last_step = step
+                print(f">>> INFO: {self.perturbation} converged at step {step}.")
+                break
 
         # Steady-state snapshots.
         ss_exp_dict = {
-            "step": self.n_steps - 1,
-            "time": round((self.n_steps - 1) * self.dt, 2),
+            "step": last_step,
+            "time": round(last_step * self.dt, 2),
             "perturbation": self.perturbation,
         }
 
@@ -110,6 +168,15 @@ class Simulation:
         spring_ss = [{**ss_exp_dict, **r} for r in measure_springs(self.cell)]
         node_ss = [{**ss_exp_dict, **r} for r in measure_nodes(self.cell)]
 
+        convergence = self.monitor.summary() if self.monitor and not solved else None
+        if convergence is not None:
+            cell_ss["converged"] = convergence["converged"]
+        if quasi_static is not None:
+            cell_ss["qs_converged"] = quasi_static["converged"]
+            cell_ss["qs_residual"] = quasi_static["residual"]
+            cell_ss["qs_evaluations"] = quasi_static["evaluations"]
+
+        cell_df, spring_df, node_df = self.recorder.frames()
         runtime = time.perf_counter() - t_start
         
         print(
@@ -121,12 +188,14 @@ class Simulation:
 
         return {
             "perturbation": self.perturbation,
-            "cell_df": pd.DataFrame(self.cell_rows),
-            "spring_df": pd.DataFrame(self.spring_rows),
-            "node_df": pd.DataFrame(self.node_rows),
+            "cell_df": cell_df,
+            "spring_df": spring_df,
+            "node_df": node_df,
             "cell_ss": cell_ss,
             "spring_ss": spring_ss,
             "node_ss": node_ss,
             "cell_initial": cell_initial,
             "cell_final": self.cell,
+            "convergence": convergence,
+            "quasi_static": quasi_static,
         }
\ No newline at end of file
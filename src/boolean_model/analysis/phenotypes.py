@@ -1,5 +1,6 @@
 # boolean_models/analysis/phenotypes.py
 
+import numpy as np
 import pandas as pd
 
 def compute_delta(df, config):
@@ -20,5 +21,16 @@ def classify_phenotype(delta, config):
         return labels["hyper"]
     else:
         return labels["normal"]
-    
 
+
+def classify_phenotypes(delta, config):
+    """ Vectorised classify_phenotype over a Series of deltas. """
+    eps = config["analysis"]["eps"]
+    labels = config["analysis"]["phenotypes"]
+
+    values = np.select(
+        [delta < -eps, delta > eps],
+        [labels["failed"], labels["hyper"]],
+        default=labels["normal"],
+    )
+    return pd.Series(values, index=delta.index, dtype=object)
@@ -1,20 +1,162 @@
 # src/boolean_model/experiments/lut_runner.py
 #
-# Thin wrapper for running the recruitment sweep used to build the ABM LUT.
+# Recruitment sweep used to build the ABM LUT.
+#
+# The combo grid is split into fixed-size shards that run serially or
+# across a process pool. With a result_dir, each shard is written to
+# <result_dir>/rho_recruitment_shards/ as soon as it finishes, and a
+# re-run of the same sweep skips shards already on disk. The final merge
+# concatenates the shards in grid order into rho_recruitment.csv, and the
+# same grid is written as a dense binary artifact, rho_recruitment.npz
+# (values (nDSP, nTJP1, nJCAD, 2) + axes + provenance), which
+# RhoLookupTable loads without parsing the CSV.
+#
+# Adaptive mode (lut.adaptive.enabled) instead starts from the lut grid
+# and recursively splits grid cells into 8 octants wherever trilinear
+# interpolation misses extra midpoint runs by more than the tolerance.
+# The output keeps the long rho_recruitment.csv format plus a `level`
+# column (refinement depth at which each point was added); RhoLookupTable
+# rebuilds the octree from it.
 
+import hashlib
+import itertools
+import json
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
 import pandas as pd
 
-from src.boolean_model.experiments.parameter_sweep import build_ranges
-from src.utils.file_utils import save_df_to_csv
+from src.boolean_model.experiments.parameter_sweep import (
+    build_ranges, run_combos, attach_combo_columns
+)
+from src.boolean_model.runtime.adaptive_sampling import build_sampling_cfg
+from src.boolean_model.runtime.run_cache import model_fingerprint
+from src.utils.config_utils import require
+from src.utils.file_utils import file_sha256, save_df_to_csv, save_lut_artifact
 from src.utils.sweep_utils import build_cartesian_product
 
+SHARD_DIR = "rho_recruitment_shards"
+MANIFEST = "manifest.json"
+LUT_OUTPUTS = ("RhoA", "RhoC")
+
+
+# ------------------------------------------------------------------
+# Shards
+# ------------------------------------------------------------------
+def _shard_path(shard_dir, i):
+    return Path(shard_dir) / f"shard_{i:05d}.csv"
+
+def _run_shard(model, combos, sampling=None, limits=None):
+    """
+    Solve one shard of combos; returns its LUT rows.
+    limits: optional (max_runs, n_cores) bound on concurrent MaBoSS runs
+    """
+    max_runs, n_cores = limits or (None, None)
+    df = run_combos(model, combos, max_runs=max_runs, sampling=sampling, n_cores=n_cores)
+    return attach_combo_columns(df.reset_index(drop=True), combos, n_params=3)
+
+def _write_shard(df, path):
+    """Write a shard atomically, so a crash never leaves a partial file."""
+    tmp = path.with_suffix(".tmp")
+    df.to_csv(tmp, index=False)
+    os.replace(tmp, path)
+
+def _sweep_key(base_model, combos, shard_size, sampling=None):
+    """
+    Fingerprint of everything that determines the shard contents: the
+    combo grid, shard size, the model content (network logic, parameters
+    and settings, see run_cache.model_fingerprint) and the adaptive
+    sampling settings.
+    """
+    spec = {
+        "model": model_fingerprint(base_model),
+        "combos": [{k: float(v) for k, v in c.items()} for c in combos],
+        "shard_size": shard_size,
+        "sampling": sampling,
+    }
+    blob = json.dumps(spec, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()
 
-def run_lut_sweep(base_model, sweep_cfg, sim_cfg, result_dir=None):
+def _prepare_shard_dir(shard_dir, key, n_shards):
+    """
+    Make shard_dir ready for this sweep. Shards left by a different sweep
+    (other grid, model logic or parameters, or shard size) are discarded.
+    Returns: set of shard indices already complete.
+    """
+    shard_dir = Path(shard_dir)
+    manifest_path = shard_dir / MANIFEST
+
+    if manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text())
+        if manifest.get("key") != key:
+            print(f">>> WARNING: {shard_dir.name} holds shards of a different sweep; discarding them")
+            shutil.rmtree(shard_dir)
+
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path.write_text(json.dumps({"key": key, "n_shards": n_shards}))
+
+    return {i for i in range(n_shards) if _shard_path(shard_dir, i).exists()}
+
+def _run_limits(max_runs, n_workers, n_cores=None):
+    """
+    Per-process (max_runs, n_cores) for MaBoSS runs inside each of
+    n_workers sweep processes, so that the whole pool stays within the
+    machine's cores and simulation.max_concurrent_runs.
+    """
+    n_cores = n_cores or os.cpu_count() or 1
+    if n_workers <= 1:
+        return max_runs, n_cores
+    return max(1, (max_runs or n_cores) // n_workers), max(1, n_cores // n_workers)
+
+# ------------------------------------------------------------------
+# Process-pool workers
+# ------------------------------------------------------------------
+# One model per worker process, shipped once by the pool initializer.
+_WORKER_MODEL = None
+_WORKER_SAMPLING = None
+_WORKER_LIMITS = None
+
+def _init_worker(model, sampling, limits=None):
+    """Pool initializer: keep this worker's copy of the base model."""
+    global _WORKER_MODEL, _WORKER_SAMPLING, _WORKER_LIMITS
+    _WORKER_MODEL = model
+    _WORKER_SAMPLING = sampling
+    _WORKER_LIMITS = limits
+
+def _run_shard_task(combos, path):
+    """Run one shard in a worker; persist it when path is given."""
+    df = _run_shard(_WORKER_MODEL, combos, _WORKER_SAMPLING, _WORKER_LIMITS)
+    if path is not None:
+        _write_shard(df, path)
+    return df
+
+# ------------------------------------------------------------------
+# LUT sweep
+# ------------------------------------------------------------------
+def run_lut_sweep(base_model, sweep_cfg, sim_cfg, result_dir=None, n_workers=None, shard_size=None):
     """
     Run fixed 3D recruitment sweep for LUT generation.
     Always uses WT.
+
+    result_dir: optional output directory. Shards are persisted under
+        result_dir/rho_recruitment_shards/ and merged into rho_recruitment.csv.
+    n_workers: int – process count (default: lut.n_workers, else 1).
+    shard_size: int – combos per shard (default: lut.shard_size, else 256).
+    Concurrent MaBoSS runs are capped by simulation.max_concurrent_runs,
+    split across the worker processes.
     """
     lut_cfg = sweep_cfg["lut"]
+    if (lut_cfg.get("adaptive") or {}).get("enabled", False):
+        return run_adaptive_lut_sweep(base_model, sweep_cfg, sim_cfg, result_dir)
+
+    n_workers = n_workers or lut_cfg.get("n_workers") or 1
+    shard_size = shard_size or lut_cfg.get("shard_size") or 256
+    sampling = build_sampling_cfg(sim_cfg)
+    limits = _run_limits(sim_cfg["simulation"].get("max_concurrent_runs"), n_workers)
 
     # --- Build parameter ranges ---
     param_values = build_ranges(
@@ -30,35 +172,209 @@ def run_lut_sweep(base_model, sweep_cfg, sim_cfg, result_dir=None):
 
     combos = build_cartesian_product(param_values)
     total = len(combos)
-    print(f">>> INFO: Running LUT sweep ({len(combos)} combinations)")
-
-    results = []
+    shards = [combos[i:i + shard_size] for i in range(0, total, shard_size)]
+    n_shards = len(shards)
+    print(f">>> INFO: Running LUT sweep ({total} combinations, {n_shards} shards)")
 
-    for i, combo in enumerate(combos, start=1):
-        # Progress tracker
-        if i == 1 or i % 50 == 0 or i == total:
-            print(f"    [{i}/{total}] running...")
-
-        m_temp = base_model.copy()
-        m_temp.update_parameters(**combo)
-
-        res = m_temp.run()
-        ss_df = res.get_last_nodes_probtraj()
+    # --- Resume from persisted shards ---
+    shard_dir = None
+    complete = set()
+    if result_dir is not None:
+        shard_dir = Path(result_dir) / SHARD_DIR
+        key = _sweep_key(base_model, combos, shard_size, sampling)
+        complete = _prepare_shard_dir(shard_dir, key, n_shards)
+        if complete:
+            print(f">>> INFO: Resuming LUT sweep; {len(complete)}/{n_shards} shards already complete")
 
-        keys = list(combo.keys())
-        vals = list(combo.values())
+    results = [None] * n_shards
+    pending = [i for i in range(n_shards) if i not in complete]
 
-        ss_df["p1_name"], ss_df["p1_value"] = keys[0], vals[0]
-        ss_df["p2_name"], ss_df["p2_value"] = keys[1], vals[1]
-        ss_df["p3_name"], ss_df["p3_value"] = keys[2], vals[2]
+    def path_of(i):
+        return _shard_path(shard_dir, i) if shard_dir is not None else None
 
-        results.append(ss_df)
+    # --- Run remaining shards ---
+    if n_workers > 1 and len(pending) > 1:
+        print(f">>> INFO: {len(pending)} shards across {n_workers} workers")
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            initializer=_init_worker,
+            initargs=(base_model, sampling, limits),
+        ) as pool:
+            futures = {pool.submit(_run_shard_task, shards[i], path_of(i)): i for i in pending}
+            for done, future in enumerate(as_completed(futures), 1):
+                results[futures[future]] = future.result()
+                if done == 1 or done % 50 == 0 or done == len(pending):
+                    print(f"    [{done}/{len(pending)}] shards finished")
+    else:
+        for done, i in enumerate(pending, 1):
+            results[i] = _run_shard(base_model, shards[i], sampling, limits)
+            if shard_dir is not None:
+                _write_shard(results[i], path_of(i))
+            if done == 1 or done % 50 == 0 or done == len(pending):
+                print(f"    [{done}/{len(pending)}] shards finished")
 
+    # --- Merge (grid order) ---
+    # Round-trip parsing, so a resumed merge matches an uninterrupted run exactly.
+    for i in complete:
+        results[i] = pd.read_csv(path_of(i), float_precision="round_trip")
     lut_df = pd.concat(results, ignore_index=True)
 
     print(f">>> INFO: LUT sweep complete ({total} combinations)")
 
     # --- Save ---
+    if result_dir is not None:
+        csv_path = save_df_to_csv(lut_df, result_dir, "rho_recruitment", ts=False)
+        axes, values = lut_grid(lut_df)
+        settings = getattr(base_model, "param", {})
+        save_lut_artifact(csv_path.with_suffix(".npz"), axes, values, {
+            "parameters": list(lut_cfg["parameters"]),
+            "outputs": list(LUT_OUTPUTS),
+            "engine": type(base_model).__name__,
+            "model_params": getattr(base_model, "params", None),
+            "settings": {k: settings.get(k) for k in ("max_time", "sample_count")},
+            "sampling": sampling,
+            "n_points": len(lut_df),
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "csv_sha256": file_sha256(csv_path),
+        })
+
+    return lut_df
+
+
+def lut_grid(lut_df):
+    """
+    Dense grid form of a complete 3D LUT sweep table.
+    Returns: (axes, values) – three sorted p1/p2/p3 coordinate arrays and a
+    (n1, n2, n3, len(LUT_OUTPUTS)) array.
+    """
+    coords = np.round(lut_df[["p1_value", "p2_value", "p3_value"]].to_numpy(dtype=float), 10)
+    axes = [np.unique(coords[:, d]) for d in range(3)]
+    idx = tuple(np.searchsorted(axes[d], coords[:, d]) for d in range(3))
+
+    values = np.full(tuple(len(ax) for ax in axes) + (len(LUT_OUTPUTS),), np.nan)
+    values[idx] = lut_df[list(LUT_OUTPUTS)].to_numpy(dtype=float)
+    return axes, values
+
+
+# ------------------------------------------------------------------
+# Adaptive LUT sweep
+# ------------------------------------------------------------------
+# Points live on an integer lattice at the finest spacing (lut grid step /
+# 2^max_level); a cell is (lower corner, edge length) in lattice units.
+# Offsets within a cell are given in half-edge units (0, 1, 2).
+_CORNERS = list(itertools.product((0, 2), repeat=3))
+_SUBGRID = list(itertools.product((0, 1, 2), repeat=3))
+
+def _cell_points(corner, size, offsets):
+    return [tuple(c + o * size // 2 for c, o in zip(corner, off)) for off in offsets]
+
+# Midpoint tests: cell centre (vs. mean of the 8 corners) and the 6 face
+# centres (vs. mean of their 4 face corners). All are vertices of the
+# children if the cell is split, so no run is wasted on refined cells.
+_TESTS = [((1, 1, 1), _CORNERS)] + [
+    (tuple(side if a == d else 1 for a in range(3)),
+     [c for c in _CORNERS if c[d] == side])
+    for d in range(3) for side in (0, 2)
+]
+
+
+def run_adaptive_lut_sweep(base_model, sweep_cfg, sim_cfg, result_dir=None):
+    """
+    Adaptively refined recruitment sweep for LUT generation. Always uses WT.
+
+    lut.adaptive settings:
+        tolerance: max |RhoA|, |RhoC| trilinear error at midpoint tests
+        max_level: maximum number of cell halvings
+    Returns: long-format LUT table with a `level` column, one row per
+    octree vertex; saved as rho_recruitment.csv when result_dir is given.
+    """
+    lut_cfg = sweep_cfg["lut"]
+    adaptive = require(lut_cfg, "adaptive")
+    tol = float(require(adaptive, "tolerance"))
+    max_level = int(require(adaptive, "max_level"))
+    sampling = build_sampling_cfg(sim_cfg)
+    max_runs = sim_cfg["simulation"].get("max_concurrent_runs")
+
+    params = list(lut_cfg["parameters"])
+    ranges = build_ranges(sweep_cfg, resolution=lut_cfg.get("resolution", "fine"))
+    axes = [np.asarray(ranges[p], dtype=float) for p in params]
+    lo = np.array([ax[0] for ax in axes])
+    scale = 2 ** max_level
+    unit = np.array([(ax[-1] - ax[0]) / (len(ax) - 1) for ax in axes]) / scale
+
+    rows = {}       # lattice point -> node probabilities
+    level_of = {}   # lattice point -> level at which it was run
+    columns = None
+
+    def evaluate(points, level):
+        nonlocal columns
+        new = [p for p in dict.fromkeys(points) if p not in rows]
+        if not new:
+            return
+        combos = [
+            {name: round(float(lo[d] + p[d] * unit[d]), 10) for d, name in enumerate(params)}
+            for p in new
+        ]
+        df = run_combos(base_model, combos, max_runs=max_runs, sampling=sampling)
+        columns = list(df.columns)
+        for p, values in zip(new, df.to_numpy(dtype=float)):
+            rows[p] = values
+            level_of[p] = level
+
+    def rho(p):
+        return rows[p][[columns.index("RhoA"), columns.index("RhoC")]]
+
+    def cell_error(corner, size):
+        """Max trilinear miss over the cell's midpoint tests."""
+        err = 0.0
+        for test, face in _TESTS:
+            point = _cell_points(corner, size, [test])[0]
+            predicted = np.mean([rho(q) for q in _cell_points(corner, size, face)], axis=0)
+            err = max(err, np.abs(rho(point) - predicted).max())
+        return err
+
+    # --- Level 0: the lut grid ---
+    evaluate([tuple(scale * i for i in idx)
+              for idx in itertools.product(*(range(len(ax)) for ax in axes))], 0)
+    active = [(tuple(scale * i for i in idx), scale)
+              for idx in itertools.product(*(range(len(ax) - 1) for ax in axes))]
+    leaves = []
+    print(f">>> INFO: Adaptive LUT sweep: {len(rows)} base points, {len(active)} cells")
+
+    # --- Refine cells whose midpoints miss their trilinear estimate ---
+    for level in range(1, max_level + 1):
+        evaluate([p for corner, size in active
+                  for p in _cell_points(corner, size, [t for t, _ in _TESTS])], level)
+
+        refine = []
+        for corner, size in active:
+            (refine if cell_error(corner, size) > tol else leaves).append((corner, size))
+
+        evaluate([p for corner, size in refine
+                  for p in _cell_points(corner, size, _SUBGRID)], level)
+        active = [
+            (child, size // 2)
+            for corner, size in refine
+            for child in _cell_points(corner, size, [tuple(o // 2 for o in c) for c in _CORNERS])
+        ]
+        print(f"    [level {level}] {len(refine)} cells refined, {len(rows)} runs so far")
+        if not active:
+            break
+
+    leaves.extend(active)
+
+    # --- Table of octree vertices ---
+    vertices = sorted({p for corner, size in leaves for p in _cell_points(corner, size, _CORNERS)})
+    lut_df = pd.DataFrame([rows[p] for p in vertices], columns=columns)
+    combos = [{name: round(float(lo[d] + p[d] * unit[d]), 10) for d, name in enumerate(params)}
+              for p in vertices]
+    attach_combo_columns(lut_df, combos, n_params=3)
+    lut_df["level"] = [level_of[p] for p in vertices]
+
+    n_uniform = int(np.prod([(len(ax) - 1) * scale + 1 for ax in axes]))
+    print(f">>> INFO: Adaptive LUT sweep complete ({len(lut_df)} table points from "
+          f"{len(rows)} runs; uniform grid at finest spacing: {n_uniform})")
+
     if result_dir is not None:
         save_df_to_csv(lut_df, result_dir, "rho_recruitment", ts=False)
 
@@ -1,44 +1,65 @@
 # src/boolean_model/experiments/maboss_simulation.py
 import pandas as pd
 
-from src.boolean_model.analysis.phenotypes import compute_delta, classify_phenotype
+from src.boolean_model.analysis.phenotypes import compute_delta, classify_phenotypes
+from src.boolean_model.runtime.ctmc import BooleanCTMC, nodes_probtraj_batch
 from src.boolean_model.runtime.model_loader import generate_ko_model
+from src.boolean_model.runtime.run_cache import build_run_cache
 from src.utils.file_utils import save_df_to_csv
 
 
-def run_maboss_sim(base_model, cfg, result_dir=None):
+def run_maboss_sim(base_model, cfg, result_dir=None, times=None):
     """
     Run MaBoSS simulations for all configured perturbations.
 
-    param base_model: MaBoSS model to copy and mutate per perturbation.
+    With the CTMC engine the trajectories are exact transient probabilities
+    for all perturbations at once (mutations clamp node rates), on the
+    model's max_time / time_tick grid.
+
+    param base_model: MaBoSS model (or BooleanCTMC) to copy and mutate per perturbation.
     param cfg: dict — simulation config containing perturbation and analysis settings.
     param result_dir: Path — optional output directory for CSV exports.
+    param times: array — CTMC engine only: output times (any resolution).
 
     return full_perb_df: DataFrame — Full timeseries for each perturbation.
     return ss_df: DataFrame — Final steady-state probabilities only.
     """
     perbs_dict = cfg["perturbations"]
 
-    perbs = []
-
-    for name, mutation in perbs_dict.items():
-        print(f">>> INFO: Running perturbation: {name}")
+    models = {
+        name: generate_ko_model(base_model, mutation)
+        for name, mutation in perbs_dict.items()
+    }
+
+    if isinstance(base_model, BooleanCTMC):
+        print(f">>> INFO: Solving {len(models)} perturbations exactly (CTMC)")
+        probtrajs = nodes_probtraj_batch(list(models.values()), times)
+    else:
+        cache = build_run_cache(cfg)
+        probtrajs = []
+        for name, m in models.items():
+            key = cache.key(m, "probtraj") if cache is not None else None
+            probtraj = cache.get(key) if cache is not None else None
+            if probtraj is None:
+                print(f">>> INFO: Running perturbation: {name}")
+                probtraj = m.run().get_nodes_probtraj()
+                if cache is not None:
+                    cache.put(key, probtraj)
+            probtrajs.append(probtraj)
+
+        if cache is not None:
+            cache.report()
 
-        m = generate_ko_model(base_model, mutation)
+    perbs = []
 
-        res = m.run()
-        prob_df = res.get_nodes_probtraj().rename_axis("t").reset_index()
+    for name, probtraj in zip(models, probtrajs):
+        prob_df = probtraj.rename_axis("t").reset_index()
         prob_df["perturbation"] = name
 
-        balance_df = prob_df.copy()
-        balance_df["delta"] = compute_delta(balance_df, cfg)
-
-        phenotype_df = balance_df.copy()
-        phenotype_df["phenotype"] = balance_df["delta"].apply(
-            lambda x: classify_phenotype(x, cfg)
-        )
+        prob_df["delta"] = compute_delta(prob_df, cfg)
+        prob_df["phenotype"] = classify_phenotypes(prob_df["delta"], cfg)
 
-        perbs.append(phenotype_df)
+        perbs.append(prob_df)
 
     print(">>> INFO: All MaBoSS perturbation simulations completed successfully")
 
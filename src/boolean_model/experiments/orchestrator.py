@@ -0,0 +1,101 @@
+# src/boolean_model/experiments/orchestrator.py
+#
+# Concurrent execution of independent Boolean model runs.
+#
+# Each MaBoSS model.run() launches an external MaBoSS process and blocks
+# until it exits, so sweeps spend most of their time on process launch and
+# wait. The orchestrator keeps a bounded number of runs in flight on a
+# thread pool (a thread waiting on its subprocess does not hold the GIL)
+# and splits the machine's cores between run-level concurrency and
+# MaBoSS's own thread_count. Results come back in job order.
+#
+# With a RunCache, jobs whose resolved model is already cached are served
+# from disk and only the misses are launched. With adaptive sampling, each
+# job grows its sample_count until its target nodes converge.
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from src.boolean_model.runtime.adaptive_sampling import run_adaptive
+
+
+def plan_concurrency(n_jobs, n_cores=None, max_runs=None):
+    """
+    Split cores between concurrent runs and per-run MaBoSS threads.
+
+    n_jobs: int – number of runs to schedule
+    n_cores: int – cores available (default: os.cpu_count())
+    max_runs: int – optional cap on runs in flight
+    Returns: (n_runs, thread_count), with n_runs * thread_count <= n_cores.
+    """
+    n_cores = n_cores or os.cpu_count() or 1
+    n_runs = max(1, min(n_jobs, n_cores, max_runs or n_cores))
+    return n_runs, max(1, n_cores // n_runs)
+
+
+def _run_job(model, thread_count, sampling=None):
+    """Run one prepared model; returns its final node probabilities."""
+    model.param["thread_count"] = thread_count
+
+    if sampling is not None:
+        return run_adaptive(model, sampling)
+
+    res = model.run()
+    return res.get_last_nodes_probtraj()
+
+
+def run_jobs(jobs, n_cores=None, max_runs=None, cache=None, sampling=None):
+    """
+    Run independent (model, combo) jobs with bounded concurrency.
+
+    jobs: list of (model, combo) pairs; combo is a parameter dict
+    n_cores, max_runs: see plan_concurrency
+    cache: optional RunCache; cached jobs are not re-run
+    sampling: optional adaptive sampling settings (build_sampling_cfg);
+        rows then carry <node>_err and sample_count columns
+    Returns: list of one-row DataFrames, in job order. The first failing
+    job cancels the jobs not yet started and its error is raised.
+    """
+    if not jobs:
+        return []
+
+    results = [None] * len(jobs)
+    pending = {}
+    kind = "ss" if sampling is None else "ss|adaptive|" + json.dumps(sampling, sort_keys=True)
+
+    for i, (model, combo) in enumerate(jobs):
+        m_temp = model.copy()
+        m_temp.update_parameters(**combo)
+        key = cache.key(m_temp, kind) if cache is not None else None
+        results[i] = cache.get(key) if cache is not None else None
+        if results[i] is None:
+            pending[i] = (m_temp, key)
+
+    if not pending:
+        return results
+
+    total = len(pending)
+    n_runs, thread_count = plan_concurrency(total, n_cores, max_runs)
+    if n_runs > 1:
+        print(f">>> INFO: {total} runs, {n_runs} in flight x {thread_count} MaBoSS threads")
+
+    with ThreadPoolExecutor(max_workers=n_runs) as pool:
+        futures = {
+            pool.submit(_run_job, m_temp, thread_count, sampling): i
+            for i, (m_temp, _) in pending.items()
+        }
+        try:
+            for done, future in enumerate(as_completed(futures), 1):
+                i = futures[future]
+                results[i] = future.result()
+                if cache is not None:
+                    cache.put(pending[i][1], results[i])
+                if total > 1 and (done == 1 or done % 50 == 0 or done == total):
+                    print(f"    [{done}/{total}] runs finished")
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+    return results
@@ -4,7 +4,11 @@ import numpy as np
 import pandas as pd
 
 from src.boolean_model.runtime.model_loader import generate_ko_model
-from src.boolean_model.analysis.phenotypes import compute_delta, classify_phenotype
+from src.boolean_model.runtime.adaptive_sampling import build_sampling_cfg
+from src.boolean_model.runtime.run_cache import build_run_cache
+from src.boolean_model.analysis.phenotypes import compute_delta, classify_phenotypes
+from src.boolean_model.analysis.sensitivity import continuation_1d, evaluate_curve
+from src.boolean_model.experiments.orchestrator import run_jobs
 from src.utils.file_utils import save_df_to_csv
 from src.utils.sweep_utils import build_cartesian_product, get_selected_specs, get_filename
 
@@ -58,39 +62,112 @@ def build_param_values_for_spec(spec, sweep_cfg):
 # ------------------------------------------------------------------
 # Internal runners
 # ------------------------------------------------------------------
-def _run_single_combo(model, combo):
+def run_combos(model, combos, max_runs=None, cache=None, sampling=None, n_cores=None):
     """
-    Run one Boolean model combo and return final steady-state probabilities.
+    Run every combo and return steady-state probabilities, one row per combo.
+
+    Models with a batched solver (the CTMC engine) solve the whole grid in
+    one call; MaBoSS models run one copy per combo, up to max_runs at once,
+    skipping combos found in the optional RunCache and growing sample_count
+    per combo under adaptive sampling (see orchestrator.run_jobs).
+    n_cores: cores this call may use (default: all)
     """
-    m_temp = model.copy()
-    m_temp.update_parameters(**combo)
+    if hasattr(model, "solve_batch"):
+        return model.solve_batch(combos)
+    rows = run_jobs([(model, c) for c in combos], n_cores=n_cores, max_runs=max_runs, cache=cache,
+                    sampling=sampling)
+    return pd.concat(rows, ignore_index=True)
+
+
+def run_perturbation_grid(base_model, perturbations, perb_config, combos, max_runs=None, cache=None,
+                          sampling=None):
+    """
+    Run the same combo grid under every perturbation.
+
+    MaBoSS runs for all perturbations are scheduled together, so up to
+    max_runs processes are in flight across the whole spec.
+    Returns: list of DataFrames (one row per combo), in perturbation order.
+    """
+    models = [generate_ko_model(base_model, perb_config[p]) for p in perturbations]
+
+    if hasattr(base_model, "solve_batch"):
+        return [m.solve_batch(combos) for m in models]
+
+    jobs = [(m, c) for m in models for c in combos]
+    rows = run_jobs(jobs, max_runs=max_runs, cache=cache, sampling=sampling)
+    n = len(combos)
+    return [pd.concat(rows[k * n:(k + 1) * n], ignore_index=True) for k in range(len(models))]
+
 
-    res = m_temp.run()
-    return res.get_last_nodes_probtraj()
+def attach_combo_columns(df, combos, n_params, n_named=None):
+    """
+    Add p<i>_name / p<i>_value columns (i = 1..n_params) describing each
+    row's combo from its first n_named parameters (default: all of them).
+    Remaining columns are filled with NaN.
+    """
+    names = list(combos[0])[:n_named] if combos else []
+    for i in range(n_params):
+        if i < len(names):
+            df[f"p{i + 1}_name"] = names[i]
+            df[f"p{i + 1}_value"] = [c[names[i]] for c in combos]
+        else:
+            df[f"p{i + 1}_name"] = np.nan
+            df[f"p{i + 1}_value"] = np.nan
+    return df
 
 
-def run_1d_sweep_single(base_model, spec, perb_config, sweep_cfg):
+def run_1d_sweep_single(base_model, spec, perb_config, sweep_cfg, max_runs=None, cache=None,
+                        sampling=None):
     """
     Run one 1D Boolean sweep.
+    max_runs: optional cap on concurrent MaBoSS runs
+    cache: optional RunCache for MaBoSS runs
+    sampling: optional adaptive sampling settings for MaBoSS runs
     """
     results = []
     param_values = build_param_values_for_spec(spec, sweep_cfg)
     combos = build_cartesian_product(param_values)
 
+    print(f">>> INFO: Starting {spec['name']} for perturbations: {', '.join(spec['perturbations'])}")
+    frames = run_perturbation_grid(
+        base_model, spec["perturbations"], perb_config, combos, max_runs, cache, sampling
+    )
+
+    for perb, ss_df in zip(spec["perturbations"], frames):
+        attach_combo_columns(ss_df, combos, n_params=2, n_named=1)
+        ss_df["perturbation"] = perb
+        ss_df["exp_name"] = spec["name"]
+        ss_df["type"] = spec["type"]
+
+        results.append(ss_df)
+
+    return pd.concat(results, ignore_index=True)
+
+
+def run_1d_continuation_single(base_model, spec, perb_config, sweep_cfg, tol=1e-2):
+    """
+    1D Boolean sweep by derivative-based continuation (CTMC engine only).
+
+    Each parameter is varied on its own with all others at base values.
+    The steady-state curve is traced by continuation_1d and read off at the
+    spec's grid values, giving the same long format as run_1d_sweep_single
+    (one row per parameter value).
+    """
+    if not hasattr(base_model, "generator_derivatives"):
+        raise ValueError("Continuation sweeps need the CTMC engine (simulation.engine: ctmc).")
+
+    results = []
+    param_values = build_param_values_for_spec(spec, sweep_cfg)
+
     for perb in spec["perturbations"]:
-        print(f">>> INFO: Starting {spec['name']} for perturbation: {perb}")
+        print(f">>> INFO: Starting {spec['name']} (continuation) for perturbation: {perb}")
         perb_model = generate_ko_model(base_model, perb_config[perb])
 
-        for combo in combos:
-            ss_df = _run_single_combo(perb_model, combo)
+        for param, values in param_values.items():
+            knots = continuation_1d(perb_model, param, values.min(), values.max(), tol=tol)
+            ss_df = evaluate_curve(knots, perb_model.node_names, values)
 
-            p1 = list(combo.keys())[0]
-            v1 = list(combo.values())[0]
-
-            ss_df["p1_name"] = p1
-            ss_df["p1_value"] = v1
-            ss_df["p2_name"] = np.nan
-            ss_df["p2_value"] = np.nan
+            attach_combo_columns(ss_df, [{param: v} for v in values], n_params=2)
             ss_df["perturbation"] = perb
             ss_df["exp_name"] = spec["name"]
             ss_df["type"] = spec["type"]
@@ -100,33 +177,30 @@ def run_1d_sweep_single(base_model, spec, perb_config, sweep_cfg):
     return pd.concat(results, ignore_index=True)
 
 
-def run_2d_sweep_single(base_model, spec, perb_config, sweep_cfg):
+def run_2d_sweep_single(base_model, spec, perb_config, sweep_cfg, max_runs=None, cache=None,
+                        sampling=None):
     """
     Run one 2D Boolean sweep.
+    max_runs: optional cap on concurrent MaBoSS runs
+    cache: optional RunCache for MaBoSS runs
+    sampling: optional adaptive sampling settings for MaBoSS runs
     """
     results = []
     param_values = build_param_values_for_spec(spec, sweep_cfg)
     combos = build_cartesian_product(param_values)
 
-    for perb in spec["perturbations"]:
-        print(f">>> INFO: Starting {spec['name']} for perturbation: {perb}")
-        perb_model = generate_ko_model(base_model, perb_config[perb])
-
-        for combo in combos:
-            ss_df = _run_single_combo(perb_model, combo)
+    print(f">>> INFO: Starting {spec['name']} for perturbations: {', '.join(spec['perturbations'])}")
+    frames = run_perturbation_grid(
+        base_model, spec["perturbations"], perb_config, combos, max_runs, cache, sampling
+    )
 
-            keys = list(combo.keys())
-            vals = list(combo.values())
+    for perb, ss_df in zip(spec["perturbations"], frames):
+        attach_combo_columns(ss_df, combos, n_params=2)
+        ss_df["perturbation"] = perb
+        ss_df["exp_name"] = spec["name"]
+        ss_df["type"] = spec["type"]
 
-            ss_df["p1_name"] = keys[0]
-            ss_df["p1_value"] = vals[0]
-            ss_df["p2_name"] = keys[1]
-            ss_df["p2_value"] = vals[1]
-            ss_df["perturbation"] = perb
-            ss_df["exp_name"] = spec["name"]
-            ss_df["type"] = spec["type"]
-
-            results.append(ss_df)
+        results.append(ss_df)
 
     return pd.concat(results, ignore_index=True)
 
@@ -134,11 +208,18 @@ def run_2d_sweep_single(base_model, spec, perb_config, sweep_cfg):
 # ------------------------------------------------------------------
 # Public runner
 # ------------------------------------------------------------------
-def run_sweeps(base_model, sweep_cfg, sim_cfg, target_sweeps=None, target_type=None, result_dir=None):
+def run_sweeps(base_model, sweep_cfg, sim_cfg, target_sweeps=None, target_type=None, result_dir=None,
+               method="simulate"):
     """
     Run selected 1D / 2D Boolean sweeps.
+
+    method: "simulate" (every grid point) | "continuation" (1D sweeps traced
+        from steady-state derivatives; needs the CTMC engine)
     """
     perb_config = sim_cfg["perturbations"]
+    max_runs = sim_cfg["simulation"].get("max_concurrent_runs")
+    cache = build_run_cache(sim_cfg)
+    sampling = build_sampling_cfg(sim_cfg)
     all_specs = sweep_cfg["sweeps"]
     selected = get_selected_specs(all_specs, target_names=target_sweeps, target_type=target_type)
 
@@ -156,21 +237,30 @@ def run_sweeps(base_model, sweep_cfg, sim_cfg, target_sweeps=None, target_type=N
             spec["perturbations"] = list(perb_config.keys())
 
         try:
-            if spec["type"] == "1D":
-                df = run_1d_sweep_single(base_model, spec, perb_config, sweep_cfg)
+            if spec["type"] == "1D" and method == "continuation":
+                df = run_1d_continuation_single(base_model, spec, perb_config, sweep_cfg)
+            elif spec["type"] == "1D":
+                df = run_1d_sweep_single(
+                    base_model, spec, perb_config, sweep_cfg, max_runs, cache, sampling
+                )
             elif spec["type"] == "2D":
-                df = run_2d_sweep_single(base_model, spec, perb_config, sweep_cfg)
+                df = run_2d_sweep_single(
+                    base_model, spec, perb_config, sweep_cfg, max_runs, cache, sampling
+                )
             else:
                 print(f">>> ERROR: Unsupported sweep type '{spec['type']}.")
                 continue
 
             df["delta"] = compute_delta(df, sim_cfg)
-            df["phenotype"] = df["delta"].apply(lambda x: classify_phenotype(x, sim_cfg))
+            df["phenotype"] = classify_phenotypes(df["delta"], sim_cfg)
             sweep_results.append(df)
 
         except Exception as e:
             print(f">>> ERROR: Failed sweep {spec['name']}: {e}")
 
+    if cache is not None:
+        cache.report()
+
     if not sweep_results:
         print(">>> ERROR: No sweeps completed successfully.")
         return pd.DataFrame()
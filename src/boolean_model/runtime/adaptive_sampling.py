@@ -0,0 +1,98 @@
+# boolean_model/runtime/adaptive_sampling.py
+#
+# Convergence-adaptive sample_count for stochastic (MaBoSS) runs.
+#
+# A run starts with min_samples trajectories. While the confidence
+# interval on any target node probability is wider than the tolerance, a
+# new batch of trajectories (with a fresh seed) is run, doubling the total,
+# and the estimates are pooled. The final row records the achieved CI
+# half-width per target node (<node>_err) and the total sample_count.
+#
+# CI half-width for a node probability p from N trajectories:
+#   err = z * sqrt(p (1 - p) / N)
+
+import numpy as np
+
+from src.utils.config_utils import require
+
+
+def build_sampling_cfg(sim_cfg):
+    """
+    Adaptive sampling settings from simulation.adaptive_sampling, or None
+    when disabled. Target nodes default to analysis.nodes.
+    """
+    sampling = sim_cfg["simulation"].get("adaptive_sampling") or {}
+    if not sampling.get("enabled", False):
+        return None
+
+    nodes = sampling.get("nodes") or list(require(sim_cfg, "analysis", "nodes").values())
+    cfg = {
+        "nodes": list(nodes),
+        "tolerance": float(require(sampling, "tolerance")),
+        "min_samples": int(require(sampling, "min_samples")),
+        "max_samples": int(require(sampling, "max_samples")),
+        "z": float(sampling.get("z", 1.96)),
+    }
+    if not 0 < cfg["min_samples"] <= cfg["max_samples"]:
+        raise ValueError("adaptive_sampling needs 0 < min_samples <= max_samples.")
+    return cfg
+
+
+def ci_halfwidth(p, n_samples, z=1.96):
+    """Normal-approximation CI half-width of probabilities p from n_samples."""
+    p = np.asarray(p, dtype=float)
+    return z * np.sqrt(p * (1.0 - p) / n_samples)
+
+
+def run_adaptive(model, sampling):
+    """
+    Run model until every target node's CI half-width is within tolerance
+    (or max_samples is reached).
+
+    model: maboss-like model (param dict, run()); its sample_count and
+        seed_pseudorandom are overwritten per batch
+    sampling: dict from build_sampling_cfg
+    Returns: one-row DataFrame of pooled final node probabilities with
+        <node>_err columns and the total sample_count.
+    """
+    nodes = sampling["nodes"]
+    seed = int(model.param.get("seed_pseudorandom", 0))
+
+    total = 0
+    pooled = None
+    batch = sampling["min_samples"]
+    k = 0
+
+    while True:
+        model.param["sample_count"] = batch
+        model.param["seed_pseudorandom"] = seed + k
+        df = model.run().get_last_nodes_probtraj()
+
+        # MaBoSS omits states never reached in a batch, so align batches
+        # by column name: absent columns (and target nodes) count as 0.
+        columns = list(dict.fromkeys([*(pooled.index if pooled is not None else nodes),
+                                      *df.columns]))
+        values = df.iloc[0].astype(float).reindex(columns, fill_value=0.0)
+
+        # Sample-weighted mean of the batches run so far.
+        if pooled is None:
+            pooled = values
+        else:
+            pooled = pooled.reindex(columns, fill_value=0.0)
+            pooled = (pooled * total + values * batch) / (total + batch)
+        total += batch
+
+        err = ci_halfwidth(pooled[nodes].to_numpy(), total, sampling["z"])
+        if np.all(err <= sampling["tolerance"]) or total >= sampling["max_samples"]:
+            break
+
+        # Next batch doubles the total, capped at max_samples.
+        batch = min(total, sampling["max_samples"] - total)
+        k += 1
+
+    out = pooled.to_frame().T
+    out.index = df.index
+    for node, e in zip(nodes, err):
+        out[f"{node}_err"] = e
+    out["sample_count"] = total
+    return out
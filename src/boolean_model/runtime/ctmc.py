@@ -0,0 +1,601 @@
+# boolean_model/runtime/ctmc.py
+#
+# Exact continuous-time Markov chain engine for small MaBoSS models.
+#
+# MaBoSS simulates the asynchronous CTMC of a Boolean network by sampling
+# trajectories. For a network of n nodes the chain has only 2^n states
+# (32 for the Rho model), so the steady state can instead be solved
+# exactly from the generator matrix:
+#
+#   .bnd + .cfg -> rate expressions + parameters -> generator Q (2^n × 2^n)
+#               -> stationary distribution pi (pi Q = 0) -> node probabilities
+#
+# State encoding: state index s has node i ON iff bit i of s is set, with
+# nodes numbered in .bnd declaration order.
+#
+# BooleanCTMC mirrors the parts of the maboss model API used in this repo
+# (copy, update_parameters, mutate, param, run), and its result exposes
+# get_last_nodes_probtraj(), so it can stand in for a MaBoSS model.
+
+import copy
+import re
+
+import numpy as np
+import pandas as pd
+from scipy.linalg import expm
+from scipy.sparse.csgraph import connected_components
+
+# ------------------------------------------------------------------
+# Expression parsing
+# ------------------------------------------------------------------
+_TOKEN_RE = re.compile(r"""
+    \s*(?:
+        (?P<num>\d+\.?\d*(?:[eE][-+]?\d+)?|\.\d+(?:[eE][-+]?\d+)?)
+      | (?P<param>\$[A-Za-z_]\w*)
+      | (?P<name>[A-Za-z_]\w*)
+      | (?P<op>&&|\|\||==|!=|<=|>=|[?:()&|!^+\-*/<>])
+    )""", re.VERBOSE)
+
+_KEYWORDS = {'AND': '&', 'OR': '|', 'NOT': '!', 'XOR': '^'}
+
+
+def _tokenize(text):
+    tokens, pos = [], 0
+    text = text.strip()
+    while pos < len(text):
+        m = _TOKEN_RE.match(text, pos)
+        if m is None or m.end() == pos:
+            raise ValueError(f"Cannot parse expression near: {text[pos:pos + 20]!r}")
+        pos = m.end()
+        kind = m.lastgroup
+        value = m.group(kind)
+        if kind == 'name' and value in _KEYWORDS:
+            kind, value = 'op', _KEYWORDS[value]
+        elif kind == 'op' and value in ('&&', '||'):
+            value = value[0]
+        tokens.append((kind, value))
+    return tokens
+
+
+def _truth(x):
+    return np.asarray(x) != 0
+
+
+class _ExprParser:
+    """
+    Recursive-descent compiler for MaBoSS rate expressions.
+
+    Grammar, lowest precedence first:
+      ternary: or ('?' ternary ':' ternary)?
+      or: xor ('|' xor)*         xor: and ('^' and)*
+      and: cmp ('&' cmp)*        cmp: sum (('=='|'!='|'<'|...) sum)?
+      sum: prod (('+'|'-') prod)*
+      prod: unary (('*'|'/') unary)*
+      unary: ('!'|'-') unary | atom
+      atom: number | $param | node | '(' ternary ')'
+
+    Compiled expressions are callables f(nodes, params) evaluated over
+    whole arrays of states: nodes maps node name -> bool array.
+    """
+
+    _BINARY = {
+        '|': lambda a, b: _truth(a) | _truth(b),
+        '^': lambda a, b: _truth(a) ^ _truth(b),
+        '&': lambda a, b: _truth(a) & _truth(b),
+        '==': np.equal, '!=': np.not_equal,
+        '<': np.less, '<=': np.less_equal, '>': np.greater, '>=': np.greater_equal,
+        '+': np.add, '-': np.subtract, '*': np.multiply, '/': np.divide,
+    }
+
+    def __init__(self, text):
+        self.text = text
+        self.tokens = _tokenize(text)
+        self.i = 0
+
+    def parse(self):
+        expr = self._ternary()
+        if self.i != len(self.tokens):
+            raise ValueError(f"Unexpected token {self.tokens[self.i][1]!r} in: {self.text}")
+        return expr
+
+    # --- token helpers ---
+    def _peek(self):
+        """Next operator token, or None."""
+        if self.i < len(self.tokens) and self.tokens[self.i][0] == 'op':
+            return self.tokens[self.i][1]
+        return None
+
+    def _take(self, expected=None):
+        if self.i >= len(self.tokens):
+            raise ValueError(f"Unexpected end of expression: {self.text}")
+        kind, value = self.tokens[self.i]
+        if expected is not None and (kind != 'op' or value != expected):
+            raise ValueError(f"Expected {expected!r}, got {value!r} in: {self.text}")
+        self.i += 1
+        return kind, value
+
+    def _binary(self, ops, operand):
+        left = operand()
+        while self._peek() in ops:
+            fn = self._BINARY[self._take()[1]]
+            right = operand()
+            left = (lambda fn, l, r: lambda n, p: fn(l(n, p), r(n, p)))(fn, left, right)
+        return left
+
+    # --- grammar ---
+    def _ternary(self):
+        cond = self._or()
+        if self._peek() != '?':
+            return cond
+        self._take('?')
+        then = self._ternary()
+        self._take(':')
+        other = self._ternary()
+        return lambda n, p: np.where(_truth(cond(n, p)), then(n, p), other(n, p))
+
+    def _or(self):
+        return self._binary(('|',), self._xor)
+
+    def _xor(self):
+        return self._binary(('^',), self._and)
+
+    def _and(self):
+        return self._binary(('&',), self._cmp)
+
+    def _cmp(self):
+        return self._binary(('==', '!=', '<', '<=', '>', '>='), self._sum)
+
+    def _sum(self):
+        return self._binary(('+', '-'), self._prod)
+
+    def _prod(self):
+        return self._binary(('*', '/'), self._unary)
+
+    def _unary(self):
+        if self._peek() in ('!', '-'):
+            op = self._take()[1]
+            operand = self._unary()
+            if op == '!':
+                return lambda n, p: ~_truth(operand(n, p))
+            return lambda n, p: np.negative(operand(n, p))
+        return self._atom()
+
+    def _atom(self):
+        kind, value = self._take()
+        if kind == 'num':
+            number = float(value)
+            return lambda n, p: number
+        if kind == 'param':
+            return lambda n, p: p[value]
+        if kind == 'name':
+            return lambda n, p: n[value]
+        if value == '(':
+            expr = self._ternary()
+            self._take(')')
+            return expr
+        raise ValueError(f"Unexpected token {value!r} in: {self.text}")
+
+
+def compile_expression(text):
+    """Compile a MaBoSS expression into f(nodes, params)."""
+    return _ExprParser(text).parse()
+
+# ------------------------------------------------------------------
+# File parsing
+# ------------------------------------------------------------------
+def _strip_comments(text):
+    text = re.sub(r"/\*.*?\*/", "", text, flags=re.S)
+    return re.sub(r"//[^\n]*", "", text)
+
+
+def parse_bnd(path):
+    """
+    Parse node definitions from a MaBoSS .bnd file.
+
+    Returns: dict {node: {attribute: expression text}} in declaration order.
+    Text outside `node NAME { ... }` blocks is ignored.
+    """
+    text = _strip_comments(open(path, encoding='utf-8', errors='ignore').read())
+
+    nodes = {}
+    for m in re.finditer(r"\b(?:node|Node)\s+(\w+)\s*\{(.*?)\}", text, flags=re.S):
+        attrs = {}
+        for stmt in m.group(2).split(';'):
+            if '=' in stmt:
+                key, expr = stmt.split('=', 1)
+                attrs[key.strip()] = " ".join(expr.split())
+        nodes[m.group(1)] = attrs
+
+    if not nodes:
+        raise ValueError(f"No node definitions found in {path}")
+    return nodes
+
+
+def parse_cfg(path):
+    """
+    Parse a MaBoSS .cfg file.
+
+    Returns: (params, istate, settings)
+      params: {'$name': float}
+      istate: {node: probability of starting ON}
+      settings: {key: float} simulation controls (max_time, sample_count, ...)
+    """
+    text = _strip_comments(open(path, encoding='utf-8', errors='ignore').read())
+
+    params, istate, settings = {}, {}, {}
+    for stmt in text.split(';'):
+        if '=' not in stmt:
+            continue
+        key, expr = (s.strip() for s in stmt.split('=', 1))
+        value = float(compile_expression(expr)({}, params))
+
+        if key.startswith('$'):
+            params[key] = value
+        elif key.endswith('.istate'):
+            istate[key[:-len('.istate')]] = value
+        elif '.' not in key:
+            settings[key] = value
+
+    return params, istate, settings
+
+# ------------------------------------------------------------------
+# Stationary distribution
+# ------------------------------------------------------------------
+def _solve_irreducible(Q):
+    """pi with pi Q = 0, sum(pi) = 1, for a chain with one closed class."""
+    A = Q.T.copy()
+    A[-1, :] = 1.0
+    b = np.zeros(len(Q))
+    b[-1] = 1.0
+    pi = np.clip(np.linalg.solve(A, b), 0.0, None)   # drop round-off negatives
+    return pi / pi.sum()
+
+
+def stationary_distribution(Q, p0=None):
+    """
+    Long-run state distribution of the CTMC with generator Q.
+
+    With a single closed class this is the unique stationary distribution.
+    Otherwise (e.g. a node with all rates zero) the limit depends on the
+    start: each closed class gets the probability of being absorbed into
+    it from p0, spread by its own stationary distribution.
+
+    Q: (S, S) generator, rows summing to zero
+    p0: (S,) initial distribution (needed only with several closed classes)
+    Returns: (S,) probability vector
+    """
+    n = len(Q)
+    adjacency = (Q > 0) & ~np.eye(n, dtype=bool)
+    n_comp, labels = connected_components(adjacency, directed=True, connection='strong')
+
+    # Closed classes: strongly connected components with no outgoing edge.
+    src, dst = np.nonzero(adjacency)
+    leaving = labels[src[labels[src] != labels[dst]]]
+    closed = [c for c in range(n_comp) if c not in set(leaving)]
+
+    if len(closed) == 1:
+        return _solve_irreducible(Q)
+
+    if p0 is None:
+        raise ValueError("Chain has several closed classes; an initial distribution is required.")
+
+    transient = ~np.isin(labels, closed)
+    pi = np.zeros(n)
+
+    # Visits to transient states before absorption: p0_T (-Q_TT)^-1
+    occupancy = (
+        np.linalg.solve(-Q[np.ix_(transient, transient)].T, p0[transient])
+        if transient.any() else np.zeros(0)
+    )
+
+    for c in closed:
+        members = labels == c
+        mass = p0[members].sum() + occupancy @ Q[np.ix_(transient, members)].sum(axis=1)
+        if mass > 0:
+            pi[members] = mass * _solve_irreducible(Q[np.ix_(members, members)])
+    return pi
+
+def stationary_distribution_batch(Q, p0=None):
+    """
+    Batched stationary_distribution for a (B, S, S) stack of generators.
+
+    Chains with a single closed class (every combo of a normal sweep) are
+    solved in one batched linear solve; any others fall back to the
+    per-chain absorption treatment.
+    Returns: (B, S) probability vectors
+    """
+    n_batch, n, _ = Q.shape
+    eye = np.eye(n, dtype=bool)
+
+    # Reachability closure by repeated squaring: reach[b, s, t] = s ->* t.
+    reach = ((Q > 0) | eye).astype(np.float32)
+    for _ in range(int(np.ceil(np.log2(n)))):
+        reach = np.minimum(reach @ reach, 1.0)
+
+    # One closed class <=> some state is reachable from every state.
+    single = (reach > 0).all(axis=1).any(axis=-1)
+
+    pi = np.empty((n_batch, n))
+    if single.any():
+        A = np.swapaxes(Q[single], -1, -2).copy()
+        A[:, -1, :] = 1.0
+        b = np.zeros((len(A), n, 1))
+        b[:, -1] = 1.0
+        solved = np.clip(np.linalg.solve(A, b)[..., 0], 0.0, None)
+        pi[single] = solved / solved.sum(axis=1, keepdims=True)
+
+    for k in np.flatnonzero(~single):
+        pi[k] = stationary_distribution(Q[k], p0)
+    return pi
+
+# ------------------------------------------------------------------
+# Transient distribution
+# ------------------------------------------------------------------
+def transient_distribution(Q, p0, times):
+    """
+    State distribution p(t) = p0 exp(Q t) at each requested time.
+
+    Propagates between consecutive times with exp(Q Δt), computing one
+    (batched) matrix exponential per distinct gap, so a uniform output
+    grid costs a single expm regardless of its resolution.
+
+    Q: (..., S, S) generator(s); leading axes are independent chains
+    p0: (S,) or (..., S) initial distribution(s)
+    times: (T,) non-decreasing output times, >= 0
+    Returns: (..., T, S) probabilities
+    """
+    times = np.asarray(times, dtype=float)
+    if np.any(np.diff(times) < 0) or np.any(times < 0):
+        raise ValueError("Output times must be non-negative and non-decreasing.")
+
+    gaps = np.diff(times, prepend=0.0)
+    p = np.broadcast_to(p0, Q.shape[:-1]).astype(float)
+    out = np.empty(Q.shape[:-2] + (len(times), Q.shape[-1]))
+
+    propagators = {}
+    for k, gap in enumerate(gaps):
+        key = round(gap, 12)
+        if key not in propagators:
+            propagators[key] = expm(Q * gap)
+        p = np.einsum('...s,...st->...t', p, propagators[key])
+        out[..., k, :] = p
+
+    return np.clip(out, 0.0, None)   # drop round-off negatives
+
+
+def output_times(max_time, time_tick):
+    """MaBoSS probtraj time grid: window starts 0, tick, ..., < max_time."""
+    n = int(round(max_time / time_tick))
+    return np.round(np.arange(n) * time_tick, 10)
+
+
+def nodes_probtraj_batch(models, times=None):
+    """
+    Transient node probabilities for several models (e.g. one per
+    perturbation) with a single batched matrix exponential.
+
+    models: list of BooleanCTMC sharing nodes
+    times: output times; default the first model's max_time / time_tick grid
+    Returns: list of DataFrames like CTMCResult.get_nodes_probtraj()
+    """
+    if times is None:
+        times = output_times(models[0].param["max_time"], models[0].param["time_tick"])
+
+    Q = np.stack([m.generator() for m in models])
+    p0 = np.stack([m.initial_distribution() for m in models])
+    probs = transient_distribution(Q, p0, times) @ models[0].states
+
+    index = pd.Index(times, name="t")
+    return [pd.DataFrame(p, index=index, columns=models[0].node_names) for p in probs]
+
+# ------------------------------------------------------------------
+# Model
+# ------------------------------------------------------------------
+class BooleanCTMC:
+    """
+    Exact CTMC form of a MaBoSS Boolean model.
+    nodes: dict – parsed .bnd node definitions (see parse_bnd)
+    params: dict – {'$name': value} rate parameters
+    istate: dict – {node: probability of starting ON}
+    settings: dict – simulation controls from the .cfg (kept in self.param)
+    """
+
+    def __init__(self, nodes, params, istate=None, settings=None):
+        self.node_names = list(nodes)
+        self.params = dict(params)
+        self.istate = {n: float((istate or {}).get(n, 0.0)) for n in self.node_names}
+        self.param = dict(settings or {})
+        self.mutations = {}
+
+        # Rate expression sources, kept so the model can be pickled.
+        self._expressions = {}
+        for name, attrs in nodes.items():
+            for key in ('rate_up', 'rate_down'):
+                if key not in attrs:
+                    raise ValueError(f"Node {name} has no {key} expression.")
+            self._expressions[name] = (attrs['rate_up'], attrs['rate_down'])
+        self._compile()
+
+        # All 2^n states as a (S, n) boolean table.
+        n = len(self.node_names)
+        index = np.arange(2 ** n)
+        self.states = ((index[:, None] >> np.arange(n)) & 1).astype(bool)
+
+    def _compile(self):
+        self._rate_up = {n: compile_expression(up) for n, (up, _) in self._expressions.items()}
+        self._rate_down = {n: compile_expression(down) for n, (_, down) in self._expressions.items()}
+
+    def __getstate__(self):
+        # Compiled rate functions are closures; rebuild them after unpickling.
+        state = dict(self.__dict__)
+        del state['_rate_up'], state['_rate_down']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._compile()
+
+    @classmethod
+    def from_files(cls, bnd_path, cfg_path):
+        params, istate, settings = parse_cfg(cfg_path)
+        return cls(parse_bnd(bnd_path), params, istate, settings)
+
+    # ------------------------------------------------------------------
+    # maboss-compatible model API
+    # ------------------------------------------------------------------
+    def copy(self):
+        return copy.deepcopy(self)
+
+    def update_parameters(self, **params):
+        """Set rate parameters by name, e.g. update_parameters(**{'$RhoA_amp': 5.0})."""
+        for key, value in params.items():
+            if key not in self.params:
+                raise KeyError(f"Unknown model parameter: {key}")
+            self.params[key] = float(value)
+
+    def mutate(self, node, state):
+        """Clamp a node "ON" or "OFF" (rates and initial state), as maboss does."""
+        if node not in self.node_names:
+            raise KeyError(f"Unknown node: {node}")
+        if state not in ("ON", "OFF"):
+            raise ValueError(f"Mutation state must be 'ON' or 'OFF', got {state!r}")
+        self.mutations[node] = state
+        self.istate[node] = 1.0 if state == "ON" else 0.0
+
+    def run(self):
+        return CTMCResult(self)
+
+    # ------------------------------------------------------------------
+    # Chain assembly
+    # ------------------------------------------------------------------
+    def _node_env(self):
+        return {name: self.states[:, i] for i, name in enumerate(self.node_names)}
+
+    def transition_rates(self, params=None):
+        """
+        Per-node flip rates in every state.
+        params: optional parameter dict; values may be (B, 1) arrays to
+            evaluate B parameter sets at once.
+        Returns: (..., S, n) array, entry [s, i] = rate of flipping node i
+            in state s, with a leading B axis for batched params.
+        """
+        params = self.params if params is None else params
+        env = self._node_env()
+
+        columns = []
+        for i, name in enumerate(self.node_names):
+            up = self._rate_up[name](env, params)
+            down = self._rate_down[name](env, params)
+
+            mutation = self.mutations.get(name)
+            if mutation == "OFF":
+                up = 0.0
+            elif mutation == "ON":
+                down = 0.0
+
+            columns.append(np.where(self.states[:, i], down, up))
+
+        rates = np.stack(np.broadcast_arrays(*columns), axis=-1)
+        rates = rates.astype(np.result_type(rates, float))   # complex kept for derivatives
+        if np.any(rates.real < 0):
+            raise ValueError("Negative transition rate; check model parameters.")
+        return rates
+
+    def generator(self, params=None):
+        """(..., S, S) generator matrix Q of the asynchronous CTMC."""
+        rates = self.transition_rates(params)
+        n_states, n_nodes = rates.shape[-2:]
+        index = np.arange(n_states)
+
+        Q = np.zeros(rates.shape[:-1] + (n_states,), dtype=rates.dtype)
+        for i in range(n_nodes):
+            Q[..., index, index ^ (1 << i)] = rates[..., i]
+        Q[..., index, index] = -rates.sum(axis=-1)
+        return Q
+
+    def generator_derivatives(self, keys, step=1e-20):
+        """
+        Derivatives dQ/dθ of the generator for each parameter in keys, by
+        complex-step differentiation of the rate expressions (exact to
+        round-off, no subtractive cancellation).
+        Returns: (P, S, S) array, one slice per key.
+        """
+        params = dict(self.params)
+        for j, key in enumerate(keys):
+            if key not in self.params:
+                raise KeyError(f"Unknown model parameter: {key}")
+            shift = np.zeros((len(keys), 1), dtype=complex)
+            shift[j] = 1j * step
+            params[key] = self.params[key] + shift
+
+        Q = np.broadcast_to(self.generator(params), (len(keys),) + (len(self.states),) * 2)
+        return np.imag(Q) / step
+
+    def initial_distribution(self):
+        """(S,) product distribution from the per-node istate probabilities."""
+        p_on = np.array([self.istate[n] for n in self.node_names])
+        return np.prod(np.where(self.states, p_on, 1.0 - p_on), axis=1)
+
+    def stationary_state_probabilities(self):
+        """(S,) long-run probability of every network state."""
+        return stationary_distribution(self.generator(), self.initial_distribution())
+
+    def stationary_node_probabilities(self):
+        """Long-run probability that each node is ON, as {node: p}."""
+        p_on = self.stationary_state_probabilities() @ self.states
+        return dict(zip(self.node_names, p_on))
+
+    def solve_batch(self, combos, chunk_size=4096):
+        """
+        Steady-state node probabilities for many parameter combinations.
+
+        Generators for all combos are assembled as one (B, S, S) stack and
+        solved together; parameters not in a combo keep the model values.
+        combos: list of {'$param': value} dicts sharing the same keys
+        Returns: DataFrame with one row per combo and one column per node.
+        """
+        if not combos:
+            return pd.DataFrame(columns=self.node_names, dtype=float)
+
+        keys = list(combos[0])
+        for key in keys:
+            if key not in self.params:
+                raise KeyError(f"Unknown model parameter: {key}")
+
+        p0 = self.initial_distribution()
+        n_states = len(self.states)
+
+        chunks = []
+        for start in range(0, len(combos), chunk_size):
+            batch = combos[start:start + chunk_size]
+            params = dict(self.params)
+            for key in keys:
+                params[key] = np.array([c[key] for c in batch], dtype=float)[:, None]
+
+            Q = np.broadcast_to(self.generator(params), (len(batch), n_states, n_states))
+            chunks.append(stationary_distribution_batch(Q, p0) @ self.states)
+
+        return pd.DataFrame(np.concatenate(chunks), columns=self.node_names)
+
+
+class CTMCResult:
+    """Result of BooleanCTMC.run(); mirrors the maboss result accessors used here."""
+
+    def __init__(self, model):
+        self.model = model
+
+    def get_nodes_probtraj(self, times=None):
+        """
+        Exact node probabilities over time (rows = times, columns = nodes),
+        like maboss's probability trajectory but noise-free.
+        times: optional output times; default the max_time / time_tick grid.
+        """
+        return nodes_probtraj_batch([self.model], times)[0]
+
+    def get_last_nodes_probtraj(self):
+        """
+        Steady-state node probabilities as a one-row DataFrame (columns =
+        nodes), like maboss's final-window probabilities. Indexed by t = inf.
+        """
+        probs = self.model.stationary_node_probabilities()
+        return pd.DataFrame([probs], index=pd.Index([np.inf], name="t"))
@@ -1,19 +1,35 @@
 # boolean_model/runtime/model_loader.py
+#
+# Engines:
+#   maboss — stochastic MaBoSS simulation (sample_count trajectories)
+#   ctmc — exact steady state of the same model (runtime/ctmc.py)
 
-import maboss
+from src.boolean_model.runtime.ctmc import BooleanCTMC
 from src.paths import MABOSS_DIR
 
+ENGINES = ("maboss", "ctmc")
+
 
 def load_base_model(sim_cfg):
     """
-    Load configured MaBoSS model and apply runtime parameters.
+    Load configured Boolean model and apply runtime parameters.
+    The engine is chosen by simulation.engine (default "maboss").
     """
     model_cfg = sim_cfg["model"]
+    engine = sim_cfg["simulation"].get("engine", "maboss")
 
     bnd_path = MABOSS_DIR / model_cfg["bnd"]
     cfg_path = MABOSS_DIR / model_cfg["cfg"]
 
-    model = maboss.load(str(bnd_path), str(cfg_path))
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown Boolean model engine '{engine}'. Options: {ENGINES}")
+
+    if engine == "ctmc":
+        model = BooleanCTMC.from_files(bnd_path, cfg_path)
+    else:
+        import maboss
+        model = maboss.load(str(bnd_path), str(cfg_path))
+
     model.param["max_time"] = sim_cfg["simulation"]["max_time"]
     model.param["sample_count"] = sim_cfg["simulation"]["sample_count"]
 
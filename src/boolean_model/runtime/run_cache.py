@@ -0,0 +1,171 @@
+# boolean_model/runtime/run_cache.py
+#
+# Content-addressed on-disk cache for Boolean model runs.
+#
+# A run is identified by a hash of the fully resolved model: the network
+# and cfg text MaBoSS would be given (model files + mutations + parameter
+# overrides + max_time / sample_count), or the equivalent state of a
+# BooleanCTMC, plus the kind of output requested. Runs that resolve to the
+# same model share one entry, whichever sweep or session produced them.
+#
+# Entries are CSV files named <key>.csv in the cache directory. When the
+# directory grows past max_bytes, least recently used entries are evicted.
+
+import hashlib
+import io
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from src.paths import BM_CACHE_DIR
+
+CACHE_FORMAT_VERSION = 1
+
+# cfg settings that change how a run executes but not its result.
+_IGNORED_SETTINGS = ("thread_count",)
+
+
+def model_fingerprint(model):
+    """
+    Text that fully determines a model's runs (engine-specific).
+    MaBoSS models are described by their printed .bnd / .cfg; BooleanCTMC
+    by its expressions, parameters, initial state, mutations and settings.
+    """
+    if hasattr(model, "print_bnd"):
+        bnd, cfg = io.StringIO(), io.StringIO()
+        model.print_bnd(out=bnd)
+        model.print_cfg(out=cfg)
+        cfg_lines = [
+            line for line in cfg.getvalue().splitlines()
+            if line.split("=")[0].strip() not in _IGNORED_SETTINGS
+        ]
+        return "maboss\n" + bnd.getvalue() + "\n".join(cfg_lines)
+
+    settings = {k: v for k, v in model.param.items() if k not in _IGNORED_SETTINGS}
+    return json.dumps({
+        "engine": type(model).__name__,
+        "expressions": getattr(model, "_expressions", None),
+        "params": model.params,
+        "istate": model.istate,
+        "mutations": model.mutations,
+        "settings": settings,
+    }, sort_keys=True, default=str)
+
+
+class RunCache:
+    """
+    Size-bounded store of run outputs keyed by model content.
+    cache_dir: Path – directory holding the entries
+    max_bytes: int – total size above which LRU entries are evicted
+    """
+
+    def __init__(self, cache_dir, max_bytes=500 * 2**20):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_bytes)
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # key -> entry size, least recently used first. Rebuilt from disk
+        # (ordered by mtime) so sessions share entries.
+        self._index = {}
+        paths = sorted(self.cache_dir.glob("*.csv"), key=lambda p: p.stat().st_mtime)
+        for path in paths:
+            self._index[path.stem] = path.stat().st_size
+
+    def _touch(self, key, size):
+        self._index.pop(key, None)
+        self._index[key] = size
+
+    # ------------------------------------------------------------------
+    # Keys and lookup
+    # ------------------------------------------------------------------
+    def key(self, model, kind):
+        """Cache key for one run of model; kind names the output (e.g. "ss")."""
+        h = hashlib.sha256()
+        h.update(f"v{CACHE_FORMAT_VERSION}|{kind}|".encode())
+        h.update(model_fingerprint(model).encode())
+        return h.hexdigest()
+
+    def _path(self, key):
+        return self.cache_dir / f"{key}.csv"
+
+    def get(self, key):
+        """Cached DataFrame for key, or None on a miss."""
+        path = self._path(key)
+        try:
+            df = pd.read_csv(path, index_col=0, float_precision="round_trip")
+        except (OSError, ValueError):
+            self.misses += 1
+            self._index.pop(key, None)
+            return None
+
+        self.hits += 1
+        os.utime(path)   # recency for later sessions
+        self._touch(key, path.stat().st_size)
+        return df
+
+    def put(self, key, df):
+        """Store df under key (atomically), then evict down to max_bytes."""
+        path = self._path(key)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            df.to_csv(tmp)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f">>> WARNING: Could not write run cache entry to {self.cache_dir}: {e}")
+            tmp.unlink(missing_ok=True)
+            return
+
+        self._touch(key, path.stat().st_size)
+        self._evict()
+
+    def _evict(self):
+        total = sum(self._index.values())
+        for key in list(self._index):
+            if total <= self.max_bytes:
+                break
+            self._path(key).unlink(missing_ok=True)
+            total -= self._index.pop(key)
+            self.evictions += 1
+
+    # ------------------------------------------------------------------
+    # Statistics
+    # ------------------------------------------------------------------
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self._index),
+            "bytes": sum(self._index.values()),
+        }
+
+    def report(self):
+        s = self.stats()
+        print(
+            f">>> INFO: Run cache: {s['hits']} hits, {s['misses']} misses "
+            f"({100 * s['hit_rate']:.0f}% hit rate), {s['entries']} entries, "
+            f"{s['bytes'] / 2**20:.1f} MB, {s['evictions']} evicted"
+        )
+
+
+def build_run_cache(sim_cfg):
+    """
+    RunCache from the simulation.cache config block, or None when disabled.
+        enabled: bool
+        dir: optional cache directory (default results/boolean_model/cache)
+        max_size_mb: eviction threshold
+    """
+    cache_cfg = sim_cfg["simulation"].get("cache") or {}
+    if not cache_cfg.get("enabled", False):
+        return None
+
+    cache_dir = cache_cfg.get("dir") or BM_CACHE_DIR
+    return RunCache(cache_dir, max_bytes=float(cache_cfg.get("max_size_mb", 500)) * 2**20)
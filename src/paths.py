@@ -33,6 +33,7 @@ EXP_DIR = RAW_DATA_DIR / "russ" / "Elongation"
 BM_RESULTS_DIR = RESULTS_DIR / "boolean_model"
 BM_SIM_RES_DIR = BM_RESULTS_DIR / "sim"
 BM_SWEEP_RES_DIR = BM_RESULTS_DIR / "sweep"
+BM_CACHE_DIR = BM_RESULTS_DIR / "cache"
 
 BM_FIG_DIR = FIGURES_DIR / "boolean_model"
 BM_SIM_FIG_DIR = BM_FIG_DIR / "sim"
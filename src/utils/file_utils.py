@@ -1,9 +1,31 @@
 # src/utils/file_utils.py
 
+import hashlib
+import json
+import operator
+import os
 from datetime import datetime
 from pathlib import Path
+
+import numpy as np
 import pandas as pd
 
+# Output file stem: base_name[_suffix][_timestamp]
+def build_output_name(base_name, suffix=None, ts=False):
+    # clean suffix
+    if suffix is not None:
+        suffix = str(suffix).replace(" ", "_").replace("/", "_")
+
+    if ts:
+        time = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        parts = [base_name, suffix, time]
+    else:
+        parts = [base_name, suffix]
+
+    # remove None parts
+    parts = [p for p in parts if p is not None]
+    return "_".join(parts)
+
 # DataFrame to csv
 def save_df_to_csv(df, out_dir, base_name, suffix=None, ts=False):
     """
@@ -18,19 +40,7 @@ def save_df_to_csv(df, out_dir, base_name, suffix=None, ts=False):
     out_dir = Path(out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    # clean suffix
-    if suffix is not None:
-        suffix = str(suffix).replace(" ", "_").replace("/", "_")
-
-    if ts:
-        time = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        parts = [base_name, suffix, time]
-    else:
-        parts = [base_name, suffix]
-
-    # remove None parts
-    parts = [p for p in parts if p is not None]
-    file_name = "_".join(parts) + ".csv"
+    file_name = build_output_name(base_name, suffix, ts) + ".csv"
 
     path = out_dir / file_name
     df.to_csv(path, index=False)
@@ -38,13 +48,40 @@ def save_df_to_csv(df, out_dir, base_name, suffix=None, ts=False):
     print(f">>> INFO: Saved {path.name} to {out_dir}")
     return path
 
+# Row filters shared by the CSV and Parquet loaders
+_FILTER_OPS = {
+    "==": operator.eq, "=": operator.eq, "!=": operator.ne,
+    "<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge,
+    "in": lambda col, val: col.isin(val),
+    "not in": lambda col, val: ~col.isin(val),
+}
+
+def apply_filters(df, filters):
+    """
+    Keep rows matching every (column, op, value) predicate.
+
+    filters: list of tuples, e.g. [("perturbation", "==", "WT"), ("step", ">=", 100)].
+        Ops: ==, !=, <, <=, >, >=, in, not in (same form as pyarrow filters).
+    """
+    if not filters:
+        return df
+
+    mask = pd.Series(True, index=df.index)
+    for column, op, value in filters:
+        if op not in _FILTER_OPS:
+            raise ValueError(f"Unsupported filter operator: {op!r}")
+        mask &= _FILTER_OPS[op](df[column], value)
+    return df[mask].reset_index(drop=True)
+
 # CSV Loader
-def load_csv_to_df(in_dir, file_name, **read_csv_kwargs):
+def load_csv_to_df(in_dir, file_name, columns=None, filters=None, **read_csv_kwargs):
     """
     Load a CSV file into a pandas DataFrame.
 
     in_dir: Path or str – directory containing the file.
     file_name: str – name of the CSV file (with or without .csv extension).
+    columns: optional list of columns to load (filter columns are read too).
+    filters: optional list of (column, op, value) row predicates, see apply_filters.
     read_csv_kwargs: optional kwargs passed to pandas.read_csv().
 
     Returns: DataFrame
@@ -63,7 +100,14 @@ def load_csv_to_df(in_dir, file_name, **read_csv_kwargs):
         if not path.is_file():
             raise ValueError(f"Path is not a file: {path}")
 
+        if columns is not None:
+            filter_cols = [f[0] for f in filters or [] if f[0] not in columns]
+            read_csv_kwargs["usecols"] = list(columns) + filter_cols
+
         df = pd.read_csv(path, **read_csv_kwargs)
+        df = apply_filters(df, filters)
+        if columns is not None:
+            df = df[list(columns)]
 
         print(f">>> INFO: Loaded {path.name} from {in_dir}")
         return df
@@ -72,7 +116,182 @@ def load_csv_to_df(in_dir, file_name, **read_csv_kwargs):
         raise ValueError(f"Error parsing CSV file {path}: {e}")
     except Exception as e:
         raise RuntimeError(f"Unexpected error loading {file_name} from {in_dir}: {e}")
-    
+
+
+# ------------------------------------------------------------------
+# Parquet datasets (optional dependency: pyarrow)
+# ------------------------------------------------------------------
+def _import_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError(
+            "Parquet output requires pyarrow (conda install -c conda-forge pyarrow)."
+        ) from e
+    return pa, pq
+
+
+class ParquetDatasetWriter:
+    """
+    Stream DataFrame chunks into a Parquet dataset, one file per partition.
+
+    Layout (hive partitioning, readable by load_parquet_to_df):
+        <out_dir>/<name>/<partition_col>=<value>/part-0.parquet
+    Each write() call appends one row group per partition present in the
+    chunk, so rows reach disk while a run is still going. Partitions from
+    a previous dataset of the same name are replaced.
+
+    out_dir: Path – directory to create the dataset in.
+    base_name: str – dataset name, combined with suffix as for CSV output.
+    suffix: optional string appended to the dataset name.
+    partition_col: str – column to partition files by.
+    compression: str – Parquet column compression codec.
+    """
+
+    def __init__(self, out_dir, base_name, suffix=None,
+                 partition_col="perturbation", compression="zstd"):
+        self._pa, self._pq = _import_pyarrow()
+
+        self.path = Path(out_dir) / build_output_name(base_name, suffix)
+        self.path.mkdir(parents=True, exist_ok=True)
+        for old in self.path.glob(f"{partition_col}=*/part-*.parquet"):
+            old.unlink()
+
+        self.partition_col = partition_col
+        self.compression = compression
+        self._writers = {}
+        self.n_rows = 0
+
+    def _writer_for(self, value, table):
+        if value not in self._writers:
+            part_dir = self.path / f"{self.partition_col}={value}"
+            part_dir.mkdir(exist_ok=True)
+            self._writers[value] = self._pq.ParquetWriter(
+                part_dir / "part-0.parquet", table.schema, compression=self.compression
+            )
+        return self._writers[value]
+
+    def write(self, df):
+        """Append the rows of df (must contain partition_col)."""
+        for value, part in df.groupby(self.partition_col, sort=False):
+            table = self._pa.Table.from_pandas(
+                part.drop(columns=self.partition_col), preserve_index=False
+            )
+            writer = self._writer_for(value, table)
+            writer.write_table(table.cast(writer.schema))
+            self.n_rows += len(part)
+
+    def close(self):
+        for writer in self._writers.values():
+            writer.close()
+        self._writers = {}
+        print(f">>> INFO: Saved {self.path.name} ({self.n_rows} rows) to {self.path.parent}")
+        return self.path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def save_df_to_parquet(df, out_dir, base_name, suffix=None, partition_col="perturbation"):
+    """
+    Save DataFrame as a Parquet dataset partitioned by partition_col.
+    Returns: Path of the dataset directory.
+    """
+    with ParquetDatasetWriter(out_dir, base_name, suffix, partition_col) as writer:
+        writer.write(df)
+    return writer.path
+
+
+# Parquet Loader
+def load_parquet_to_df(in_dir, name, columns=None, filters=None):
+    """
+    Load a Parquet file or partitioned dataset into a pandas DataFrame.
+
+    in_dir: Path or str – directory containing the dataset.
+    name: str – dataset directory or .parquet file name.
+    columns: optional list of columns to read; other columns are never decoded.
+    filters: optional list of (column, op, value) predicates, see apply_filters.
+        Predicates on the partition column skip whole files.
+
+    Returns: DataFrame (partition columns as plain strings, as from CSV)
+    """
+    _, pq = _import_pyarrow()
+
+    path = Path(in_dir) / name
+    if not path.exists() and path.with_suffix(".parquet").exists():
+        path = path.with_suffix(".parquet")
+    if not path.exists():
+        raise FileNotFoundError(f"File not found: {path}")
+
+    table = pq.read_table(path, columns=columns, filters=filters or None)
+    df = table.to_pandas()
+
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype(object)
+
+    print(f">>> INFO: Loaded {path.name} from {path.parent}")
+    return df
+
+
+# ------------------------------------------------------------------
+# Dense LUT artifacts (.npz)
+# ------------------------------------------------------------------
+# One uncompressed .npz holding a dense grid table:
+#   values: (n0, n1, ..., n_out) array
+#   axis_<i>: coordinates along grid dimension i
+#   meta: JSON string with provenance (parameters, outputs, engine, ...)
+LUT_ARTIFACT_VERSION = 1
+
+def file_sha256(path):
+    """Hex SHA-256 of a file's bytes (provenance / freshness checks)."""
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+def save_lut_artifact(path, axes, values, meta):
+    """
+    Write a dense LUT artifact atomically (temporary file, then rename).
+    Returns: Path written.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    arrays = {f"axis_{i}": np.asarray(ax, dtype=float) for i, ax in enumerate(axes)}
+    meta = {"version": LUT_ARTIFACT_VERSION, **meta}
+
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        np.savez(f, values=np.ascontiguousarray(values, dtype=float),
+                 meta=np.array(json.dumps(meta, default=str)), **arrays)
+    os.replace(tmp, path)
+
+    print(f">>> INFO: Saved {path.name} to {path.parent}")
+    return path
+
+def load_lut_artifact(path):
+    """
+    Read a dense LUT artifact.
+    Returns: (axes, values, meta), or None if absent, unreadable or of
+    another format version.
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+
+    try:
+        with np.load(path, allow_pickle=False) as npz:
+            meta = json.loads(str(npz["meta"]))
+            values = npz["values"]
+            axes = [npz[f"axis_{i}"] for i in range(values.ndim - 1)]
+    except (OSError, ValueError, KeyError):
+        return None
+
+    if meta.get("version") != LUT_ARTIFACT_VERSION:
+        return None
+    return axes, values, meta
+
 
 # Save Figures
 def save_figure(fig, outdir, title=None, filename=None):
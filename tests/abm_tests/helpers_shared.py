@@ -1,12 +1,71 @@
+import contextlib
 import copy
+import io
+import itertools
+import tempfile
 import unittest
+from pathlib import Path
 
+import numpy as np
+import pandas as pd
+
+from src.abm.experiments.experiment_runner import ExperimentRunner
 from src.utils.config_utils import load_abm_sim_cfg
 
 
+def synthetic_rho(dsp, tjp1, jcad):
+    """Smooth, trilinear-exact stand-in for the Boolean model steady state."""
+    rhoa = 0.05 + 0.3 * dsp + 0.3 * dsp * jcad - 0.2 * dsp * tjp1 + 0.01 * jcad
+    rhoc = 0.05 + 0.3 * tjp1 + 0.3 * tjp1 * jcad - 0.2 * dsp * tjp1 + 0.013 * dsp
+    return rhoa, rhoc
+
+
+def write_recruitment_csv(out_dir, step=0.2, file_name="rho_recruitment.csv"):
+    """
+    Write a recruitment sweep CSV in the run_lut_sweep long format.
+
+    Grid covers [0, 1] in each of DSP, TJP1, JCAD with the given step.
+    """
+    values = np.round(np.arange(0.0, 1.0 + step / 2, step), 3)
+    rows = []
+    for dsp, tjp1, jcad in itertools.product(values, values, values):
+        rhoa, rhoc = synthetic_rho(dsp, tjp1, jcad)
+        rows.append({
+            "RhoA": rhoa, "RhoC": rhoc,
+            "p1_name": "$DSP_recruitment", "p1_value": dsp,
+            "p2_name": "$TJP1_recruitment", "p2_value": tjp1,
+            "p3_name": "$JCAD_recruitment", "p3_value": jcad,
+        })
+    path = out_dir / file_name
+    pd.DataFrame(rows).to_csv(path, index=False)
+    return path
+
+
+def _make_runner(cfg, add_cleanup):
+    tmp = tempfile.TemporaryDirectory()
+    add_cleanup(tmp.cleanup)
+    lut_dir = Path(tmp.name)
+    write_recruitment_csv(lut_dir)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return ExperimentRunner(cfg if cfg is not None else ABMHelperTestCase.make_cfg(), lut_dir)
+
+
 class ABMHelperTestCase(unittest.TestCase):
     """Shared fixture helpers for ABM helper unit tests."""
 
-    def make_cfg(self):
+    @staticmethod
+    def make_cfg():
         """Return a writable ABM config copy for tests."""
         return copy.deepcopy(load_abm_sim_cfg())
+
+    def make_runner(self, cfg=None):
+        """
+        ExperimentRunner (default config) over a synthetic recruitment CSV
+        in a temporary runner.lut_dir, removed when the test finishes.
+        """
+        return _make_runner(cfg, self.addCleanup)
+
+    @classmethod
+    def make_class_runner(cls, cfg=None):
+        """make_runner for setUpClass; the directory lives until the class finishes."""
+        return _make_runner(cfg, cls.addClassCleanup)
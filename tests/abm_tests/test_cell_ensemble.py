@@ -0,0 +1,72 @@
+import contextlib
+import io
+
+import numpy as np
+import pandas as pd
+
+from src.abm.ensemble_simulation import EnsembleSimulation
+from src.abm.simulation import Simulation
+from tests.abm_tests.helpers_shared import ABMHelperTestCase
+
+
+class TestCellEnsemble(ABMHelperTestCase):
+    def setUp(self):
+        self.runner = self.make_runner()
+
+    def test_batched_run_all_matches_serial_runs(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            serial = self.runner.run_all(n_steps=15, save_detail=True)
+            batched = self.runner.run_all(n_steps=15, save_detail=True, batched=True)
+
+        for key in ("cell_ts_df", "cell_ss_df", "node_ts_df", "spring_ts_df"):
+            pd.testing.assert_frame_equal(serial[key], batched[key])
+
+        for perb, result in serial["results_by_perturbation"].items():
+            other = batched["results_by_perturbation"][perb]
+            np.testing.assert_allclose(
+                result["cell_final"].positions, other["cell_final"].positions
+            )
+            np.testing.assert_allclose(
+                result["cell_initial"].positions, other["cell_initial"].positions
+            )
+
+    def test_per_cell_parameters_stay_independent(self):
+        cfg_soft = self.runner.build_cfg("WT", n_steps=15)
+        cfg_stiff = self.runner.build_cfg("WT", n_steps=15)
+        cfg_stiff["mechanics"]["k_base"] = 3.0
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            batch = EnsembleSimulation(
+                [cfg_soft, cfg_stiff], self.runner.lut, ["soft", "stiff"]
+            ).run()
+            single = self.runner.run_single("WT", n_steps=15)
+
+        pd.testing.assert_frame_equal(
+            batch[0]["cell_df"].drop(columns="perturbation"),
+            single["cell_df"].drop(columns="perturbation"),
+        )
+        self.assertFalse(np.allclose(
+            batch[0]["cell_final"].positions, batch[1]["cell_final"].positions
+        ))
+
+    def test_semi_implicit_multirate_cells_match_serial_runs(self):
+        cfg = self.runner.build_cfg("WT", n_steps=10, dt=2.0)
+        cfg["simulation"]["integrator"] = "semi_implicit"
+        cfg["simulation"]["multirate"]["mechanics_substeps"] = 3
+        explicit = self.runner.build_cfg("WT", n_steps=10, dt=2.0)
+        explicit["simulation"]["multirate"]["mechanics_substeps"] = 3
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            batch = EnsembleSimulation([cfg, explicit], self.runner.lut, ["si", "ex"]).run()
+            single = Simulation(cfg, self.runner.lut).run()
+
+        np.testing.assert_allclose(
+            batch[0]["cell_final"].positions, single["cell_final"].positions, atol=1e-10
+        )
+
+    def test_mismatched_topology_is_rejected(self):
+        cfg_a = self.runner.build_cfg("WT")
+        cfg_b = self.runner.build_cfg("WT", n_nodes=24)
+
+        with self.assertRaises(ValueError):
+            EnsembleSimulation([cfg_a, cfg_b], self.runner.lut, ["a", "b"])
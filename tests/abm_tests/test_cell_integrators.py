@@ -0,0 +1,68 @@
+import contextlib
+import io
+
+import numpy as np
+
+from tests.abm_tests.helpers_shared import ABMHelperTestCase
+
+
+class TestCellIntegrators(ABMHelperTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cfg = cls.make_cfg()
+        cfg["simulation"]["max_displacement"] = 1e9   # no clamp to lean on
+        cls.runner = cls.make_class_runner(cfg)
+
+    def run_to(self, t_end, dt, integrator, mechanics_substeps=1):
+        cfg = self.runner.build_cfg("WT", n_steps=int(round(t_end / dt)), dt=dt)
+        cfg["simulation"]["integrator"] = integrator
+        cfg["simulation"]["multirate"]["mechanics_substeps"] = mechanics_substeps
+        with contextlib.redirect_stdout(io.StringIO()):
+            return self.runner.derive(cfg).run_single("WT")
+
+    def test_semi_implicit_matches_explicit_reference_at_large_dt(self):
+        reference = self.run_to(300.0, 0.1, "explicit")["cell_ss"]
+        coarse = self.run_to(300.0, 5.0, "semi_implicit")
+
+        # 50x larger step, no displacement clamp: same state, no ringing.
+        self.assertAlmostEqual(coarse["cell_ss"]["ar"], reference["ar"], delta=0.01)
+        self.assertAlmostEqual(coarse["cell_ss"]["rhoa_mean"], reference["rhoa_mean"], delta=0.002)
+        self.assertLess(self.ringing(coarse), 5e-3)   # ar is logged to 3 d.p.
+
+    def test_explicit_rings_at_a_fraction_of_that_dt(self):
+        self.assertGreater(self.ringing(self.run_to(300.0, 1.0, "explicit")), 0.05)
+
+    @staticmethod
+    def ringing(result):
+        """Largest step-to-step curvature of the aspect ratio late in the run."""
+        ar = result["cell_df"]["ar"].to_numpy()
+        return np.abs(np.diff(ar[len(ar) // 2:], 2)).max()
+
+    def test_unknown_integrator_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.run_to(1.0, 0.1, "rk4")
+
+    def test_multirate_matches_lockstep_with_fewer_lut_queries(self):
+        lut = self.runner.lut
+        calls = []
+        query_many = lut.query_many
+        lut.query_many = lambda pts: calls.append(1) or query_many(pts)
+        try:
+            lockstep = self.run_to(100.0, 0.1, "explicit")
+            n_lockstep = len(calls)
+            multirate = self.run_to(100.0, 1.0, "explicit", mechanics_substeps=10)
+        finally:
+            del lut.query_many
+
+        self.assertEqual(len(calls) - n_lockstep, n_lockstep // 10)
+        self.assertAlmostEqual(multirate["cell_ss"]["ar"], lockstep["cell_ss"]["ar"], delta=0.01)
+        self.assertAlmostEqual(multirate["cell_ss"]["sf_a"], lockstep["cell_ss"]["sf_a"], delta=1e-3)
+
+    def test_substeps_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            self.run_to(1.0, 0.1, "explicit", mechanics_substeps=0)
+
+
+if __name__ == "__main__":
+    import unittest
+    unittest.main()
@@ -0,0 +1,47 @@
+import numpy as np
+
+from src.abm.cell_state import CellState
+from src.abm.cortex_spring import CortexSpring
+from src.abm.membrane_node import MembraneNode
+from tests.abm_tests.helpers_shared import ABMHelperTestCase
+
+
+class TestCellState(ABMHelperTestCase):
+    def make_square_state(self):
+        square = np.array([
+            [0.0, 0.0],
+            [2.0, 0.0],
+            [2.0, 1.0],
+            [0.0, 1.0],
+        ])
+        return CellState(square, a=0.9, k=1.5)
+
+    def test_rest_lengths_follow_ring_order(self):
+        state = self.make_square_state()
+        np.testing.assert_allclose(state.L0, [2.0, 1.0, 2.0, 1.0])
+        np.testing.assert_allclose(state.a, 0.9)
+        np.testing.assert_allclose(state.k, 1.5)
+
+    def test_gather_spring_to_nodes_sums_both_adjacent_springs(self):
+        state = self.make_square_state()
+        gathered = state.gather_spring_to_nodes(np.array([1.0, 10.0, 100.0, 1000.0]))
+        np.testing.assert_allclose(gathered, [1001.0, 11.0, 110.0, 1100.0])
+
+    def test_spring_endpoint_mean_averages_node_and_next_node(self):
+        state = self.make_square_state()
+        mean = state.spring_endpoint_mean(np.array([0.0, 2.0, 4.0, 6.0]))
+        np.testing.assert_allclose(mean, [1.0, 3.0, 5.0, 3.0])
+
+    def test_node_and_spring_views_read_and_write_state_arrays(self):
+        state = self.make_square_state()
+        node_0, node_1 = MembraneNode(0, state), MembraneNode(1, state)
+        spring = CortexSpring(id=0, node_1=node_0, node_2=node_1, state=state)
+
+        node_1.pos += np.array([1.0, 0.0])
+        state.rhoa[1] = 0.4
+        state.T[0] = 2.5
+
+        np.testing.assert_allclose(state.pos[1], [3.0, 0.0])
+        self.assertAlmostEqual(node_1.rhoa, 0.4)
+        self.assertAlmostEqual(spring.T, 2.5)
+        self.assertAlmostEqual(spring.L0, 2.0)
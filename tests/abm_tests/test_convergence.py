@@ -0,0 +1,75 @@
+import contextlib
+import io
+
+import pandas as pd
+
+from src.abm.analysis.convergence import ConvergenceMonitor
+from tests.abm_tests.helpers_shared import ABMHelperTestCase
+
+
+class TestConvergenceMonitor(ABMHelperTestCase):
+    def make_monitor(self, **overrides):
+        conv_cfg = {
+            "window": 3,
+            "min_steps": 3,
+            "tolerances": {"ar": 0.01, "max_displacement": 0.1},
+        }
+        conv_cfg.update(overrides)
+        return ConvergenceMonitor(conv_cfg)
+
+    def test_converges_once_window_spread_is_within_tolerance(self):
+        monitor = self.make_monitor()
+        ars = [1.0, 1.5, 1.6, 1.605, 1.606, 1.607]
+        flags = [monitor.update(i, {"ar": ar, "max_displacement": 0.05})
+                 for i, ar in enumerate(ars)]
+
+        self.assertEqual(flags, [False, False, False, False, True, True])
+        self.assertEqual(monitor.summary()["step"], 4)
+        self.assertAlmostEqual(monitor.summary()["residuals"]["ar"], 0.006)
+
+    def test_displacement_residual_is_window_maximum(self):
+        monitor = self.make_monitor()
+        for i, disp in enumerate([0.5, 0.05, 0.05, 0.05]):
+            converged = monitor.update(i, {"ar": 1.0, "max_displacement": disp})
+
+        self.assertTrue(converged)
+        self.assertAlmostEqual(monitor.residuals["max_displacement"], 0.05)
+
+    def test_min_steps_delays_stop(self):
+        monitor = self.make_monitor(min_steps=5)
+        flags = [monitor.update(i, {"ar": 1.0, "max_displacement": 0.0}) for i in range(5)]
+        self.assertEqual(flags, [False, False, False, False, True])
+
+    def test_unknown_observable_is_rejected(self):
+        with self.assertRaises(KeyError):
+            self.make_monitor(tolerances={"volume": 1.0})
+
+
+class TestEarlyTermination(ABMHelperTestCase):
+    def setUp(self):
+        cfg = self.make_cfg()
+        cfg["simulation"]["convergence"] = {
+            "enabled": True,
+            "window": 5,
+            "min_steps": 10,
+            "tolerances": {"rho_balance": 1.0, "max_displacement": 1.0},
+        }
+        self.runner = self.make_runner(cfg)
+
+    def test_run_stops_at_convergence_and_records_it(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = self.runner.run_single("WT", n_steps=100)
+
+        self.assertEqual(result["convergence"]["step"], 9)
+        self.assertEqual(len(result["cell_df"]), 10)
+        self.assertEqual(result["cell_ss"]["step"], 9)
+        self.assertTrue(result["cell_ss"]["converged"])
+        self.assertEqual(result["node_df"]["step"].max(), 9)
+
+    def test_batched_early_stop_matches_serial(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            serial = self.runner.run_all(n_steps=100)
+            batched = self.runner.run_all(n_steps=100, batched=True)
+
+        pd.testing.assert_frame_equal(serial["cell_ss_df"], batched["cell_ss_df"])
+        pd.testing.assert_frame_equal(serial["cell_ts_df"], batched["cell_ts_df"])
@@ -0,0 +1,89 @@
+import contextlib
+import io
+
+import pandas as pd
+
+from src.abm.experiments.parameter_sweep import run_sweep_single, run_sweeps
+from src.utils.sweep_utils import apply_param_combo
+from tests.abm_tests.helpers_shared import ABMHelperTestCase, write_recruitment_csv
+
+
+class TestExperimentRunner(ABMHelperTestCase):
+    def setUp(self):
+        self.runner = self.make_runner()
+        write_recruitment_csv(self.runner.lut_dir, file_name="rho_recruitment_alt.csv")
+
+    def test_derive_shares_lut_when_combo_leaves_lut_inputs_unchanged(self):
+        cfg = apply_param_combo(self.runner.base_cfg, {("mechanics", "k_base"): 2.0})
+        derived = self.runner.derive(cfg)
+
+        self.assertIs(derived.lut, self.runner.lut)
+        self.assertEqual(derived.base_cfg["mechanics"]["k_base"], 2.0)
+
+    def test_derive_rebuilds_lut_when_files_section_changes(self):
+        cfg = apply_param_combo(
+            self.runner.base_cfg,
+            {("files", "recruitment_csv"): "rho_recruitment_alt.csv"},
+        )
+        with contextlib.redirect_stdout(io.StringIO()):
+            derived = self.runner.derive(cfg)
+
+        self.assertIsNot(derived.lut, self.runner.lut)
+
+
+class TestParallelSweep(ABMHelperTestCase):
+    def setUp(self):
+        cfg = self.make_cfg()
+        cfg["simulation"]["n_steps"] = 3
+        self.runner = self.make_runner(cfg)
+
+        self.sweep = {
+            "name": "k_base_small",
+            "type": "1D",
+            "parameters": [{"path": ["mechanics", "k_base"], "values": [0.5, 2.0]}],
+        }
+
+    def test_parallel_sweep_matches_serial_order_and_values(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            serial = run_sweep_single(self.runner, self.runner.base_cfg, self.sweep)
+            parallel = run_sweep_single(
+                self.runner, self.runner.base_cfg, self.sweep, n_workers=2
+            )
+
+        self.assertEqual(len(parallel), 2 * len(self.runner.base_cfg["perturbations"]))
+        self.assertEqual(parallel.attrs["failed_tasks"], [])
+        pd.testing.assert_frame_equal(serial, parallel)
+
+    def test_parallel_sweep_reports_failed_tasks(self):
+        sweep = dict(self.sweep)
+        sweep["parameters"] = [{"path": ["cell", "n_nodes"], "values": [20, 0]}]
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            df = run_sweep_single(self.runner, self.runner.base_cfg, sweep, n_workers=2)
+
+        n_perbs = len(self.runner.base_cfg["perturbations"])
+        self.assertEqual(len(df), n_perbs)
+        self.assertEqual(len(df.attrs["failed_tasks"]), n_perbs)
+        self.assertEqual(df.attrs["failed_tasks"][0]["cell.n_nodes"], 0)
+
+    def test_run_sweeps_keeps_and_saves_failed_tasks(self):
+        failing = {
+            "name": "n_nodes_bad",
+            "type": "1D",
+            "parameters": [{"path": ["cell", "n_nodes"], "values": [0]}],
+        }
+        sweep_cfg = {"sweeps": [self.sweep, failing]}
+        result_dir = self.runner.lut_dir / "results"
+
+        for n_workers in (None, 2):
+            with self.subTest(n_workers=n_workers), contextlib.redirect_stdout(io.StringIO()):
+                df = run_sweeps(self.runner, sweep_cfg, result_dir=result_dir, n_workers=n_workers)
+
+                n_perbs = len(self.runner.base_cfg["perturbations"])
+                self.assertEqual(len(df), 2 * n_perbs)
+                self.assertEqual(len(df.attrs["failed_tasks"]), n_perbs)
+                self.assertEqual(df.attrs["failed_tasks"][0]["sweep_name"], "n_nodes_bad")
+
+                failed = pd.read_csv(result_dir / "abm_sweep_2_selected_failed_tasks.csv")
+                self.assertEqual(len(failed), n_perbs)
+                self.assertEqual(failed["cell.n_nodes"].tolist(), [0] * n_perbs)
@@ -6,6 +6,7 @@ from src.abm.helpers.geometry import (
     perpendicular,
     polar_mask,
     polygon_area,
+    polygon_area_gradient,
     polygon_arc_lengths,
     polygon_outward_normals,
 )
@@ -80,3 +81,32 @@ class TestGeometryHelpers(ABMHelperTestCase):
         ])
         arc_lengths = polygon_arc_lengths(rectangle)
         np.testing.assert_allclose(arc_lengths, [3.0, 3.0, 3.0, 3.0])
+
+    def test_polygon_helpers_accept_batch_of_polygons(self):
+        square = np.array([
+            [0.0, 0.0],
+            [2.0, 0.0],
+            [2.0, 2.0],
+            [0.0, 2.0],
+        ])
+        batch = np.stack([square, 0.5 * square])
+
+        np.testing.assert_allclose(polygon_area(batch), [4.0, 1.0])
+        np.testing.assert_allclose(
+            polygon_outward_normals(batch)[1], polygon_outward_normals(square)
+        )
+        np.testing.assert_allclose(polygon_arc_lengths(batch)[1], [1.0, 1.0, 1.0, 1.0])
+
+    def test_polygon_area_gradient_matches_finite_differences(self):
+        angles = np.linspace(0.0, 2 * np.pi, 7, endpoint=False)
+        points = np.column_stack([2.0 * np.cos(angles), np.sin(angles)])
+
+        eps = 1e-6
+        expected = np.zeros_like(points)
+        for i in range(len(points)):
+            for d in range(2):
+                shifted = points.copy()
+                shifted[i, d] += eps
+                expected[i, d] = (polygon_area(shifted) - polygon_area(points)) / eps
+
+        np.testing.assert_allclose(polygon_area_gradient(points), expected, atol=1e-5)
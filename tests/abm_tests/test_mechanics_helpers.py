@@ -1,6 +1,13 @@
 import numpy as np
 
-from src.abm.helpers.mechanics import bilinear_tension, overdamped_step, relax_toward
+from src.abm.helpers.mechanics import (
+    bilinear_tangent,
+    bilinear_tension,
+    implicit_ring_step,
+    overdamped_step,
+    relax_toward,
+    spring_stiffness_blocks,
+)
 from tests.abm_tests.helpers_shared import ABMHelperTestCase
 
 
@@ -35,3 +42,57 @@ class TestMechanicsHelpers(ABMHelperTestCase):
         )
         np.testing.assert_allclose(displacement, [1.2, 1.6])
         self.assertAlmostEqual(np.linalg.norm(displacement), 2.0)
+
+    def test_bilinear_tension_applies_per_spring_regime_to_arrays(self):
+        tension = bilinear_tension(
+            l=np.array([7.0, 3.0]),
+            l0=np.array([5.0, 5.0]),
+            k=3.0,
+            kc_ratio=0.1,
+        )
+        np.testing.assert_allclose(tension, [6.0, -0.6])
+
+    def test_overdamped_step_clamps_each_row_independently(self):
+        displacement = overdamped_step(
+            force=np.array([[6.0, 8.0], [0.3, 0.4]]),
+            gamma=1.0,
+            dt=1.0,
+            max_displacement=2.0,
+        )
+        np.testing.assert_allclose(displacement, [[1.2, 1.6], [0.3, 0.4]])
+
+    def test_bilinear_tangent_switches_stiffness_at_rest_length(self):
+        tangent = bilinear_tangent(l=np.array([7.0, 3.0]), l0=5.0, k=3.0, kc_ratio=0.1)
+        np.testing.assert_allclose(tangent, [3.0, 0.3])
+
+    def test_implicit_ring_step_matches_dense_solve(self):
+        rng = np.random.default_rng(0)
+        n, gamma, dt = 9, 3.0, 0.5
+        unit = rng.normal(size=(n, 2))
+        unit /= np.linalg.norm(unit, axis=1, keepdims=True)
+        K = spring_stiffness_blocks(
+            unit, rng.uniform(1.0, 2.0, n), rng.uniform(-1.0, 2.0, n), rng.uniform(0.1, 1.0, n)
+        )
+        force = rng.normal(size=(n, 2))
+        u, v = rng.normal(size=(n, 2)), rng.normal(size=(n, 2))
+
+        # Dense cyclic ring stiffness: spring i joins node i to node i+1.
+        M = gamma / dt * np.eye(2 * n)
+        for i in range(n):
+            a, b = 2 * i, 2 * ((i + 1) % n)
+            for r, c, sign in ((a, a, 1), (b, b, 1), (a, b, -1), (b, a, -1)):
+                M[r:r + 2, c:c + 2] += sign * K[i]
+
+        expected = np.linalg.solve(M, force.reshape(-1)).reshape(n, 2)
+        np.testing.assert_allclose(implicit_ring_step(force, K, gamma, dt), expected, atol=1e-12)
+
+        M += np.outer(u.reshape(-1), v.reshape(-1))
+        expected = np.linalg.solve(M, force.reshape(-1)).reshape(n, 2)
+        np.testing.assert_allclose(
+            implicit_ring_step(force, K, gamma, dt, rank_one=(u, v)), expected, atol=1e-12
+        )
+
+    def test_implicit_ring_step_reduces_to_euler_without_stiffness(self):
+        force = np.array([[3.0, 0.0], [0.0, -6.0], [1.5, 1.5]])
+        displacement = implicit_ring_step(force, np.zeros((3, 2, 2)), gamma=3.0, dt=0.5)
+        np.testing.assert_allclose(displacement, force * 0.5 / 3.0)
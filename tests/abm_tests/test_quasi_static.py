@@ -0,0 +1,79 @@
+import contextlib
+import io
+
+import numpy as np
+import pandas as pd
+
+from src.abm.ensemble_simulation import EnsembleSimulation
+from src.abm.simulation import Simulation
+from tests.abm_tests.helpers_shared import ABMHelperTestCase
+
+
+class TestQuasiStatic(ABMHelperTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.runner = cls.make_class_runner()
+
+    def qs_cfg(self, **qs):
+        cfg = self.runner.build_cfg("WT", n_steps=20)
+        cfg["simulation"]["quasi_static"].update(enabled=True, **qs)
+        return cfg
+
+    def run_sim(self, cfg):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return Simulation(cfg, self.runner.lut, perturbation="WT").run()
+
+    def test_matches_long_time_stepped_steady_state(self):
+        result = self.run_sim(self.qs_cfg())
+        qs = result["quasi_static"]
+        self.assertTrue(qs["converged"])
+        self.assertLess(qs["evaluations"], 200)
+        self.assertLess(qs["residual"], 1e-8)
+
+        # Reference: 1500 min of semi-implicit stepping, well past the transient.
+        cfg = self.runner.build_cfg("WT", n_steps=300, dt=5.0)
+        cfg["simulation"]["integrator"] = "semi_implicit"
+        reference = self.run_sim(cfg)
+
+        for key in ("ar", "rhoa_mean", "rhoc_mean", "sf_a", "cortex_a_mean"):
+            self.assertAlmostEqual(result["cell_ss"][key], reference["cell_ss"][key], delta=2e-3)
+        np.testing.assert_allclose(
+            result["cell_final"].positions, reference["cell_final"].positions, atol=0.05
+        )
+
+    def test_solved_state_is_the_only_recorded_step(self):
+        result = self.run_sim(self.qs_cfg())
+        self.assertEqual(result["cell_df"]["step"].tolist(), [0])
+        self.assertEqual(result["cell_ss"]["step"], 0)
+        self.assertTrue(result["cell_ss"]["qs_converged"])
+
+        # The recorded row and the snapshot describe the same cell.
+        self.assertEqual(result["cell_df"]["ar"].iloc[0], result["cell_ss"]["ar"])
+
+    def test_falls_back_to_time_stepping(self):
+        result = self.run_sim(self.qs_cfg(max_iter=3))
+        self.assertFalse(result["quasi_static"]["converged"])
+        self.assertEqual(result["quasi_static"]["evaluations"], 3)
+
+        plain = self.runner.build_cfg("WT", n_steps=20)
+        expected = self.run_sim(plain)
+        pd.testing.assert_frame_equal(result["cell_df"], expected["cell_df"])
+        self.assertEqual(result["cell_ss"]["step"], 19)
+
+    def test_ensemble_rejects_quasi_static(self):
+        with self.assertRaises(ValueError):
+            EnsembleSimulation([self.qs_cfg()], self.runner.lut, ["WT"])
+
+    def test_ensemble_result_has_same_keys_as_single_run(self):
+        plain = self.runner.build_cfg("WT", n_steps=5)
+        single = self.run_sim(plain)
+        with contextlib.redirect_stdout(io.StringIO()):
+            batched = EnsembleSimulation([plain], self.runner.lut, ["WT"]).run()[0]
+
+        self.assertEqual(batched.keys(), single.keys())
+        self.assertIsNone(batched["quasi_static"])
+
+
+if __name__ == "__main__":
+    import unittest
+    unittest.main()
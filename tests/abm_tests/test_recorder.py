@@ -0,0 +1,67 @@
+import contextlib
+import io
+
+import numpy as np
+import pandas as pd
+
+from src.abm.analysis.cell_measurement import measure_cell, measure_nodes, measure_springs
+from src.abm.analysis.recorder import CELL_COLUMNS, TimeSeriesRecorder
+from tests.abm_tests.helpers_shared import ABMHelperTestCase
+
+
+class TestTimeSeriesRecorder(ABMHelperTestCase):
+    def setUp(self):
+        cfg = self.make_cfg()
+        cfg["simulation"]["detail_log_interval"] = 4
+        self.runner = self.make_runner(cfg)
+
+    def run_single(self, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return self.runner.run_single("WT", **kwargs)
+
+    def test_rows_match_measurement_records(self):
+        result = self.run_single(n_steps=10)
+        cell = result["cell_final"]
+
+        cell_df = result["cell_df"]
+        self.assertEqual(list(cell_df.columns), ["step", "time", "perturbation", *CELL_COLUMNS])
+        self.assertEqual(cell_df.iloc[-1].to_dict(), result["cell_ss"])
+        self.assertEqual(cell_df.iloc[-1][list(CELL_COLUMNS)].to_dict(), measure_cell(cell))
+
+        last = result["node_df"]["step"] == 9
+        self.assertEqual(result["node_df"][last].to_dict("records"), result["node_ss"])
+        self.assertEqual(result["spring_df"][last].to_dict("records"), result["spring_ss"])
+        self.assertEqual(len(result["node_ss"]), len(measure_nodes(cell)))
+        self.assertEqual(len(result["spring_ss"]), len(measure_springs(cell)))
+
+    def test_logging_intervals(self):
+        result = self.run_single(n_steps=10, cell_log_interval=3)
+
+        self.assertEqual(result["cell_df"]["step"].tolist(), [0, 3, 6, 9])
+        self.assertEqual(sorted(result["node_df"]["step"].unique()), [0, 4, 8, 9])
+        self.assertEqual(result["cell_df"]["cell_id"].dtype, np.int64)
+
+    def test_cell_log_interval_defaults_to_every_step(self):
+        del self.runner.base_cfg["simulation"]["cell_log_interval"]
+        with contextlib.redirect_stdout(io.StringIO()):
+            single = self.runner.run_single("WT", n_steps=5)
+            batched = self.runner.run_batch(["WT"], n_steps=5)[0]
+
+        self.assertEqual(single["cell_df"]["step"].tolist(), [0, 1, 2, 3, 4])
+        self.assertEqual(batched["cell_df"]["step"].tolist(), [0, 1, 2, 3, 4])
+
+    def test_frames_are_views_of_buffers(self):
+        recorder = TimeSeriesRecorder(n_steps=5, n_nodes=3, dt=0.1, perturbation="WT")
+        recorder._cell.data["ar"][:2] = [1.0, 2.0]
+        recorder._cell.n_rows = 2
+
+        cell_df, spring_df, node_df = recorder.frames()
+        self.assertTrue(np.shares_memory(cell_df["ar"].to_numpy(), recorder._cell.data["ar"]))
+        self.assertEqual(len(spring_df), 0)
+        pd.testing.assert_series_equal(
+            cell_df["perturbation"], pd.Series(["WT", "WT"], name="perturbation")
+        )
+
+    def test_rejects_non_positive_interval(self):
+        with self.assertRaises(ValueError):
+            TimeSeriesRecorder(n_steps=5, n_nodes=3, dt=0.1, perturbation="WT", cell_interval=0)
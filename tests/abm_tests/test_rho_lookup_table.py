@@ -0,0 +1,332 @@
+import contextlib
+import copy
+import io
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.abm import lut_cache, lut_shared
+from src.abm.experiments.experiment_runner import ExperimentRunner
+from src.abm.rho_lookup_table import RhoLookupTable
+from src.boolean_model.experiments.lut_runner import run_adaptive_lut_sweep, run_lut_sweep
+from src.utils.config_utils import load_bm_sim_cfg, load_bm_sweep_cfg
+from tests.abm_tests.helpers_shared import (
+    ABMHelperTestCase,
+    synthetic_rho,
+    write_recruitment_csv,
+)
+
+
+class TestRhoLookupTable(ABMHelperTestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.lut_dir = Path(self._tmp.name)
+        write_recruitment_csv(self.lut_dir)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def make_lut(self, cfg=None):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return RhoLookupTable(cfg or self.make_cfg(), self.lut_dir)
+
+    def test_query_matches_grid_values(self):
+        lut = self.make_lut()
+        rhoa, rhoc = lut.query(0.4, 0.6, 0.2)
+        expected = synthetic_rho(0.4, 0.6, 0.2)
+        self.assertAlmostEqual(rhoa, expected[0], places=3)
+        self.assertAlmostEqual(rhoc, expected[1], places=3)
+
+    def test_query_many_matches_single_queries(self):
+        lut = self.make_lut()
+        pts = np.array([[0.1, 0.2, 0.3], [0.55, 0.05, 0.9], [0.0, 1.0, 0.5]])
+        rhoa, rhoc, outside = lut.query_many(pts)
+
+        self.assertEqual(rhoa.shape, (3,))
+        self.assertFalse(outside.any())
+        for i, pt in enumerate(pts):
+            single = lut.query(*pt)
+            self.assertAlmostEqual(rhoa[i], single[0])
+            self.assertAlmostEqual(rhoc[i], single[1])
+
+    def test_query_many_clips_recruitment_into_unit_cube(self):
+        lut = self.make_lut()
+        rhoa, rhoc, outside = lut.query_many([[1.5, -0.2, 0.5]])
+        expected = lut.query(1.0, 0.0, 0.5)
+        self.assertFalse(outside.any())
+        self.assertAlmostEqual(rhoa[0], expected[0])
+        self.assertAlmostEqual(rhoc[0], expected[1])
+
+    def test_complete_grid_uses_regular_backend(self):
+        lut = self.make_lut()
+        self.assertEqual(lut.backend, "regular")
+
+        # Synthetic table is trilinear, so off-grid points are reproduced.
+        pts = np.array([[0.13, 0.77, 0.41], [0.99, 0.01, 0.5]])
+        rhoa, rhoc, outside = lut.query_many(pts)
+        expected = np.array([synthetic_rho(*pt) for pt in pts])
+        self.assertFalse(outside.any())
+        np.testing.assert_allclose(rhoa, expected[:, 0], atol=1e-3)
+        np.testing.assert_allclose(rhoc, expected[:, 1], atol=1e-3)
+
+    def test_incomplete_grid_falls_back_to_scattered_backend(self):
+        path = self.lut_dir / "rho_recruitment.csv"
+        df = pd.read_csv(path)
+        df.drop(index=len(df) // 2).to_csv(path, index=False)
+
+        lut = self.make_lut()
+        self.assertEqual(lut.backend, "scattered")
+        rhoa, _ = lut.query(0.4, 0.6, 0.2)
+        self.assertAlmostEqual(rhoa, synthetic_rho(0.4, 0.6, 0.2)[0], places=3)
+
+    def test_second_construction_loads_memory_mapped_cache(self):
+        first = self.make_lut()
+        second = self.make_lut()
+
+        # Read-only memory map: the table was not rebuilt in memory.
+        self.assertFalse(second.rho_interp.values.flags.writeable)
+        self.assertEqual(second.cache_key, first.cache_key)
+        np.testing.assert_allclose(
+            second.query(0.3, 0.45, 0.8), first.query(0.3, 0.45, 0.8)
+        )
+
+    def test_cache_is_invalidated_when_csv_changes(self):
+        first = self.make_lut()
+        path = self.lut_dir / "rho_recruitment.csv"
+        df = pd.read_csv(path)
+        df["RhoA"] += 0.1
+        df.to_csv(path, index=False)
+
+        second = self.make_lut()
+        self.assertNotEqual(second.cache_key, first.cache_key)
+        self.assertTrue(second.rho_interp.values.flags.writeable)
+        self.assertAlmostEqual(second.query(0.0, 0.0, 0.0)[0], first.query(0.0, 0.0, 0.0)[0] + 0.1)
+
+    def test_scattered_backend_round_trips_through_cache(self):
+        path = self.lut_dir / "rho_recruitment.csv"
+        df = pd.read_csv(path)
+        df.drop(index=len(df) // 2).to_csv(path, index=False)
+
+        first = self.make_lut()
+        second = self.make_lut()
+        self.assertEqual(second.backend, "scattered")
+        self.assertEqual(lut_cache.load_compiled(path, first.cache_key)[0], "scattered")
+        np.testing.assert_allclose(
+            second.query(0.3, 0.45, 0.8), first.query(0.3, 0.45, 0.8)
+        )
+
+    def test_cache_can_be_disabled_in_config(self):
+        cfg = self.make_cfg()
+        cfg["files"]["lut_cache"] = False
+        self.make_lut(cfg)
+        array_path, meta_path = lut_cache.cache_paths(self.lut_dir / "rho_recruitment.csv")
+        self.assertFalse(array_path.exists() or meta_path.exists())
+
+
+def _query_attached(handle, pts):
+    return RhoLookupTable.attach(handle).query_many(pts)[:2]
+
+
+class TestSharedLookupTable(ABMHelperTestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.lut_dir = Path(self._tmp.name)
+        write_recruitment_csv(self.lut_dir)
+        self.pts = np.random.default_rng(0).uniform(0.0, 1.0, size=(200, 3))
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def make_lut(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return RhoLookupTable(self.make_cfg(), self.lut_dir)
+
+    def publish(self, lut):
+        handle = lut.publish(self.lut_dir)
+        self.addCleanup(lut_shared.release, handle)
+        return handle
+
+    def test_attached_table_is_read_only_and_identical(self):
+        lut = self.make_lut()
+        shared = RhoLookupTable.attach(self.publish(lut))
+
+        self.assertEqual(shared.backend, "regular")
+        self.assertFalse(shared.rho_interp.values.flags.writeable)
+        self.assertFalse(shared.rho_interp.values.flags.owndata)
+        for a, b in zip(shared.query_many(self.pts), lut.query_many(self.pts)):
+            np.testing.assert_array_equal(a, b)
+
+    def test_worker_processes_attach(self):
+        lut = self.make_lut()
+        handle = self.publish(lut)
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            results = list(pool.map(_query_attached, [handle] * 2, [self.pts] * 2))
+
+        for rhoa, rhoc in results:
+            np.testing.assert_array_equal(rhoa, lut.query_many(self.pts)[0])
+            np.testing.assert_array_equal(rhoc, lut.query_many(self.pts)[1])
+
+    def test_scattered_backend_attaches(self):
+        path = self.lut_dir / "rho_recruitment.csv"
+        df = pd.read_csv(path)
+        df.drop(index=len(df) // 2).to_csv(path, index=False)
+
+        lut = self.make_lut()
+        shared = RhoLookupTable.attach(self.publish(lut))
+        self.assertEqual(shared.backend, "scattered")
+        np.testing.assert_allclose(shared.query_many(self.pts)[0], lut.query_many(self.pts)[0])
+
+    def test_runs_keep_the_attached_table(self):
+        shared = RhoLookupTable.attach(self.publish(self.make_lut()))
+        with contextlib.redirect_stdout(io.StringIO()):
+            runner = ExperimentRunner(self.make_cfg(), self.lut_dir, lut=shared)
+            result = runner.run_single("WT", n_steps=2)
+
+        # Copies of the cell must not give each run a private table.
+        self.assertIs(result["cell_initial"].lut, shared)
+        self.assertIs(result["cell_final"].lut, shared)
+
+    def test_release_removes_published_table(self):
+        handle = self.make_lut().publish(self.lut_dir)
+        lut_shared.release(handle)
+        self.assertFalse(Path(handle).exists())
+
+
+class SteepSwitchModel:
+    """Stand-in Boolean model with a sharp RhoA switch along DSP."""
+
+    # Model content read by the sweep key (run_cache.model_fingerprint).
+    params = {}
+    istate = {}
+    mutations = {}
+    param = {}
+
+    @staticmethod
+    def rho(pts):
+        pts = np.atleast_2d(pts)
+        rhoa = 0.1 + 0.8 / (1.0 + np.exp(-(pts[:, 0] - 0.45) / 0.03))
+        rhoc = 0.2 + 0.3 * pts[:, 1] * pts[:, 2]
+        return rhoa, rhoc
+
+    def solve_batch(self, combos):
+        pts = np.array([list(c.values()) for c in combos])
+        rhoa, rhoc = self.rho(pts)
+        return pd.DataFrame({"RhoA": rhoa, "RhoC": rhoc})
+
+
+class TestAdaptiveLookupTable(ABMHelperTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._tmp = tempfile.TemporaryDirectory()
+        cls.lut_dir = Path(cls._tmp.name)
+
+        sweep_cfg = copy.deepcopy(load_bm_sweep_cfg())
+        sweep_cfg["lut"]["adaptive"] = {"enabled": True, "tolerance": 0.01, "max_level": 3}
+        with contextlib.redirect_stdout(io.StringIO()):
+            cls.table = run_adaptive_lut_sweep(
+                SteepSwitchModel(), sweep_cfg, load_bm_sim_cfg(), result_dir=cls.lut_dir
+            )
+
+        rng = np.random.default_rng(0)
+        cls.pts = rng.uniform(0.0, 1.0, size=(2000, 3))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._tmp.cleanup()
+
+    def make_lut(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return RhoLookupTable(self.make_cfg(), self.lut_dir)
+
+    def test_refinement_concentrates_on_the_switch(self):
+        refined = self.table[self.table["level"] > 0]
+        self.assertGreater(len(refined), 0)
+        self.assertTrue(refined["p1_value"].between(0.2, 0.8).all())
+        self.assertLess(len(self.table), 41 ** 3)
+
+    def test_adaptive_backend_beats_base_grid(self):
+        lut = self.make_lut()
+        self.assertEqual(lut.backend, "adaptive")
+
+        rhoa, rhoc, outside = lut.query_many(self.pts)
+        exact_a, exact_c = SteepSwitchModel.rho(self.pts)
+        self.assertFalse(outside.any())
+
+        base = self.table[self.table["level"] == 0]
+        path = self.lut_dir / "base" / "rho_recruitment.csv"
+        path.parent.mkdir()
+        base.drop(columns="level").to_csv(path, index=False)
+        with contextlib.redirect_stdout(io.StringIO()):
+            coarse = RhoLookupTable(self.make_cfg(), path.parent)
+        coarse_a, _, _ = coarse.query_many(self.pts)
+
+        self.assertLess(np.abs(rhoa - exact_a).max(), 0.05)
+        self.assertLess(np.abs(rhoa - exact_a).max(), 0.25 * np.abs(coarse_a - exact_a).max())
+        np.testing.assert_allclose(rhoc, exact_c, atol=0.02)
+
+    def test_adaptive_backend_round_trips_through_cache(self):
+        first = self.make_lut()
+        second = self.make_lut()
+        self.assertEqual(second.backend, "adaptive")
+        self.assertFalse(second.rho_interp.leaves.flags.writeable)
+        np.testing.assert_array_equal(
+            second.query_many(self.pts)[0], first.query_many(self.pts)[0]
+        )
+
+    def test_adaptive_backend_attaches_to_published_table(self):
+        lut = self.make_lut()
+        handle = lut.publish(self.lut_dir)
+        try:
+            shared = RhoLookupTable.attach(handle)
+            self.assertFalse(shared.rho_interp.leaf_index.flags.writeable)
+            np.testing.assert_array_equal(shared.query_many(self.pts)[0], lut.query_many(self.pts)[0])
+        finally:
+            lut_shared.release(handle)
+
+
+class TestLutArtifact(ABMHelperTestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.lut_dir = Path(self._tmp.name)
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_lut_sweep(SteepSwitchModel(), load_bm_sweep_cfg(), load_bm_sim_cfg(),
+                          result_dir=self.lut_dir)
+        self.pts = np.random.default_rng(2).uniform(0.0, 1.0, size=(500, 3))
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def make_lut(self, **files):
+        cfg = self.make_cfg()
+        cfg["files"].update(files)
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            lut = RhoLookupTable(cfg, self.lut_dir)
+        return lut, out.getvalue()
+
+    def test_artifact_matches_table_built_from_csv(self):
+        lut, log = self.make_lut()
+        from_csv, _ = self.make_lut(lut_artifact=False, lut_cache=False)
+
+        self.assertIn("Loaded LUT artifact", log)
+        self.assertEqual(lut.backend, "regular")
+        self.assertEqual(lut.rho_interp.values.shape, (6, 6, 6, 2))
+        np.testing.assert_array_equal(lut.query_many(self.pts)[0], from_csv.query_many(self.pts)[0])
+
+    def test_artifact_alone_is_enough(self):
+        (self.lut_dir / "rho_recruitment.csv").unlink()
+        lut, log = self.make_lut()
+        self.assertIn("Loaded LUT artifact", log)
+
+    def test_stale_artifact_is_ignored(self):
+        path = self.lut_dir / "rho_recruitment.csv"
+        df = pd.read_csv(path)
+        df["RhoA"] += 0.1
+        df.to_csv(path, index=False)
+
+        lut, log = self.make_lut()
+        self.assertNotIn("Loaded LUT artifact", log)
+        self.assertAlmostEqual(lut.query(0.0, 0.0, 0.0)[0],
+                               round(SteepSwitchModel.rho([0.0, 0.0, 0.0])[0][0] + 0.1, 3))
@@ -0,0 +1,71 @@
+import contextlib
+import io
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from src.abm.experiments.experiment_runner import ExperimentRunner
+from src.abm.rho_lookup_table import RECRUITMENT_PARAMS
+from src.abm.rho_on_demand import OnDemandRhoTable, build_rho_table
+from tests.abm_tests.helpers_shared import ABMHelperTestCase
+
+
+class TestOnDemandRhoTable(ABMHelperTestCase):
+    def make_table(self, **backend):
+        cfg = self.make_cfg()
+        cfg["rho_backend"].update(type="on_demand", **backend)
+        with contextlib.redirect_stdout(io.StringIO()):
+            return build_rho_table(cfg, Path("unused"))
+
+    def test_matches_exact_steady_state_at_snapped_points(self):
+        table = self.make_table(quantum=0.01)
+        self.assertIsInstance(table, OnDemandRhoTable)
+
+        pts = np.array([[0.123, 0.456, 0.789], [0.5, 0.5, 0.5], [1.0, 0.0, 0.3]])
+        rhoa, rhoc, outside = table.query_many(pts)
+
+        snapped = np.round(pts, 2)
+        exact = table.model.solve_batch([dict(zip(RECRUITMENT_PARAMS, p)) for p in snapped])
+        self.assertFalse(outside.any())
+        np.testing.assert_allclose(rhoa, exact["RhoA"], atol=1e-12)
+        np.testing.assert_allclose(rhoc, exact["RhoC"], atol=1e-12)
+
+    def test_repeat_points_are_memoized(self):
+        table = self.make_table()
+        pts = np.round(np.random.default_rng(0).uniform(0.0, 1.0, size=(20, 3)), 3)
+        first = table.query_many(np.vstack([pts, pts]))
+        misses = table.cache_info()["misses"]
+
+        second = table.query_many(pts + 2e-4)   # same quantum cells
+        self.assertEqual(misses, 21)   # 20 points + rest state at construction
+        self.assertEqual(table.cache_info()["misses"], misses)
+        np.testing.assert_array_equal(second[0], first[0][:20])
+
+    def test_cache_is_bounded(self):
+        table = self.make_table(cache_size=8)
+        table.query_many(np.random.default_rng(1).uniform(0.0, 1.0, size=(30, 3)))
+        self.assertEqual(table.cache_info()["size"], 8)
+
+    def test_queries_outside_unit_cube_are_clipped(self):
+        table = self.make_table()
+        np.testing.assert_allclose(table.query(1.4, -0.2, 0.5), table.query(1.0, 0.0, 0.5))
+
+    def test_boolean_parameter_overrides(self):
+        base = self.make_table()
+        faster_decay = self.make_table(params={"$RhoA_decay": 1.0})
+        self.assertLess(faster_decay.query(0.5, 0.5, 0.5)[0], base.query(0.5, 0.5, 0.5)[0])
+
+    def test_runner_runs_without_a_recruitment_table(self):
+        cfg = self.make_cfg()
+        cfg["rho_backend"]["type"] = "on_demand"
+        cfg["simulation"]["n_steps"] = 3
+        with tempfile.TemporaryDirectory() as empty_dir, contextlib.redirect_stdout(io.StringIO()):
+            result = ExperimentRunner(cfg, Path(empty_dir)).run_single(perturbation="WT")
+
+        self.assertTrue(np.isfinite(result["cell_ss"]["rhoa_mean"]))
+
+
+if __name__ == "__main__":
+    import unittest
+    unittest.main()
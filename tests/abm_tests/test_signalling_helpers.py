@@ -1,3 +1,5 @@
+import numpy as np
+
 from src.abm.helpers.signalling import get_protein_recruitment, hill
 from tests.abm_tests.helpers_shared import ABMHelperTestCase
 
@@ -19,3 +21,9 @@ class TestSignallingHelpers(ABMHelperTestCase):
         cfg = self.make_cfg()
         cfg["hill_params"]["DSP"]["knocked_out"] = True
         self.assertEqual(get_protein_recruitment(cfg, tau=10.0, protein="DSP"), 0.0)
+
+    def test_hill_evaluates_array_of_stimuli_elementwise(self):
+        np.testing.assert_allclose(
+            hill(np.array([-1.0, 0.0, 5.0]), K=5.0, n=1.0),
+            [0.0, 0.0, 0.5],
+        )
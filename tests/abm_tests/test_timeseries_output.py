@@ -0,0 +1,104 @@
+import contextlib
+import importlib.util
+import io
+import unittest
+
+import pandas as pd
+
+from src.abm.analysis.recorder import TimeSeriesRecorder
+from src.utils.file_utils import (
+    ParquetDatasetWriter, apply_filters, load_csv_to_df, load_parquet_to_df
+)
+from tests.abm_tests.helpers_shared import ABMHelperTestCase
+
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+
+class TestTimeSeriesOutput(ABMHelperTestCase):
+    def setUp(self):
+        cfg = self.make_cfg()
+        cfg["perturbations"] = {k: cfg["perturbations"][k] for k in list(cfg["perturbations"])[:2]}
+        self.runner = self.make_runner(cfg)
+        self.tmp = self.runner.lut_dir
+
+    def run_all(self, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return self.runner.run_all(n_steps=12, detail_log_interval=5, **kwargs)
+
+    def test_csv_loader_projection_and_filters(self):
+        out = self.run_all(result_dir=self.tmp / "csv")
+        label = out["cell_ss_df"]["perturbation"].iloc[0]
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            df = load_csv_to_df(
+                self.tmp / "csv", "abm_cell_timeseries",
+                columns=["step", "ar"],
+                filters=[("perturbation", "==", label), ("step", ">=", 6)],
+            )
+
+        self.assertEqual(list(df.columns), ["step", "ar"])
+        self.assertEqual(df["step"].tolist(), list(range(6, 12)))
+
+    def test_unknown_filter_operator_is_rejected(self):
+        with self.assertRaises(ValueError):
+            apply_filters(pd.DataFrame({"a": [1]}), [("a", "~", 1)])
+
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow not installed")
+    def test_parquet_stream_matches_in_memory_results(self):
+        in_memory = self.run_all(save_detail=True)
+        streamed = self.run_all(result_dir=self.tmp / "pq", save_detail=True, output_format="parquet")
+        self.assertIsNone(streamed["cell_ts_df"])
+
+        for level in ("cell", "spring", "node"):
+            with contextlib.redirect_stdout(io.StringIO()):
+                df = load_parquet_to_df(self.tmp / "pq", f"abm_{level}_timeseries")
+            expected = in_memory[f"{level}_ts_df"]
+            df = df[expected.columns].sort_values(["perturbation", "step"], kind="stable")
+            pd.testing.assert_frame_equal(
+                df.reset_index(drop=True),
+                expected.sort_values(["perturbation", "step"], kind="stable").reset_index(drop=True),
+            )
+
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow not installed")
+    def test_parquet_loader_projection_and_partition_filter(self):
+        self.run_all(result_dir=self.tmp / "pq", output_format="parquet")
+        labels = list(self.runner.base_cfg["perturbations"])
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            df = load_parquet_to_df(
+                self.tmp / "pq", "abm_cell_timeseries",
+                columns=["perturbation", "step", "rho_balance"],
+                filters=[("perturbation", "==", labels[1]), ("step", "<", 4)],
+            )
+
+        self.assertEqual(list(df.columns), ["perturbation", "step", "rho_balance"])
+        self.assertEqual(set(df["perturbation"]), {labels[1]})
+        self.assertEqual(sorted(df["step"]), [0, 1, 2, 3])
+
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow not installed")
+    def test_recorder_flushes_full_chunks_as_row_groups(self):
+        import pyarrow.parquet as pq
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            cell = self.runner.run_single("WT", n_steps=2)["cell_final"]
+            writer = ParquetDatasetWriter(self.tmp, "chunked")
+            recorder = TimeSeriesRecorder(
+                n_steps=7, n_nodes=cell.n_nodes, dt=0.1, perturbation="WT",
+                writers={"cell": writer}, chunk_rows=3,
+            )
+            for step in range(7):
+                recorder.record(cell, step)
+                if step == 3:
+                    self.assertEqual(writer.n_rows, 3)   # first chunk already on disk
+            cell_df, _, node_df = recorder.frames()
+            writer.close()
+
+        self.assertIsNone(cell_df)
+        self.assertEqual(len(node_df), 2 * cell.n_nodes)   # steps 0 and 6
+        part = pq.ParquetFile(self.tmp / "chunked" / "perturbation=WT" / "part-0.parquet")
+        self.assertEqual(part.metadata.num_rows, 7)
+        self.assertEqual(part.metadata.num_row_groups, 3)
+
+    def test_parquet_output_needs_result_dir(self):
+        with self.assertRaises(ValueError):
+            self.run_all(output_format="parquet")
@@ -0,0 +1,111 @@
+import contextlib
+import copy
+import io
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.boolean_model.experiments.orchestrator import run_jobs
+from src.boolean_model.runtime.adaptive_sampling import build_sampling_cfg, run_adaptive
+from src.utils.config_utils import load_bm_sim_cfg
+
+
+class FakeSampledModel:
+    """Stand-in for MaBoSS: node probabilities estimated from sample_count draws."""
+
+    def __init__(self, p_rhoa, p_rhoc):
+        self.p = {"RhoA": p_rhoa, "RhoC": p_rhoc}
+        self.params = {}
+        self.param = {"sample_count": 5000}
+        self.runs = []
+
+    def copy(self):
+        clone = copy.copy(self)
+        clone.param = dict(self.param)
+        clone.runs = []
+        return clone
+
+    def update_parameters(self, **params):
+        self.p.update({k.strip("$"): v for k, v in params.items()})
+
+    def run(self):
+        n = self.param["sample_count"]
+        self.runs.append(n)
+        rng = np.random.default_rng(self.param["seed_pseudorandom"])
+        self.last = {node: rng.binomial(n, p) / n for node, p in self.p.items()}
+        return self
+
+    def get_last_nodes_probtraj(self):
+        return pd.DataFrame([self.last], index=pd.Index([10.0], name="t"))
+
+
+SAMPLING = {"nodes": ["RhoA", "RhoC"], "tolerance": 0.02, "min_samples": 100,
+            "max_samples": 6400, "z": 1.96}
+
+
+class TestAdaptiveSampling(unittest.TestCase):
+    def test_samples_double_until_within_tolerance(self):
+        model = FakeSampledModel(0.5, 0.5)
+        df = run_adaptive(model, SAMPLING)
+
+        # Batches double the running total: 100, 100, 200, 400, ...
+        self.assertEqual(model.runs[:3], [100, 100, 200])
+        self.assertEqual(df["sample_count"].iloc[0], sum(model.runs))
+        self.assertTrue((df[["RhoA_err", "RhoC_err"]] <= SAMPLING["tolerance"]).all(axis=None))
+        self.assertAlmostEqual(df["RhoA"].iloc[0], 0.5, delta=0.03)
+
+    def test_near_deterministic_point_stops_early(self):
+        easy = run_adaptive(FakeSampledModel(0.002, 0.998), SAMPLING)
+        hard = run_adaptive(FakeSampledModel(0.5, 0.4), SAMPLING)
+        self.assertLess(easy["sample_count"].iloc[0], hard["sample_count"].iloc[0])
+
+    def test_sample_count_is_capped(self):
+        capped = dict(SAMPLING, tolerance=1e-4)
+        model = FakeSampledModel(0.5, 0.5)
+        df = run_adaptive(model, capped)
+
+        self.assertEqual(df["sample_count"].iloc[0], capped["max_samples"])
+        self.assertGreater(df["RhoA_err"].iloc[0], capped["tolerance"])
+
+    def test_batches_with_different_columns_are_pooled_by_name(self):
+        class SparseModel(FakeSampledModel):
+            """Column set and order change between batches, as MaBoSS output can."""
+
+            def get_last_nodes_probtraj(self):
+                df = super().get_last_nodes_probtraj()
+                if len(self.runs) % 2:
+                    return df[["RhoC", "RhoA"]]
+                return df.drop(columns="RhoC")
+
+        model = SparseModel(0.5, 0.004)
+        df = run_adaptive(model, SAMPLING)
+
+        self.assertGreater(len(model.runs), 1)
+        self.assertAlmostEqual(df["RhoA"].iloc[0], 0.5, delta=0.03)
+        self.assertLess(df["RhoC"].iloc[0], 0.02)
+
+    def test_node_never_active_counts_as_zero(self):
+        class NeverRhoC(FakeSampledModel):
+            def get_last_nodes_probtraj(self):
+                return super().get_last_nodes_probtraj().drop(columns="RhoC")
+
+        df = run_adaptive(NeverRhoC(0.5, 0.0), SAMPLING)
+        self.assertEqual(df["RhoC"].iloc[0], 0.0)
+        self.assertEqual(df["RhoC_err"].iloc[0], 0.0)
+
+    def test_jobs_carry_error_columns(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            rows = run_jobs([(FakeSampledModel(0.3, 0.6), {})], n_cores=1, sampling=SAMPLING)
+        self.assertTrue({"RhoA_err", "RhoC_err", "sample_count"} <= set(rows[0].columns))
+
+    def test_config(self):
+        sim_cfg = copy.deepcopy(load_bm_sim_cfg())
+        self.assertIsNone(build_sampling_cfg(sim_cfg))
+
+        sim_cfg["simulation"]["adaptive_sampling"]["enabled"] = True
+        self.assertEqual(build_sampling_cfg(sim_cfg)["nodes"], ["RhoA", "RhoC"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,173 @@
+import contextlib
+import copy
+import io
+import unittest
+
+import numpy as np
+import pandas as pd
+from scipy.linalg import expm
+
+from src.boolean_model.analysis.phenotypes import classify_phenotype
+from src.boolean_model.experiments.lut_runner import run_lut_sweep
+from src.boolean_model.experiments.maboss_runner import run_maboss_sim
+from src.boolean_model.experiments.parameter_sweep import run_combos, run_sweeps
+from src.boolean_model.runtime.ctmc import compile_expression
+from src.boolean_model.runtime.model_loader import generate_ko_model, load_base_model
+from src.utils.config_utils import load_bm_sim_cfg, load_bm_sweep_cfg
+
+
+def load_ctmc_model():
+    sim_cfg = copy.deepcopy(load_bm_sim_cfg())
+    sim_cfg["simulation"]["engine"] = "ctmc"
+    return load_base_model(sim_cfg)
+
+
+class TestExpressions(unittest.TestCase):
+    def test_ternary_and_logic(self):
+        expr = compile_expression("(A & B) ? $hi : (A ? $mid : $lo)")
+        nodes = {"A": np.array([0, 1, 1], bool), "B": np.array([1, 0, 1], bool)}
+        params = {"$hi": 10.0, "$mid": 2.0, "$lo": 0.5}
+        np.testing.assert_array_equal(expr(nodes, params), [0.5, 2.0, 10.0])
+
+    def test_operators_and_keywords(self):
+        nodes = {"A": np.array([0, 1], bool), "B": np.array([1, 1], bool)}
+        np.testing.assert_array_equal(compile_expression("!A | NOT B")(nodes, {}), [True, False])
+        np.testing.assert_array_equal(compile_expression("A ^ B")(nodes, {}), [True, False])
+        self.assertEqual(compile_expression("2 * $k + 1")({}, {"$k": 3.0}), 7.0)
+
+    def test_malformed_expression_is_rejected(self):
+        with self.assertRaises(ValueError):
+            compile_expression("A ? 1.0")
+
+
+class TestBooleanCTMC(unittest.TestCase):
+    def setUp(self):
+        self.model = load_ctmc_model()
+
+    def test_parses_rho_model(self):
+        self.assertEqual(self.model.node_names, ["DSP", "TJP1", "JCAD", "RhoA", "RhoC"])
+        self.assertEqual(self.model.params["$RhoA_amp"], 10.0)
+        self.assertEqual(self.model.istate["DSP"], 1.0)
+        self.assertEqual(self.model.param["max_time"], 10.0)
+
+    def test_generator_is_valid(self):
+        Q = self.model.generator()
+        self.assertEqual(Q.shape, (32, 32))
+        np.testing.assert_allclose(Q.sum(axis=1), 0.0, atol=1e-12)
+        self.assertTrue(np.all(Q - np.diag(np.diag(Q)) >= 0))
+
+    def test_input_nodes_follow_two_state_balance(self):
+        self.model.update_parameters(**{"$DSP_recruitment": 0.3, "$DSP_decruitment": 0.9})
+        probs = self.model.stationary_node_probabilities()
+        self.assertAlmostEqual(probs["DSP"], 0.3 / 1.2)
+        self.assertAlmostEqual(probs["TJP1"], 1.0 / 1.5)
+
+    def test_stationary_matches_long_time_transient(self):
+        Q = self.model.generator()
+        p_long = self.model.initial_distribution() @ expm(Q * 200.0)
+        np.testing.assert_allclose(
+            self.model.stationary_state_probabilities(), p_long, atol=1e-10
+        )
+
+    def test_knockout_clamps_node(self):
+        ko = generate_ko_model(self.model, {"DSP": "OFF"})
+        df = ko.run().get_last_nodes_probtraj()
+        self.assertEqual(df["DSP"].iloc[0], 0.0)
+        self.assertLess(df["RhoA"].iloc[0], self.model.stationary_node_probabilities()["RhoA"])
+        self.assertNotIn("DSP", self.model.mutations)   # base model untouched
+
+    def test_frozen_node_keeps_initial_state(self):
+        self.model.update_parameters(**{"$JCAD_recruitment": 0.0, "$JCAD_decruitment": 0.0})
+        self.assertAlmostEqual(self.model.stationary_node_probabilities()["JCAD"], 1.0)
+
+        self.model.istate["JCAD"] = 0.25
+        self.assertAlmostEqual(self.model.stationary_node_probabilities()["JCAD"], 0.25)
+
+    def test_unknown_parameter_is_rejected(self):
+        with self.assertRaises(KeyError):
+            self.model.update_parameters(**{"$Nope": 1.0})
+
+
+class TestCTMCLutSweep(unittest.TestCase):
+    def test_lut_sweep_runs_on_ctmc_engine(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            lut_df = run_lut_sweep(load_ctmc_model(), load_bm_sweep_cfg(), load_bm_sim_cfg())
+
+        self.assertEqual(len(lut_df), 6 ** 3)
+        self.assertTrue({"RhoA", "RhoC", "p1_name", "p3_value"} <= set(lut_df.columns))
+        self.assertTrue(lut_df[["RhoA", "RhoC"]].stack().between(0, 1).all())
+
+
+class TestBatchedSweeps(unittest.TestCase):
+    def setUp(self):
+        self.model = load_ctmc_model()
+        values = np.arange(0.0, 1.1, 0.25)
+        self.combos = [
+            {"$RhoA_basal": a, "$RhoC_decay": b} for a in values for b in values
+        ]
+
+    def solve_one(self, combo):
+        model = self.model.copy()
+        model.update_parameters(**combo)
+        return model.run().get_last_nodes_probtraj()
+
+    def test_batch_matches_one_solve_per_combo(self):
+        batch = run_combos(self.model, self.combos)
+        single = pd.concat([self.solve_one(c) for c in self.combos], ignore_index=True)
+        pd.testing.assert_frame_equal(batch, single, check_exact=False, atol=1e-12)
+
+    def test_batch_handles_frozen_nodes(self):
+        combos = [{"$JCAD_recruitment": 0.0, "$JCAD_decruitment": d} for d in (0.0, 0.5)]
+        batch = self.model.solve_batch(combos)
+        self.assertAlmostEqual(batch["JCAD"].iloc[0], 1.0)   # frozen at istate
+        self.assertAlmostEqual(batch["JCAD"].iloc[1], 0.0)
+
+    def test_2d_sweep_long_format(self):
+        sweep_cfg, sim_cfg = load_bm_sweep_cfg(), load_bm_sim_cfg()
+        with contextlib.redirect_stdout(io.StringIO()):
+            df = run_sweeps(self.model, sweep_cfg, sim_cfg,
+                            target_sweeps=["basal_activity_robustness"])
+
+        n_values = len(np.arange(0.0, 1.5, 0.4))
+        self.assertEqual(len(df), n_values ** 2)
+        self.assertEqual(
+            list(df.columns[5:]),
+            ["p1_name", "p1_value", "p2_name", "p2_value", "perturbation",
+             "exp_name", "type", "delta", "phenotype"],
+        )
+        self.assertEqual(set(df["p2_name"]), {"$RhoC_basal"})
+
+
+class TestTransient(unittest.TestCase):
+    def setUp(self):
+        self.model = load_ctmc_model()
+
+    def test_probtraj_matches_matrix_exponential(self):
+        df = self.model.run().get_nodes_probtraj()
+        self.assertEqual(len(df), 100)                 # max_time 10, tick 0.1
+        self.assertAlmostEqual(df.index[-1], 9.9)
+
+        t = df.index[37]
+        expected = self.model.initial_distribution() @ expm(self.model.generator() * t)
+        np.testing.assert_allclose(df.iloc[37].to_numpy(), expected @ self.model.states, atol=1e-12)
+        self.assertEqual(df.iloc[0].to_dict(), self.model.istate)
+
+    def test_arbitrary_times(self):
+        times = [0.0, 0.05, 0.3, 0.31, 50.0]
+        df = self.model.run().get_nodes_probtraj(times=times)
+        self.assertEqual(df.index.tolist(), times)
+        stationary = self.model.stationary_node_probabilities()
+        self.assertAlmostEqual(df["RhoA"].iloc[-1], stationary["RhoA"], places=10)
+
+    def test_run_maboss_sim_on_ctmc_engine(self):
+        sim_cfg = load_bm_sim_cfg()
+        with contextlib.redirect_stdout(io.StringIO()):
+            full_df, ss_df = run_maboss_sim(self.model, sim_cfg)
+
+        self.assertEqual(len(full_df), 100 * len(sim_cfg["perturbations"]))
+        self.assertEqual(sorted(ss_df["perturbation"]), sorted(sim_cfg["perturbations"]))
+        ko = full_df[full_df["perturbation"] == "DSP_KO"]
+        self.assertTrue((ko["DSP"] == 0.0).all())
+
+        expected = full_df["delta"].apply(lambda d: classify_phenotype(d, sim_cfg))
+        self.assertEqual(full_df["phenotype"].tolist(), expected.tolist())
@@ -0,0 +1,114 @@
+import contextlib
+import io
+import os
+import pickle
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from src.boolean_model.experiments import lut_runner
+from src.boolean_model.experiments.lut_runner import SHARD_DIR, _run_limits, run_lut_sweep
+from src.utils.config_utils import load_bm_sim_cfg, load_bm_sweep_cfg
+from src.utils.file_utils import file_sha256
+from tests.bm_tests.test_ctmc import load_ctmc_model
+
+
+def quiet_sweep(model, result_dir=None, **kw):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return run_lut_sweep(model, load_bm_sweep_cfg(), load_bm_sim_cfg(), result_dir=result_dir, **kw)
+
+
+class TestShardedLutSweep(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.model = load_ctmc_model()
+        cls.reference = quiet_sweep(cls.model, shard_size=10_000)
+
+    def test_model_survives_pickling(self):
+        clone = pickle.loads(pickle.dumps(self.model))
+        np.testing.assert_array_equal(clone.generator(), self.model.generator())
+
+    def test_shards_merge_to_unsharded_table(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            lut_df = quiet_sweep(self.model, tmp, shard_size=50)
+
+            shards = sorted((Path(tmp) / SHARD_DIR).glob("shard_*.csv"))
+            self.assertEqual(len(shards), 5)   # 216 combos
+            on_disk = pd.read_csv(Path(tmp) / "rho_recruitment.csv")
+
+        pd.testing.assert_frame_equal(lut_df, self.reference)
+        pd.testing.assert_frame_equal(on_disk, self.reference, check_exact=False)
+
+    def test_rerun_skips_completed_shards(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            quiet_sweep(self.model, tmp, shard_size=50)
+            csv_path = Path(tmp) / "rho_recruitment.csv"
+            uninterrupted = file_sha256(csv_path)
+            shard = Path(tmp) / SHARD_DIR / "shard_00001.csv"
+            os.remove(Path(tmp) / SHARD_DIR / "shard_00003.csv")
+            mtime = shard.stat().st_mtime_ns
+
+            lut_df = quiet_sweep(self.model, tmp, shard_size=50)
+
+            self.assertEqual(shard.stat().st_mtime_ns, mtime)
+            self.assertTrue((Path(tmp) / SHARD_DIR / "shard_00003.csv").exists())
+            self.assertEqual(file_sha256(csv_path), uninterrupted)
+        pd.testing.assert_frame_equal(lut_df, self.reference, check_exact=True)
+
+    def test_changed_sweep_discards_stale_shards(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            quiet_sweep(self.model, tmp, shard_size=50)
+            model = self.model.copy()
+            model.update_parameters(**{"$RhoA_decay": 0.4})
+            lut_df = quiet_sweep(model, tmp, shard_size=50)
+
+        self.assertFalse(np.allclose(lut_df["RhoA"], self.reference["RhoA"]))
+
+    def test_changed_logic_discards_stale_shards(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            quiet_sweep(self.model, tmp, shard_size=50)
+            shard = Path(tmp) / SHARD_DIR / "shard_00000.csv"
+            mtime = shard.stat().st_mtime_ns
+
+            # Same parameters and settings, different rule for RhoA.
+            model = self.model.copy()
+            rate_up, rate_down = model._expressions["RhoA"]
+            model._expressions["RhoA"] = (f"0.5 * ({rate_up})", rate_down)
+            model._compile()
+            lut_df = quiet_sweep(model, tmp, shard_size=50)
+
+            self.assertNotEqual(shard.stat().st_mtime_ns, mtime)
+        self.assertFalse(np.allclose(lut_df["RhoA"], self.reference["RhoA"]))
+
+    def test_parallel_workers_match_serial(self):
+        lut_df = quiet_sweep(self.model, n_workers=2, shard_size=60)
+        pd.testing.assert_frame_equal(lut_df, self.reference)
+
+    def test_sweep_honours_max_concurrent_runs(self):
+        sim_cfg = load_bm_sim_cfg()
+        sim_cfg["simulation"]["max_concurrent_runs"] = 3
+        with mock.patch.object(lut_runner, "run_combos", wraps=lut_runner.run_combos) as spy, \
+                contextlib.redirect_stdout(io.StringIO()):
+            run_lut_sweep(self.model, load_bm_sweep_cfg(), sim_cfg, shard_size=100)
+
+        self.assertEqual(spy.call_count, 3)
+        self.assertTrue(all(call.kwargs["max_runs"] == 3 for call in spy.call_args_list))
+
+
+class TestRunLimits(unittest.TestCase):
+    def test_serial_sweep_keeps_the_cap(self):
+        self.assertEqual(_run_limits(None, 1, n_cores=16), (None, 16))
+        self.assertEqual(_run_limits(6, 1, n_cores=16), (6, 16))
+
+    def test_workers_split_the_budget(self):
+        self.assertEqual(_run_limits(None, 4, n_cores=16), (4, 4))
+        self.assertEqual(_run_limits(6, 4, n_cores=16), (1, 4))
+        self.assertEqual(_run_limits(None, 32, n_cores=16), (1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import contextlib
+import copy
+import io
+import threading
+import time
+import unittest
+
+import pandas as pd
+
+from src.boolean_model.experiments.orchestrator import plan_concurrency, run_jobs
+from src.boolean_model.experiments.parameter_sweep import run_perturbation_grid
+
+
+class FakeProcessModel:
+    """Stand-in for a MaBoSS model: run() blocks like a subprocess wait."""
+
+    def __init__(self):
+        self.param = {}
+        self.params = {"$k": 0.0}
+        self.mutations = {}
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.peak = 0
+
+    def copy(self):
+        clone = copy.copy(self)
+        clone.param = dict(self.param)
+        clone.params = dict(self.params)
+        clone.mutations = dict(self.mutations)
+        clone.parent = getattr(self, "parent", self)
+        return clone
+
+    def update_parameters(self, **params):
+        for key, value in params.items():
+            if key not in self.params:
+                raise KeyError(key)
+            self.params[key] = value
+
+    def mutate(self, node, state):
+        self.mutations[node] = state
+
+    def run(self):
+        parent = self.parent
+        with parent.lock:
+            parent.in_flight += 1
+            parent.peak = max(parent.peak, parent.in_flight)
+        time.sleep(0.02 * (1 + self.params["$k"] % 3))
+        with parent.lock:
+            parent.in_flight -= 1
+        return self
+
+    def get_last_nodes_probtraj(self):
+        return pd.DataFrame({
+            "k": [self.params["$k"]],
+            "ko": [",".join(self.mutations)],
+            "threads": [self.param["thread_count"]],
+        })
+
+
+def run_quiet(fn, *args, **kw):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kw)
+
+
+class TestPlanConcurrency(unittest.TestCase):
+    def test_cores_split_between_runs_and_threads(self):
+        self.assertEqual(plan_concurrency(300, n_cores=16), (16, 1))
+        self.assertEqual(plan_concurrency(6, n_cores=16), (6, 2))
+        self.assertEqual(plan_concurrency(1, n_cores=8), (1, 8))
+        self.assertEqual(plan_concurrency(100, n_cores=16, max_runs=4), (4, 4))
+
+
+class TestRunJobs(unittest.TestCase):
+    def setUp(self):
+        self.model = FakeProcessModel()
+        self.combos = [{"$k": float(k)} for k in range(12)]
+
+    def test_results_in_job_order_with_bounded_overlap(self):
+        rows = run_quiet(run_jobs, [(self.model, c) for c in self.combos], n_cores=8, max_runs=4)
+
+        self.assertEqual([r["k"].iloc[0] for r in rows], [c["$k"] for c in self.combos])
+        self.assertTrue(all(r["threads"].iloc[0] == 2 for r in rows))
+        self.assertGreater(self.model.peak, 1)
+        self.assertLessEqual(self.model.peak, 4)
+
+    def test_failure_is_raised(self):
+        combos = self.combos + [{"$missing": 1.0}]
+        with self.assertRaises(KeyError):
+            run_quiet(run_jobs, [(self.model, c) for c in combos], n_cores=4)
+
+    def test_perturbation_grid_reassembles_in_spec_order(self):
+        perb_config = {"WT": {}, "A_KO": {"A": "OFF"}, "B_KO": {"B": "OFF"}}
+        frames = run_quiet(
+            run_perturbation_grid, self.model, list(perb_config), perb_config, self.combos, max_runs=5
+        )
+
+        self.assertEqual([f["ko"].iloc[0] for f in frames], ["", "A", "B"])
+        for f in frames:
+            self.assertEqual(f["k"].tolist(), [c["$k"] for c in self.combos])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import contextlib
+import io
+import tempfile
+import unittest
+
+import pandas as pd
+
+from src.boolean_model.experiments.orchestrator import run_jobs
+from src.boolean_model.runtime.model_loader import generate_ko_model
+from src.boolean_model.runtime.run_cache import RunCache, build_run_cache
+from tests.bm_tests.test_ctmc import load_ctmc_model
+
+
+class TestRunCacheKeys(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = RunCache(self.tmp.name)
+        self.model = load_ctmc_model()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_key_tracks_resolved_model(self):
+        base = self.cache.key(self.model, "ss")
+        self.assertEqual(self.cache.key(self.model.copy(), "ss"), base)
+        self.assertNotEqual(self.cache.key(self.model, "probtraj"), base)
+
+        changed = []
+        m = self.model.copy()
+        m.update_parameters(**{"$RhoA_amp": 5.0})
+        changed.append(m)
+        changed.append(generate_ko_model(self.model, {"DSP": "OFF"}))
+        for setting in ("max_time", "sample_count"):
+            m = self.model.copy()
+            m.param[setting] = 2 * m.param[setting]
+            changed.append(m)
+        for m in changed:
+            self.assertNotEqual(self.cache.key(m, "ss"), base)
+
+    def test_thread_count_does_not_change_key(self):
+        m = self.model.copy()
+        m.param["thread_count"] = 8
+        self.assertEqual(self.cache.key(m, "ss"), self.cache.key(self.model, "ss"))
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(build_run_cache({"simulation": {}}))
+
+
+class TestRunCacheStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.model = load_ctmc_model()
+        self.combos = [{"$RhoA_basal": v} for v in (0.1, 0.2, 0.3)]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_cached(self, cache):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return run_jobs([(self.model, c) for c in self.combos], n_cores=2, cache=cache)
+
+    def test_repeat_jobs_are_served_from_disk(self):
+        first = self.run_cached(RunCache(self.tmp.name))
+
+        cache = RunCache(self.tmp.name)   # new session, same directory
+        second = self.run_cached(cache)
+
+        self.assertEqual(cache.stats()["hits"], 3)
+        self.assertEqual(cache.stats()["misses"], 0)
+        for a, b in zip(first, second):
+            pd.testing.assert_frame_equal(a, b)
+
+    def test_least_recently_used_entries_are_evicted(self):
+        df = self.model.run().get_last_nodes_probtraj()
+        cache = RunCache(self.tmp.name)
+        cache.put("a", df)
+        cache.max_bytes = 2.5 * cache.stats()["bytes"]
+        cache.put("b", df)
+        cache.get("a")
+        cache.put("c", df)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
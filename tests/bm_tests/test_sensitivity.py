@@ -0,0 +1,71 @@
+import contextlib
+import io
+import unittest
+
+import numpy as np
+
+from src.boolean_model.analysis.sensitivity import (
+    continuation_1d, evaluate_curve, sensitivity_table, stationary_sensitivities
+)
+from src.boolean_model.experiments.parameter_sweep import run_sweeps
+from src.utils.config_utils import load_bm_sim_cfg, load_bm_sweep_cfg
+from tests.bm_tests.test_ctmc import load_ctmc_model
+
+
+class TestStationarySensitivities(unittest.TestCase):
+    def setUp(self):
+        self.model = load_ctmc_model()
+
+    def test_matches_central_differences(self):
+        _, sens = stationary_sensitivities(self.model)
+
+        h = 1e-6
+        for key in ("$RhoA_amp", "$DSP_recruitment", "$RhoC_antagonistic"):
+            probs = []
+            for sign in (1, -1):
+                m = self.model.copy()
+                m.update_parameters(**{key: self.model.params[key] + sign * h})
+                probs.append(np.array(list(m.stationary_node_probabilities().values())))
+            np.testing.assert_allclose(sens.loc[key], (probs[0] - probs[1]) / (2 * h), atol=1e-8)
+
+    def test_input_node_derivative_is_analytic(self):
+        _, sens = stationary_sensitivities(self.model, ["$DSP_recruitment"])
+        r, d = 1.0, 0.5   # rho.cfg defaults: p = r / (r + d)
+        self.assertAlmostEqual(sens.loc["$DSP_recruitment", "DSP"], d / (r + d) ** 2)
+
+    def test_table_per_perturbation(self):
+        sim_cfg = load_bm_sim_cfg()
+        table = sensitivity_table(self.model, sim_cfg, perturbations=["WT", "DSP_KO"])
+
+        self.assertEqual(len(table), 2 * len(self.model.params))
+        ko = table[(table["perturbation"] == "DSP_KO") & (table["param"] == "$DSP_recruitment")]
+        self.assertEqual(ko["d_RhoA"].iloc[0], 0.0)   # clamped node: no response
+        np.testing.assert_allclose(table["d_delta"], table["d_RhoC"] - table["d_RhoA"])
+
+
+class TestContinuation(unittest.TestCase):
+    def setUp(self):
+        self.model = load_ctmc_model()
+
+    def test_curve_matches_exact_solves(self):
+        knots = continuation_1d(self.model, "$RhoA_amp", 0.0, 50.0)
+        self.assertLess(len(knots), 30)
+
+        values = np.linspace(0.0, 50.0, 101)
+        curve = evaluate_curve(knots, self.model.node_names, values)
+        exact = self.model.solve_batch([{"$RhoA_amp": v} for v in values])
+        np.testing.assert_allclose(curve.to_numpy(), exact.to_numpy(), atol=1e-4)
+
+    def test_continuation_sweep_matches_grid_sweep(self):
+        sweep_cfg, sim_cfg = load_bm_sweep_cfg(), load_bm_sim_cfg()
+        spec = dict(sweep_cfg["sweeps"][1])            # dsp_sweep: 4 parameters
+        with contextlib.redirect_stdout(io.StringIO()):
+            df = run_sweeps(self.model, sweep_cfg, sim_cfg, target_sweeps=[spec["name"]],
+                            method="continuation")
+
+        self.assertEqual(set(df["p1_name"]), set(spec["parameters"]))
+        row = df[df["p1_name"] == "$RhoC_amp"].iloc[5]
+        m = self.model.copy()
+        m.mutate("DSP", "OFF")
+        m.update_parameters(**{"$RhoC_amp": row["p1_value"]})
+        self.assertAlmostEqual(row["RhoC"], m.stationary_node_probabilities()["RhoC"], places=4)